@@ -21,13 +21,17 @@ ma = Marshmallow()
 scheduler = BackgroundScheduler()
 
 
-def create_app(config_name=None):
-    """Create and configure Flask application."""
+def create_app(config_name=None, **config_overrides):
+    """Create and configure Flask application.
+
+    Keyword arguments override config values (e.g. SCHEDULER_ENABLED=False).
+    """
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
 
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.config.update(config_overrides)
 
     # Initialize extensions
     db.init_app(app)
@@ -77,6 +81,16 @@ def create_app(config_name=None):
         from app.middleware.error_handler import register_error_handlers
         register_error_handlers(app)
 
+        # Let order-dependent caches (admin dashboard, email drafts) drop stale entries on commit
+        from app.services.order_events import register_order_events
+        register_order_events()
+        from app.services.order_stats_service import register_order_stats
+        register_order_stats()
+        from app.services.order_feed import register_order_feed
+        register_order_feed(app)
+        from app.services.availability_service import register_availability_cache
+        register_availability_cache()
+
         # Configure scheduler (only in non-testing environments)
         if not app.config['TESTING'] and app.config.get('SCHEDULER_ENABLED', True):
             configure_scheduler(app)
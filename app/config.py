@@ -35,11 +35,31 @@ class Config:
     WHATSAPP_BUSINESS_ACCOUNT_ID = os.environ.get('WHATSAPP_BUSINESS_ACCOUNT_ID')
     WHATSAPP_API_VERSION = os.environ.get('WHATSAPP_API_VERSION', 'v18.0')
     WHATSAPP_API_URL = os.environ.get('WHATSAPP_API_URL', 'https://graph.facebook.com')
+    WHATSAPP_HTTP_TIMEOUT = float(os.environ.get('WHATSAPP_HTTP_TIMEOUT', 10))
+    WHATSAPP_HTTP_POOL_SIZE = int(os.environ.get('WHATSAPP_HTTP_POOL_SIZE', 10))
+    WHATSAPP_HTTP_RETRIES = int(os.environ.get('WHATSAPP_HTTP_RETRIES', 2))  # on 429/5xx
+    WHATSAPP_HTTP_BACKOFF = float(os.environ.get('WHATSAPP_HTTP_BACKOFF', 0.5))
 
     # SendGrid
     SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
     FROM_EMAIL = os.environ.get('FROM_EMAIL', 'noreply@mealoftheday.com')
     FROM_NAME = os.environ.get('FROM_NAME', 'Meal of the Day')
+    EMAIL_HTTP_TIMEOUT = float(os.environ.get('EMAIL_HTTP_TIMEOUT', 10))
+    EMAIL_HTTP_POOL_SIZE = int(os.environ.get('EMAIL_HTTP_POOL_SIZE', 4))
+    RESTAURANT_SUMMARY_CONCURRENCY = int(os.environ.get('RESTAURANT_SUMMARY_CONCURRENCY', 4))  # parallel summary sends
+    # Email transport: sendgrid, smtp, console (stdout) or file (maildir at EMAIL_FILE_PATH)
+    EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'sendgrid')
+    # Transport for the admin "send email" buttons; console only logs the drafts
+    ADMIN_EMAIL_BACKEND = os.environ.get('ADMIN_EMAIL_BACKEND', 'console')
+    EMAIL_DRAFT_CACHE_TTL = int(os.environ.get('EMAIL_DRAFT_CACHE_TTL', 300))  # seconds; admin draft cache
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 30))  # seconds; 0 disables
+    EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', 'mail')
+    SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT', 25))
+    SMTP_USERNAME = os.environ.get('SMTP_USERNAME')
+    SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+    SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', 'false').lower() in ('1', 'true', 'yes', 'on')
+    SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', 10))
 
     # Frontend
     FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:5173')
@@ -49,6 +69,51 @@ class Config:
     RESTAURANT_SUMMARY_TIME = os.environ.get('RESTAURANT_SUMMARY_TIME', '11:00')
     REMINDER_DAYS_AHEAD = [int(d) for d in os.environ.get('REMINDER_DAYS_AHEAD', '1,2,3').split(',')]
 
+    # Reminder dispatch (parallel WhatsApp sends, throttled to stay under the Cloud API quota)
+    REMINDER_SEND_CONCURRENCY = int(os.environ.get('REMINDER_SEND_CONCURRENCY', 8))
+    WHATSAPP_RATE_LIMIT_PER_SECOND = float(os.environ.get('WHATSAPP_RATE_LIMIT_PER_SECOND', 20))
+    WHATSAPP_RATE_LIMIT_BURST = int(os.environ.get('WHATSAPP_RATE_LIMIT_BURST', 20))
+    REMINDER_RESULT_BATCH_SIZE = int(os.environ.get('REMINDER_RESULT_BATCH_SIZE', 100))
+    # Send one message per user listing all missing days instead of one per day
+    REMINDER_CONSOLIDATE = os.environ.get('REMINDER_CONSOLIDATE', 'false').lower() in ('1', 'true', 'yes', 'on')
+
+    # Outbox: queue outbound WhatsApp/email in the DB and deliver from `manage.py outbox-worker`
+    OUTBOX_ENABLED = os.environ.get('OUTBOX_ENABLED', 'false').lower() in ('1', 'true', 'yes', 'on')
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 50))
+    OUTBOX_WORKER_CONCURRENCY = int(os.environ.get('OUTBOX_WORKER_CONCURRENCY', 4))
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL', 2.0))
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+    OUTBOX_RETRY_BACKOFF = int(os.environ.get('OUTBOX_RETRY_BACKOFF', 30))  # seconds, doubled per attempt
+    OUTBOX_LOCK_TIMEOUT = int(os.environ.get('OUTBOX_LOCK_TIMEOUT', 300))  # reclaim rows of crashed workers
+
+    # Rows fetched per server-side cursor batch by /admin/orders/export
+    ORDER_EXPORT_BATCH_SIZE = int(os.environ.get('ORDER_EXPORT_BATCH_SIZE', 1000))
+
+    # Restaurant availability is cached per process; other workers' writes are
+    # picked up when the cache_versions counter is next checked
+    AVAILABILITY_VERSION_CHECK_SECONDS = int(os.environ.get('AVAILABILITY_VERSION_CHECK_SECONDS', 5))  # 0 = every read
+
+    # Live order feed at /admin/orders/stream. Each open stream holds a gunicorn
+    # thread, so keep MAX_CLIENTS below the thread count. RELAY: auto (postgres
+    # LISTEN/NOTIFY on PostgreSQL, else local), local or postgres.
+    ORDER_FEED_RELAY = os.environ.get('ORDER_FEED_RELAY', 'auto')
+    ORDER_FEED_MAX_CLIENTS = int(os.environ.get('ORDER_FEED_MAX_CLIENTS', 2))  # per process
+    ORDER_FEED_HEARTBEAT = int(os.environ.get('ORDER_FEED_HEARTBEAT', 15))  # seconds
+    ORDER_FEED_MAX_SECONDS = int(os.environ.get('ORDER_FEED_MAX_SECONDS', 240))  # then the client reconnects
+    ORDER_FEED_BUFFER = int(os.environ.get('ORDER_FEED_BUFFER', 500))  # events kept for Last-Event-ID resume
+
+    # Serve /admin/orders/summary and /admin/reports/orders from order_daily_stats
+    # (rebuild with `python manage.py rebuild-order-stats` if it ever drifts)
+    ORDER_STATS_ENABLED = os.environ.get('ORDER_STATS_ENABLED', 'true').lower() in ('1', 'true', 'yes', 'on')
+
+    # Circuit breakers around WhatsApp/SendGrid calls (state at GET /api/health/circuits, admin only)
+    CIRCUIT_BREAKER_ENABLED = os.environ.get('CIRCUIT_BREAKER_ENABLED', 'true').lower() in ('1', 'true', 'yes', 'on')
+    CIRCUIT_BREAKER_FAILURE_RATE = float(os.environ.get('CIRCUIT_BREAKER_FAILURE_RATE', 0.5))
+    CIRCUIT_BREAKER_MIN_CALLS = int(os.environ.get('CIRCUIT_BREAKER_MIN_CALLS', 10))
+    CIRCUIT_BREAKER_WINDOW = int(os.environ.get('CIRCUIT_BREAKER_WINDOW', 20))  # last N calls
+    CIRCUIT_BREAKER_OPEN_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_OPEN_SECONDS', 30))
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS = int(os.environ.get('CIRCUIT_BREAKER_HALF_OPEN_CALLS', 1))
+
     # Pagination
     DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 20))
     MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 100))
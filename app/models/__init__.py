@@ -4,9 +4,12 @@ from app.models.restaurant import Restaurant
 from app.models.restaurant_availability import RestaurantAvailability
 from app.models.menu import Menu, MenuItem
 from app.models.order import Order, OrderItem
+from app.models.order_daily_stat import OrderDailyStat
 from app.models.motd_option import MotdOption
 from app.models.restaurant_email_log import RestaurantOrderEmailLog
 from app.models.reminder import Reminder, ReminderSchedule, RestaurantOrderSummary, Session
+from app.models.outbound_message import OutboundMessage
+from app.models.cache_version import CacheVersion
 
 __all__ = [
     'User',
@@ -16,10 +19,13 @@ __all__ = [
     'MenuItem',
     'Order',
     'OrderItem',
+    'OrderDailyStat',
     'MotdOption',
     'RestaurantOrderEmailLog',
     'Reminder',
     'ReminderSchedule',
     'RestaurantOrderSummary',
-    'Session'
+    'Session',
+    'OutboundMessage',
+    'CacheVersion'
 ]
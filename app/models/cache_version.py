@@ -0,0 +1,20 @@
+"""Version counters for data cached in process memory."""
+from datetime import datetime
+from app import db
+
+
+class CacheVersion(db.Model):
+    """Counter bumped in the same transaction as a write to cached data.
+
+    Each worker remembers the version its cache was loaded at and reloads
+    when the row has moved on, so writes in one process reach the others.
+    """
+    __tablename__ = 'cache_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        """String representation of cache version."""
+        return f'<CacheVersion {self.name}: {self.version}>'
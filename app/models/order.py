@@ -1,5 +1,6 @@
 """Order and OrderItem models."""
 from datetime import datetime
+from sqlalchemy.orm import column_property
 from app import db
 
 
@@ -10,10 +11,12 @@ class Order(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     menu_id = db.Column(db.Integer, db.ForeignKey('menus.id'), nullable=False)
-    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurants.id'), nullable=False)
-    order_date = db.Column(db.Date, nullable=False)  # The date the meal is for
-    status = db.Column(db.String(50), nullable=False, default='pending')  # pending/confirmed/sent_to_restaurant/completed/cancelled
-    total_amount = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    # active_history: the old value is loaded before an expired attribute is
+    # overwritten, so order_daily_stats and order events always see it
+    restaurant_id = column_property(db.Column(db.Integer, db.ForeignKey('restaurants.id'), nullable=False), active_history=True)
+    order_date = column_property(db.Column(db.Date, nullable=False), active_history=True)  # The date the meal is for
+    status = column_property(db.Column(db.String(50), nullable=False, default='pending'), active_history=True)  # pending/confirmed/sent_to_restaurant/completed/cancelled
+    total_amount = column_property(db.Column(db.Numeric(10, 2), nullable=False, default=0), active_history=True)
     order_text = db.Column(db.Text)
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -30,10 +33,14 @@ class Order(db.Model):
         db.UniqueConstraint('user_id', 'order_date', name='uq_user_order_date'),
         db.Index('idx_user_order_date', 'user_id', 'order_date'),
         db.Index('idx_order_date_status', 'order_date', 'status'),
+        db.Index('idx_order_date_created_id', 'order_date', 'created_at', 'id'),  # admin list keyset
     )
 
-    def to_dict(self, include_items=False):
-        """Convert order to dictionary."""
+    def to_dict(self, include_items=False, items=None):
+        """Convert order to dictionary.
+
+        items: preloaded OrderItems to include instead of querying the dynamic relationship.
+        """
         data = {
             'id': self.id,
             'user_id': self.user_id,
@@ -51,7 +58,7 @@ class Order(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
         if include_items:
-            data['items'] = [item.to_dict() for item in self.items]
+            data['items'] = [item.to_dict() for item in (self.items if items is None else items)]
         return data
 
     def __repr__(self):
@@ -0,0 +1,37 @@
+"""Per-day order counts and revenue by restaurant and status."""
+from datetime import datetime
+from app import db
+
+
+class OrderDailyStat(db.Model):
+    """Running order count and revenue for one (date, restaurant, status).
+
+    Maintained by OrderStatsService on every order write and rebuilt from
+    the orders table with `python manage.py rebuild-order-stats`.
+    """
+    __tablename__ = 'order_daily_stats'
+
+    order_date = db.Column(db.Date, primary_key=True)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurants.id'), primary_key=True)
+    status = db.Column(db.String(50), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_order_daily_stats_restaurant', 'restaurant_id', 'order_date'),
+    )
+
+    def to_dict(self):
+        """Convert stats row to dictionary."""
+        return {
+            'order_date': self.order_date.isoformat() if self.order_date else None,
+            'restaurant_id': self.restaurant_id,
+            'status': self.status,
+            'order_count': self.order_count,
+            'total_amount': float(self.total_amount) if self.total_amount is not None else 0,
+        }
+
+    def __repr__(self):
+        """String representation of stats row."""
+        return f'<OrderDailyStat {self.order_date} - Restaurant {self.restaurant_id} - {self.status}: {self.order_count}>'
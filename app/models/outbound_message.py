@@ -0,0 +1,49 @@
+"""Transactional outbox for outbound WhatsApp and email messages."""
+from datetime import datetime
+from app import db
+
+
+class OutboundMessage(db.Model):
+    """A message queued in the same transaction as the change that caused it.
+
+    A separate worker (`python manage.py outbox-worker`) claims queued rows
+    and delivers them, so request handlers and the scheduler never wait on
+    a provider.
+    """
+    __tablename__ = 'outbound_messages'
+
+    id = db.Column(db.Integer, primary_key=True)
+    channel = db.Column(db.String(20), nullable=False)  # 'whatsapp' or 'email'
+    kind = db.Column(db.String(50), nullable=False)  # order_reminder/restaurant_summary/...
+    recipient = db.Column(db.String(255))
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued/sending/sent/failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = db.Column(db.DateTime)
+    sent_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_outbound_status_available', 'status', 'available_at'),
+    )
+
+    def to_dict(self):
+        """Convert outbound message to dictionary."""
+        return {
+            'id': self.id,
+            'channel': self.channel,
+            'kind': self.kind,
+            'recipient': self.recipient,
+            'status': self.status,
+            'attempts': self.attempts,
+            'available_at': self.available_at.isoformat() if self.available_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def __repr__(self):
+        """String representation of outbound message."""
+        return f'<OutboundMessage {self.id} - {self.channel}/{self.kind} - {self.status}>'
@@ -24,6 +24,7 @@ class Reminder(db.Model):
     __table_args__ = (
         db.Index('idx_reminder_user_date', 'user_id', 'order_date'),
         db.Index('idx_reminder_status_created', 'status', 'created_at'),
+        db.Index('idx_reminder_created_id', 'created_at', 'id'),  # list keyset
     )
 
     def to_dict(self):
@@ -1,16 +1,31 @@
 """Admin routes for dashboard and management."""
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+import json
+import time
 from datetime import datetime, date, timedelta
+from markupsafe import escape
 from marshmallow import ValidationError
+from sqlalchemy import select, insert, func, case, and_
+from sqlalchemy.orm import joinedload
 from app import db
-from app.models import Order, User, Restaurant, Menu, RestaurantOrderEmailLog, RestaurantAvailability, MotdOption
+from app.models import Order, OrderItem, User, Restaurant, Menu, RestaurantOrderEmailLog, RestaurantAvailability, MotdOption
 from app.schemas import OrderStatusUpdateSchema
+from app.services.availability_service import AvailabilityService
+from app.services.email_service import EmailService
+from app.services.email_templates import render_restaurant_draft
+from app.services.order_export_service import OrderExportService
+from app.services.order_feed import get_order_feed, ensure_listener
+from app.services.order_events import ALL_ORDERS, subscribe as subscribe_order_changes
 from app.services.order_service import OrderService
+from app.services.order_stats_service import OrderStatsService
+from app.services.order_summary_service import OrderSummaryService, SummaryOrder
+from app.services.outbox_service import OutboxService
 from app.services.reminder_service import ReminderService
-from app.tasks.order_tasks import generate_restaurant_summary_for_date
+from app.tasks.order_tasks import generate_restaurant_summary_for_date, queue_restaurant_summary_for_date
 from app.middleware.auth import admin_required
 from app.utils.decorators import validate_json, paginated
-from app.utils.helpers import paginate_query
+from app.utils.cache import TTLCache
+from app.utils.helpers import paginate, pagination_meta
 from app.models import RestaurantAvailability
 
 bp = Blueprint('admin', __name__, url_prefix='/api/admin')
@@ -19,59 +34,127 @@ order_status_update_schema = OrderStatusUpdateSchema()
 
 WEEKDAY_LABELS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
 
-def _order_summary_line(order: Order) -> str:
-    user_label = None
-    try:
-        user_label = order.user.full_name if order.user else None
-    except Exception:
-        user_label = None
-    user_label = user_label or f"User {order.user_id}"
-
-    text = (order.order_text or '').strip()
-    if not text and getattr(order, 'items', None):
-        # Structured order fallback
-        parts = []
-        for item in order.items:
-            try:
-                parts.append(f"{item.quantity}x {item.menu_item_name}")
-            except Exception:
-                continue
-        text = ", ".join(parts).strip()
-    if not text:
-        text = "(no order details)"
+# Rendered restaurant email drafts, keyed by order-set version (see _get_restaurant_email_drafts)
+_draft_cache = TTLCache(maxsize=512)
 
-    notes = (order.notes or '').strip()
-    if notes:
-        return f"- {user_label}: {text} (Notes: {notes})"
-    return f"- {user_label}: {text}"
+# Dashboard payload keyed by date; short TTL covers users/restaurants/menus changes
+_dashboard_cache = TTLCache(maxsize=8)
 
 
-def _build_restaurant_email_draft(target_date_obj: date, restaurant: Restaurant, orders: list[Order]) -> dict:
-    friendly_date = target_date_obj.strftime('%A, %b %d, %Y')
-    subject = f"Meal of the Day orders for {friendly_date}"
-
-    lines = [
-        f"Hello {restaurant.contact_name or restaurant.name},",
-        "",
-        f"Here are the orders for {friendly_date}:",
-        "",
-    ]
-    if not orders:
-        lines.append("(No orders)")
+@subscribe_order_changes
+def _on_orders_changed(changes):
+    """Drop cached dashboard and drafts for the (restaurant_id, date) scopes that changed."""
+    _dashboard_cache.clear()
+    if ALL_ORDERS in changes:
+        _draft_cache.clear()
     else:
-        for o in orders:
-            lines.append(_order_summary_line(o))
-    lines.extend(["", "Thanks,", "Meal of the Day"])
+        _draft_cache.invalidate(lambda k: k[:2] in changes)
+
+
+def _build_restaurant_email_draft(target_date_obj: date, restaurant: Restaurant, orders: list[SummaryOrder]) -> dict:
+    """Plain-text draft from preloaded OrderSummaryService orders (no per-order queries)."""
+    subject = f"Meal of the Day orders for {target_date_obj.strftime('%A, %b %d, %Y')}"
+    body = render_restaurant_draft(restaurant, target_date_obj, orders)
 
     return {
         "to": restaurant.email,
         "restaurant_id": restaurant.id,
         "restaurant_name": restaurant.name,
         "subject": subject,
-        "body": "\n".join(lines),
+        "body": body,
     }
 
 
+def _order_set_versions(target_date_obj: date, restaurant_ids: list[int]) -> dict:
+    """(max(updated_at), order count, max(item id), item count) per restaurant on a date, in one grouped query.
+
+    Item ids and counts are included because replacing an order's items
+    (delete + insert) does not necessarily touch the order row.
+    """
+    rows = db.session.execute(
+        select(
+            Order.restaurant_id,
+            db.func.max(Order.updated_at),
+            db.func.count(db.distinct(Order.id)),
+            db.func.max(OrderItem.id),
+            db.func.count(OrderItem.id)
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.order_date == target_date_obj, Order.restaurant_id.in_(restaurant_ids))
+        .group_by(Order.restaurant_id)
+    ).all()
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _get_restaurant_email_drafts(target_date_obj: date, restaurants: list[Restaurant]) -> dict:
+    """Return {restaurant_id: draft}, reusing cached drafts while the order set is unchanged.
+
+    Drafts are keyed by (restaurant_id, date, restaurant.updated_at) plus the
+    _order_set_versions tuple, so any order or order item added, edited or
+    removed for that restaurant and date produces a new key, even in workers
+    that did not see the commit. Only the restaurants that miss are loaded and rendered.
+    """
+    if not restaurants:
+        return {}
+    versions = _order_set_versions(target_date_obj, [r.id for r in restaurants])
+
+    drafts = {}
+    missing = []
+    for r in restaurants:
+        key = (r.id, target_date_obj, r.updated_at) + versions.get(r.id, (None, 0, None, 0))
+        draft = _draft_cache.get(key)
+        if draft is None:
+            missing.append((r, key))
+        else:
+            drafts[r.id] = draft
+
+    if missing:
+        summaries = OrderSummaryService.load(target_date_obj, restaurant_ids=[r.id for r, _ in missing])
+        ttl = current_app.config.get('EMAIL_DRAFT_CACHE_TTL', 300)
+        for r, key in missing:
+            draft = _build_restaurant_email_draft(target_date_obj, r, summaries.get(r.id, []))
+            # Drop drafts of older versions of this order set
+            _draft_cache.invalidate(lambda k, prefix=key[:2]: k[:2] == prefix)
+            _draft_cache.set(key, draft, ttl=ttl)
+            drafts[r.id] = draft
+    return drafts
+
+
+def _draft_email_message(draft: dict) -> dict:
+    """send_email keyword arguments for a plain-text restaurant draft."""
+    return {
+        "to_email": draft["to"],
+        "subject": draft["subject"],
+        "html_content": f"<pre>{escape(draft['body'])}</pre>",
+        "plain_content": draft["body"],
+    }
+
+
+def _deliver_drafts(drafts: list[dict]) -> list[tuple]:
+    """Hand drafts to ADMIN_EMAIL_BACKEND; via the outbox worker when OUTBOX_ENABLED.
+
+    Returns (success, message) per draft, in order.
+    """
+    backend = current_app.config.get('ADMIN_EMAIL_BACKEND', 'console')
+    if current_app.config.get('OUTBOX_ENABLED'):
+        for draft in drafts:
+            OutboxService.enqueue_email(kind='admin_draft', backend=backend, **_draft_email_message(draft))
+        return [(True, 'Email queued') for _ in drafts]
+    return EmailService.send_emails(
+        [_draft_email_message(draft) for draft in drafts],
+        max_workers=current_app.config.get('RESTAURANT_SUMMARY_CONCURRENCY', 4),
+        backend=backend
+    )
+
+
+def _admin_email_result_message(singular: bool) -> str:
+    if current_app.config.get('OUTBOX_ENABLED'):
+        return 'Email queued.' if singular else 'Emails queued.'
+    if current_app.config.get('ADMIN_EMAIL_BACKEND', 'console') in ('console', 'file'):
+        return 'Email logged (not sent).' if singular else 'Emails logged (not sent).'
+    return 'Email sent.' if singular else 'Emails sent.'
+
+
 @bp.route('/motd', methods=['GET'])
 @admin_required
 def list_motd_options(user):
@@ -88,10 +171,7 @@ def list_motd_options(user):
     if weekday > 4:
         return jsonify({'weekday': weekday, 'restaurants': []}), 200
 
-    available_ids = [
-        r.restaurant_id
-        for r in RestaurantAvailability.query.filter_by(weekday=weekday, is_available=True).all()
-    ]
+    available_ids = AvailabilityService.restaurants_available_on(weekday)
     if not available_ids:
         return jsonify({'weekday': weekday, 'restaurants': []}), 200
 
@@ -156,44 +236,121 @@ def upsert_motd_option(user):
 @bp.route('/orders/by-date', methods=['GET'])
 @admin_required
 def get_orders_by_date(user):
-    """Get orders for a selected day, grouped by restaurant."""
+    """Get orders for a selected day, grouped by restaurant.
+
+    `?shape=normalized` returns restaurants, menus, users and menu items once
+    each, with orders referencing them by id, instead of the nested groups.
+    """
     target_date = request.args.get('date') or date.today().isoformat()
     try:
         target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
     except Exception:
         return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+    shape = request.args.get('shape', 'grouped')
+    if shape not in ('grouped', 'normalized'):
+        return jsonify({'error': 'shape must be grouped or normalized'}), 400
+
+    # Fixed query count: orders with user/menu/restaurant, their items with menu items, email logs
+    orders = Order.query.options(
+        joinedload(Order.user), joinedload(Order.menu), joinedload(Order.restaurant)
+    ).filter(Order.order_date == target_date_obj).order_by(Order.restaurant_id.asc(), Order.created_at.asc()).all()
+    items_by_order = _load_order_items([o.id for o in orders])
+
+    sent_by_restaurant = {}
+    if orders:
+        sent_logs = RestaurantOrderEmailLog.query.filter(RestaurantOrderEmailLog.order_date == target_date_obj).all()
+        sent_by_restaurant = {l.restaurant_id: l for l in sent_logs}
+
+    def restaurant_payload(r):
+        log_row = sent_by_restaurant.get(r.id)
+        return {
+            'id': r.id,
+            'name': r.name,
+            'email': r.email,
+            'contact_name': r.contact_name,
+            'email_sent': log_row is not None,
+            'email_sent_at': log_row.created_at.isoformat() if log_row else None,
+        }
 
-    orders = Order.query.filter(Order.order_date == target_date_obj).order_by(Order.restaurant_id.asc(), Order.created_at.asc()).all()
+    if shape == 'normalized':
+        return jsonify(_normalized_orders_payload(target_date_obj, orders, items_by_order, restaurant_payload)), 200
 
     by_restaurant: dict[int, list[Order]] = {}
     for o in orders:
-        by_restaurant.setdefault(o.restaurant_id, []).append(o)
+        if o.restaurant is not None:
+            by_restaurant.setdefault(o.restaurant_id, []).append(o)
 
     groups = []
-    if by_restaurant:
-        sent_logs = RestaurantOrderEmailLog.query.filter(RestaurantOrderEmailLog.order_date == target_date_obj).all()
-        sent_by_restaurant = {l.restaurant_id: l for l in sent_logs}
+    for rest_id in sorted(by_restaurant.keys()):
+        rest_orders = by_restaurant[rest_id]
+        groups.append({
+            'restaurant': restaurant_payload(rest_orders[0].restaurant),
+            'orders': [o.to_dict(include_items=True, items=items_by_order.get(o.id, [])) for o in rest_orders],
+        })
 
-        restaurants = Restaurant.query.filter(Restaurant.id.in_(list(by_restaurant.keys()))).all()
-        restaurant_map = {r.id: r for r in restaurants}
-        for rest_id in sorted(by_restaurant.keys()):
-            r = restaurant_map.get(rest_id)
-            if not r:
-                continue
-            log_row = sent_by_restaurant.get(r.id)
-            groups.append({
-                'restaurant': {
-                    'id': r.id,
-                    'name': r.name,
-                    'email': r.email,
-                    'contact_name': r.contact_name,
-                    'email_sent': log_row is not None,
-                    'email_sent_at': log_row.created_at.isoformat() if log_row else None,
-                },
-                'orders': [o.to_dict(include_items=True) for o in by_restaurant[rest_id]],
+    return jsonify({'date': target_date_obj.isoformat(), 'groups': groups}), 200
+
+
+def _load_order_items(order_ids: list[int]) -> dict:
+    """{order_id: [OrderItem]} with menu items, in one query (Order.items is dynamic and cannot be eager-loaded)."""
+    if not order_ids:
+        return {}
+    items = OrderItem.query.options(joinedload(OrderItem.menu_item)).filter(
+        OrderItem.order_id.in_(order_ids)
+    ).order_by(OrderItem.order_id, OrderItem.id).all()
+    by_order = {}
+    for item in items:
+        by_order.setdefault(item.order_id, []).append(item)
+    return by_order
+
+
+def _normalized_orders_payload(target_date_obj: date, orders: list[Order], items_by_order: dict, restaurant_payload) -> dict:
+    """by-date payload where each restaurant, menu, user and menu item appears once."""
+    restaurants, menus, users, menu_items = {}, {}, {}, {}
+    order_rows = []
+    for o in orders:
+        if o.restaurant is None:
+            continue
+        restaurants.setdefault(o.restaurant_id, o.restaurant)
+        if o.menu is not None:
+            menus.setdefault(o.menu_id, {'id': o.menu.id, 'name': o.menu.name, 'restaurant_id': o.menu.restaurant_id})
+        if o.user is not None:
+            users.setdefault(o.user_id, {'id': o.user.id, 'full_name': o.user.full_name})
+
+        items = []
+        for item in items_by_order.get(o.id, []):
+            if item.menu_item is not None:
+                menu_items.setdefault(item.menu_item_id, {'id': item.menu_item.id, 'name': item.menu_item.name})
+            items.append({
+                'id': item.id,
+                'menu_item_id': item.menu_item_id,
+                'quantity': item.quantity,
+                'price': float(item.price) if item.price else 0.0,
+                'notes': item.notes,
             })
+        order_rows.append({
+            'id': o.id,
+            'user_id': o.user_id,
+            'menu_id': o.menu_id,
+            'restaurant_id': o.restaurant_id,
+            'status': o.status,
+            'total_amount': float(o.total_amount) if o.total_amount else 0.0,
+            'order_text': o.order_text,
+            'notes': o.notes,
+            'created_at': o.created_at.isoformat() if o.created_at else None,
+            'updated_at': o.updated_at.isoformat() if o.updated_at else None,
+            'items': items,
+        })
 
-    return jsonify({'date': target_date_obj.isoformat(), 'groups': groups}), 200
+    return {
+        'date': target_date_obj.isoformat(),
+        'shape': 'normalized',
+        'restaurants': [restaurant_payload(restaurants[k]) for k in sorted(restaurants)],
+        'menus': [menus[k] for k in sorted(menus)],
+        'users': [users[k] for k in sorted(users)],
+        'menu_items': [menu_items[k] for k in sorted(menu_items)],
+        'orders': order_rows,
+    }
 
 
 @bp.route('/orders/email-draft', methods=['POST'])
@@ -214,16 +371,47 @@ def get_order_email_draft(user):
     if not restaurant:
         return jsonify({'error': 'Restaurant not found'}), 404
 
-    orders = Order.query.filter(Order.order_date == target_date_obj, Order.restaurant_id == restaurant.id).order_by(Order.created_at.asc()).all()
-    draft = _build_restaurant_email_draft(target_date_obj, restaurant, orders)
+    draft = _get_restaurant_email_drafts(target_date_obj, [restaurant])[restaurant.id]
     return jsonify({'draft': draft}), 200
 
 
+def _mark_restaurants_emailed(target_date_obj: date, restaurant_ids: list[int], user_id: int) -> None:
+    """Log the emails and move the restaurants' open orders to 'ordered' (no commit).
+
+    A constant number of statements for any number of restaurants: one
+    lookup of existing logs, one insert of the missing ones and one
+    set-based UPDATE of the orders.
+    """
+    if not restaurant_ids:
+        return
+
+    # Log records let the UI show "sent"; the first send of the day is kept
+    logged = set(db.session.execute(
+        select(RestaurantOrderEmailLog.restaurant_id).where(
+            RestaurantOrderEmailLog.order_date == target_date_obj,
+            RestaurantOrderEmailLog.restaurant_id.in_(restaurant_ids)
+        )
+    ).scalars())
+    new_logs = [
+        {'restaurant_id': rid, 'order_date': target_date_obj, 'sent_by_user_id': user_id}
+        for rid in restaurant_ids if rid not in logged
+    ]
+    if new_logs:
+        db.session.execute(insert(RestaurantOrderEmailLog), new_logs)
+
+    # Close out the involved orders in the workflow
+    OrderStatsService.update_status([
+        Order.order_date == target_date_obj,
+        Order.restaurant_id.in_(restaurant_ids),
+        Order.status.notin_(['cancelled', 'completed'])
+    ], 'ordered')
+
+
 @bp.route('/orders/send-email', methods=['POST'])
 @admin_required
 @validate_json
 def send_order_email(user):
-    """Log an email draft for a restaurant for a date (placeholder for real send)."""
+    """Deliver the email draft for a restaurant for a date through ADMIN_EMAIL_BACKEND."""
     target_date = request.json.get('date') or date.today().isoformat()
     restaurant_id = request.json.get('restaurant_id')
     if not restaurant_id:
@@ -239,95 +427,81 @@ def send_order_email(user):
     if not restaurant.email:
         return jsonify({'error': 'Restaurant has no email configured'}), 400
 
-    orders = Order.query.filter(Order.order_date == target_date_obj, Order.restaurant_id == restaurant.id).order_by(Order.created_at.asc()).all()
-    draft = _build_restaurant_email_draft(target_date_obj, restaurant, orders)
-
-    # Upsert log record (so UI can show "sent")
-    existing_log = RestaurantOrderEmailLog.query.filter_by(restaurant_id=restaurant.id, order_date=target_date_obj).first()
-    if existing_log is None:
-        db.session.add(RestaurantOrderEmailLog(restaurant_id=restaurant.id, order_date=target_date_obj, sent_by_user_id=user.id))
+    draft = _get_restaurant_email_drafts(target_date_obj, [restaurant])[restaurant.id]
 
-    # Mark involved orders as ordered (so they are closed out in the workflow)
-    for o in orders:
-        if o.status not in ['cancelled', 'completed']:
-            o.status = 'ordered'
+    success, message = _deliver_drafts([draft])[0]
+    if not success:
+        return jsonify({'error': f'Email failed: {message}', 'draft': draft}), 502
 
+    _mark_restaurants_emailed(target_date_obj, [restaurant.id], user.id)
     db.session.commit()
 
-    current_app.logger.info(
-        "ADMIN_EMAIL_DRAFT to=%s subject=%s\n%s",
-        draft.get('to'),
-        draft.get('subject'),
-        draft.get('body'),
-    )
-    return jsonify({'message': 'Email logged (not sent).', 'draft': draft}), 200
+    return jsonify({'message': _admin_email_result_message(singular=True), 'draft': draft}), 200
 
 
 @bp.route('/orders/send-all-emails', methods=['POST'])
 @admin_required
 @validate_json
 def send_all_order_emails(user):
-    """Log email drafts for all restaurants with orders on a date (placeholder for real send)."""
+    """Deliver email drafts for all restaurants with orders on a date through ADMIN_EMAIL_BACKEND."""
     target_date = request.json.get('date') or date.today().isoformat()
     try:
         target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
     except Exception:
         return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
 
-    orders = Order.query.filter(Order.order_date == target_date_obj).order_by(Order.restaurant_id.asc(), Order.created_at.asc()).all()
-    if not orders:
+    restaurant_ids = db.session.execute(
+        select(Order.restaurant_id).where(Order.order_date == target_date_obj).distinct().order_by(Order.restaurant_id)
+    ).scalars().all()
+    if not restaurant_ids:
         return jsonify({'message': 'No orders for this date.', 'sent': 0, 'skipped': []}), 200
 
-    by_restaurant: dict[int, list[Order]] = {}
-    for o in orders:
-        by_restaurant.setdefault(o.restaurant_id, []).append(o)
-
-    restaurants = Restaurant.query.filter(Restaurant.id.in_(list(by_restaurant.keys()))).all()
+    restaurants = Restaurant.query.filter(Restaurant.id.in_(restaurant_ids)).all()
     restaurant_map = {r.id: r for r in restaurants}
+    cached_drafts = _get_restaurant_email_drafts(
+        target_date_obj, [r for r in restaurants if r.email]
+    )
 
-    sent = 0
     skipped = []
-    for rest_id, rest_orders in by_restaurant.items():
+    drafts = []
+    for rest_id in restaurant_ids:
         r = restaurant_map.get(rest_id)
         if not r:
             continue
         if not r.email:
             skipped.append({'restaurant_id': r.id, 'restaurant_name': r.name, 'reason': 'Missing email'})
             continue
-        draft = _build_restaurant_email_draft(target_date_obj, r, rest_orders)
-
-        existing_log = RestaurantOrderEmailLog.query.filter_by(restaurant_id=r.id, order_date=target_date_obj).first()
-        if existing_log is None:
-            db.session.add(RestaurantOrderEmailLog(restaurant_id=r.id, order_date=target_date_obj, sent_by_user_id=user.id))
+        drafts.append((r, cached_drafts[r.id]))
 
-        for o in rest_orders:
-            if o.status not in ['cancelled', 'completed']:
-                o.status = 'ordered'
+    results = _deliver_drafts([draft for _, draft in drafts])
 
-        current_app.logger.info(
-            "ADMIN_EMAIL_DRAFT to=%s subject=%s\n%s",
-            draft.get('to'),
-            draft.get('subject'),
-            draft.get('body'),
-        )
-        sent += 1
+    sent_ids = []
+    failed = []
+    for (r, draft), (success, message) in zip(drafts, results):
+        if not success:
+            failed.append({'restaurant_id': r.id, 'restaurant_name': r.name, 'reason': message})
+            continue
+        sent_ids.append(r.id)
 
+    _mark_restaurants_emailed(target_date_obj, sent_ids, user.id)
     db.session.commit()
+    sent = len(sent_ids)
 
-    return jsonify({'message': 'Emails logged (not sent).', 'sent': sent, 'skipped': skipped}), 200
+    return jsonify({
+        'message': _admin_email_result_message(singular=False),
+        'sent': sent,
+        'skipped': skipped,
+        'failed': failed,
+    }), 200
 
 
 @bp.route('/restaurants/availability', methods=['GET'])
 @admin_required
 def get_restaurant_availability(user):
     """Get availability for all restaurants."""
-    rows = RestaurantAvailability.query.all()
-    by_restaurant = {}
-    for r in rows:
-        if r.is_available:
-            by_restaurant.setdefault(r.restaurant_id, set()).add(r.weekday)
+    by_restaurant = AvailabilityService.get_map()
     return jsonify({
-        'availability': {str(k): sorted(list(v)) for k, v in by_restaurant.items()}
+        'availability': {str(k): sorted(v) for k, v in by_restaurant.items()}
     }), 200
 
 
@@ -358,6 +532,7 @@ def set_restaurant_availability(user, restaurant_id):
             db.session.add(row)
         else:
             row.is_available = w in weekdays
+    # Bumps the availability version, so every worker's cached map reloads
     db.session.commit()
     return jsonify({'message': 'Availability updated', 'restaurant_id': restaurant_id, 'weekdays': weekdays}), 200
 
@@ -367,76 +542,83 @@ def set_restaurant_availability(user, restaurant_id):
 def get_dashboard_stats(user):
     """Get admin dashboard statistics."""
     today = date.today()
+    ttl = current_app.config.get('DASHBOARD_CACHE_TTL', 30)
+    payload = _dashboard_cache.get(today) if ttl else None
+    if payload is None:
+        payload = _build_dashboard_stats(today)
+        if ttl:
+            _dashboard_cache.set(today, payload, ttl=ttl)
+    return jsonify(payload), 200
+
+
+def _build_dashboard_stats(today: date) -> dict:
+    """Dashboard payload from two aggregate statements plus one eager-loaded recent orders query."""
     week_from = today
     week_to = today + timedelta(days=7)
-    
-    # Total stats
-    total_users = User.query.filter_by(is_active=True).count()
-    total_restaurants = Restaurant.query.filter_by(is_active=True).count()
-    total_menus = Menu.query.filter_by(is_active=True).count()
-    
-    # Orders this week
-    orders_this_week = Order.query.filter(
-        Order.order_date >= week_from,
-        Order.order_date <= week_to
-    ).count()
-    
-    # Orders today (exclude cancelled)
-    orders_today = Order.query.filter(
-        Order.order_date == today,
-        Order.status != 'cancelled'
-    ).count()
-
-    pending_orders_today = Order.query.filter(
-        Order.order_date == today,
-        Order.status == 'pending'
-    ).count()
-    
-    # Users without orders for tomorrow
     tomorrow = today + timedelta(days=1)
-    users_without_orders = ReminderService.get_users_without_orders(tomorrow)
-    
-    # Recent orders
-    recent_orders = Order.query.order_by(Order.created_at.desc()).limit(10).all()
-    
+
+    def count_active(model):
+        return select(func.count(model.id)).where(model.is_active.is_(True)).scalar_subquery()
+
+    # Active users without an order for tomorrow, by the same rule the reminders use
+    users_without_orders = select(func.count()).select_from(
+        ReminderService.users_without_orders_query([tomorrow]).subquery()
+    ).scalar_subquery()
+
+    def count_if(*conditions):
+        return func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0)
+
+    totals = db.session.execute(
+        select(
+            count_active(User).label('total_users'),
+            count_active(Restaurant).label('total_restaurants'),
+            count_active(Menu).label('total_menus'),
+            users_without_orders.label('users_without_orders_tomorrow'),
+            func.count(Order.id).label('orders_this_week'),
+            # Orders today (exclude cancelled)
+            count_if(Order.order_date == today, Order.status != 'cancelled').label('orders_today'),
+            count_if(Order.order_date == today, Order.status == 'pending').label('pending_orders_today'),
+        ).select_from(Order).where(Order.order_date >= week_from, Order.order_date <= week_to)
+    ).one()
+
     # Orders by status
-    orders_by_status = db.session.query(
-        Order.status,
-        db.func.count(Order.id)
-    ).filter(
-        Order.order_date >= week_from,
-        Order.order_date <= week_to
-    ).group_by(Order.status).all()
-    
-    status_counts = {status: count for status, count in orders_by_status}
-    
+    status_counts = dict(db.session.execute(
+        select(Order.status, func.count(Order.id))
+        .where(Order.order_date >= week_from, Order.order_date <= week_to)
+        .group_by(Order.status)
+    ).all())
+
+    # Recent orders with everything to_dict() touches
+    recent_orders = Order.query.options(
+        joinedload(Order.user), joinedload(Order.menu), joinedload(Order.restaurant)
+    ).order_by(Order.created_at.desc()).limit(10).all()
+
     # Flatten key stats for frontend, keep legacy nested structure too.
-    payload = {
-        'total_users': total_users,
-        'total_orders_today': orders_today,
-        'pending_orders': pending_orders_today,
-        'pending_orders_today': pending_orders_today,
+    return {
+        'total_users': totals.total_users,
+        'total_orders_today': totals.orders_today,
+        'pending_orders': totals.pending_orders_today,
+        'pending_orders_today': totals.pending_orders_today,
         'total_revenue_today': 0,
         'stats': {
-            'total_users': total_users,
-            'total_restaurants': total_restaurants,
-            'total_menus': total_menus,
-            'orders_this_week': orders_this_week,
-            'orders_today': orders_today,
-            'pending_orders_today': pending_orders_today,
-            'users_without_orders_tomorrow': len(users_without_orders)
+            'total_users': totals.total_users,
+            'total_restaurants': totals.total_restaurants,
+            'total_menus': totals.total_menus,
+            'orders_this_week': totals.orders_this_week,
+            'orders_today': totals.orders_today,
+            'pending_orders_today': totals.pending_orders_today,
+            'users_without_orders_tomorrow': totals.users_without_orders_tomorrow
         },
         'status_breakdown': status_counts,
         'recent_orders': [order.to_dict() for order in recent_orders]
     }
-    return jsonify(payload), 200
 
 
 @bp.route('/orders', methods=['GET'])
 @admin_required
 @paginated(default_per_page=50, max_per_page=200)
-def get_all_orders(user, page, per_page):
-    """Get all orders with filters."""
+def get_all_orders(user, page, per_page, cursor):
+    """Get all orders with filters (newest date first; `?cursor=` for cursor pagination)."""
     query = Order.query
     
     # Filter by date
@@ -458,23 +640,149 @@ def get_all_orders(user, page, per_page):
     if restaurant_id:
         query = query.filter_by(restaurant_id=int(restaurant_id))
     
-    # Order by date
-    query = query.order_by(Order.order_date.desc(), Order.created_at.desc())
-    
-    # Paginate
-    result = paginate_query(query, page=page, per_page=per_page)
+    # Paginate by date
+    try:
+        result = paginate(
+            query, [Order.order_date, Order.created_at, Order.id], page=page, per_page=per_page,
+            cursor=cursor, total=request.args.get('total'), max_per_page=200
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'orders': [order.to_dict(include_items=True) for order in result['items']],
-        'pagination': {
-            'total': result['total'],
-            'page': result['page'],
-            'per_page': result['per_page'],
-            'pages': result['pages']
-        }
+        'pagination': pagination_meta(result)
     }), 200
 
 
+@bp.route('/orders/export', methods=['GET'])
+@admin_required
+def export_orders(user):
+    """Stream orders for a date range as CSV (one line per item) or NDJSON (one line per order)."""
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+
+    date_from = request.args.get('date_from')
+    date_to = request.args.get('date_to')
+    if not date_from or not date_to:
+        return jsonify({'error': 'date_from and date_to are required'}), 400
+    try:
+        date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
+        date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+    batch_size = current_app.config.get('ORDER_EXPORT_BATCH_SIZE', 1000)
+    if export_format == 'csv':
+        lines = OrderExportService.csv_lines(date_from_obj, date_to_obj, batch_size)
+        mimetype = 'text/csv'
+    else:
+        lines = OrderExportService.ndjson_lines(date_from_obj, date_to_obj, batch_size)
+        mimetype = 'application/x-ndjson'
+
+    filename = f'orders_{date_from_obj.isoformat()}_{date_to_obj.isoformat()}.{export_format}'
+    return Response(
+        stream_with_context(lines),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+def _sse(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@bp.route('/orders/stream', methods=['GET'])
+@admin_required
+def stream_orders(user):
+    """Server-Sent Events feed of committed order changes.
+
+    Events: created, updated, status_changed, cancelled, deleted, and refresh
+    (reload everything: bulk update, or events were missed). Resume with the
+    Last-Event-ID header or ?last_event_id=. The stream ends after
+    ORDER_FEED_MAX_SECONDS and the client reconnects.
+
+    JWT_TOKEN_LOCATION is headers only and browsers' EventSource cannot set
+    an Authorization header, so clients read this with a fetch()-based SSE
+    reader that sends the bearer token.
+    """
+    config = current_app.config
+    feed = get_order_feed()
+    if not feed.acquire(config.get('ORDER_FEED_MAX_CLIENTS', 2)):
+        return jsonify({'error': 'Too many open order streams, poll instead'}), 503
+    try:
+        ensure_listener(db.engine)
+    except Exception:
+        feed.release()
+        raise
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    after_seq, missed = feed.resume_point(last_event_id)
+    heartbeat = config.get('ORDER_FEED_HEARTBEAT', 15)
+    max_seconds = config.get('ORDER_FEED_MAX_SECONDS', 240)
+
+    # Not stream_with_context: the request's DB session is released while the stream stays open
+    def generate(after_seq, missed):
+        yield f'retry: {heartbeat * 1000}\n\n'
+        deadline = time.monotonic() + max_seconds
+        while True:
+            if missed:
+                yield _sse(f'{feed.epoch}-{after_seq}', 'refresh', {'type': 'refresh', 'order_id': None})
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            events, missed = feed.wait(after_seq, min(heartbeat, remaining))
+            if not events:
+                yield ': keepalive\n\n'
+                continue
+            if missed:
+                # Some events fell out of the buffer before we saw them
+                yield _sse(f'{feed.epoch}-{events[0][0] - 1}', 'refresh', {'type': 'refresh', 'order_id': None})
+                missed = False
+            for seq, payload in events:
+                yield _sse(f'{feed.epoch}-{seq}', payload['type'], payload)
+            after_seq = events[-1][0]
+
+    response = Response(
+        generate(after_seq, missed),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    response.call_on_close(feed.release)
+    return response
+
+
+def _order_totals(date_from: date, date_to: date, by_date: bool = True) -> list[tuple]:
+    """(order_date, restaurant_id, restaurant_name, order_count, total_amount) per day and restaurant.
+
+    With by_date=False there is one row per restaurant for the whole range
+    (order_date is None).
+    """
+    if current_app.config.get('ORDER_STATS_ENABLED'):
+        return OrderStatsService.by_date_and_restaurant(date_from, date_to, by_date=by_date)
+
+    # Aggregate in the database: rows are bounded by days x restaurants, not orders
+    day = Order.order_date if by_date else db.literal(None, type_=db.Date)
+    group_by = [Order.restaurant_id, Restaurant.name]
+    if by_date:
+        group_by.insert(0, Order.order_date)
+    rows = db.session.execute(
+        select(
+            day,
+            Order.restaurant_id,
+            Restaurant.name,
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.total_amount), 0)
+        )
+        .outerjoin(Restaurant, Restaurant.id == Order.restaurant_id)
+        .where(Order.order_date >= date_from, Order.order_date <= date_to)
+        .group_by(*group_by)
+        .order_by(*group_by[:-1])
+    ).all()
+    return [tuple(row) for row in rows]
+
+
 @bp.route('/orders/summary', methods=['GET'])
 @admin_required
 def get_orders_summary(user):
@@ -488,48 +796,30 @@ def get_orders_summary(user):
     date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
     date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
     
-    # Get orders in date range
-    orders = Order.query.filter(
-        Order.order_date >= date_from_obj,
-        Order.order_date <= date_to_obj
-    ).all()
-    
     # Group by date and restaurant
     summary_by_date = {}
-    
-    for order in orders:
-        date_key = order.order_date.isoformat()
+
+    for order_date, rest_id, restaurant_name, order_count, total_amount in _order_totals(date_from_obj, date_to_obj):
+        date_key = order_date.isoformat()
         if date_key not in summary_by_date:
             summary_by_date[date_key] = {
                 'date': date_key,
                 'total_orders': 0,
                 'total_amount': 0,
-                'by_restaurant': {}
-            }
-        
-        summary_by_date[date_key]['total_orders'] += 1
-        summary_by_date[date_key]['total_amount'] += float(order.total_amount)
-        
-        rest_id = order.restaurant_id
-        if rest_id not in summary_by_date[date_key]['by_restaurant']:
-            summary_by_date[date_key]['by_restaurant'][rest_id] = {
-                'restaurant_id': rest_id,
-                'restaurant_name': order.restaurant.name,
-                'order_count': 0,
-                'total_amount': 0
+                'by_restaurant': []
             }
-        
-        summary_by_date[date_key]['by_restaurant'][rest_id]['order_count'] += 1
-        summary_by_date[date_key]['by_restaurant'][rest_id]['total_amount'] += float(order.total_amount)
-    
-    # Convert to list
-    summary_list = []
-    for date_summary in summary_by_date.values():
-        date_summary['by_restaurant'] = list(date_summary['by_restaurant'].values())
-        summary_list.append(date_summary)
-    
+
+        summary_by_date[date_key]['total_orders'] += order_count
+        summary_by_date[date_key]['total_amount'] += float(total_amount)
+        summary_by_date[date_key]['by_restaurant'].append({
+            'restaurant_id': rest_id,
+            'restaurant_name': restaurant_name,
+            'order_count': order_count,
+            'total_amount': float(total_amount)
+        })
+
     # Sort by date
-    summary_list.sort(key=lambda x: x['date'])
+    summary_list = sorted(summary_by_date.values(), key=lambda x: x['date'])
     
     return jsonify({
         'summary': summary_list,
@@ -572,6 +862,12 @@ def send_orders_to_restaurant(user):
             return jsonify({'error': 'restaurant_id and date are required'}), 400
         
         target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
+
+        if current_app.config.get('OUTBOX_ENABLED'):
+            success, message, message_id = queue_restaurant_summary_for_date(restaurant_id, target_date_obj)
+            if success:
+                return jsonify({'message': message, 'message_id': message_id}), 202
+            return jsonify({'error': message}), 400
         
         success, message = generate_restaurant_summary_for_date(restaurant_id, target_date_obj)
         
@@ -618,30 +914,23 @@ def get_order_report(user):
     if request.args.get('date_to'):
         date_to = datetime.strptime(request.args.get('date_to'), '%Y-%m-%d').date()
     
-    # Get orders
-    orders = Order.query.filter(
-        Order.order_date >= date_from,
-        Order.order_date <= date_to
-    ).all()
-    
-    # Calculate stats
-    total_orders = len(orders)
-    total_revenue = sum(float(order.total_amount) for order in orders)
-    avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
-    
     # Orders by restaurant
     by_restaurant = {}
-    for order in orders:
-        rest_id = order.restaurant_id
+    for _, rest_id, restaurant_name, order_count, total_amount in _order_totals(date_from, date_to, by_date=False):
         if rest_id not in by_restaurant:
             by_restaurant[rest_id] = {
                 'restaurant_id': rest_id,
-                'restaurant_name': order.restaurant.name,
+                'restaurant_name': restaurant_name,
                 'order_count': 0,
                 'total_revenue': 0
             }
-        by_restaurant[rest_id]['order_count'] += 1
-        by_restaurant[rest_id]['total_revenue'] += float(order.total_amount)
+        by_restaurant[rest_id]['order_count'] += order_count
+        by_restaurant[rest_id]['total_revenue'] += float(total_amount)
+
+    # Calculate stats
+    total_orders = sum(r['order_count'] for r in by_restaurant.values())
+    total_revenue = sum(r['total_revenue'] for r in by_restaurant.values())
+    avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
     
     return jsonify({
         'date_from': date_from.isoformat(),
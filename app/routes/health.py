@@ -1,5 +1,7 @@
 """Health check endpoints."""
 from flask import Blueprint, jsonify
+from app.middleware.auth import admin_required
+from app.utils.circuit_breaker import circuit_breaker_states
 
 bp = Blueprint('health', __name__, url_prefix='/api')
 
@@ -8,3 +10,9 @@ bp = Blueprint('health', __name__, url_prefix='/api')
 def health():
     return jsonify({"status": "ok"}), 200
 
+
+@bp.get('/health/circuits')
+@admin_required
+def circuits(user):
+    """State and trip counts of the outbound provider circuit breakers in this process."""
+    return jsonify({"circuits": circuit_breaker_states()}), 200
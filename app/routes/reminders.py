@@ -1,11 +1,11 @@
 """Reminder management routes."""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, date, timedelta
 from app.models import Reminder, ReminderSchedule
 from app.services.reminder_service import ReminderService
 from app.middleware.auth import admin_required
 from app.utils.decorators import paginated
-from app.utils.helpers import paginate_query
+from app.utils.helpers import paginate, pagination_meta
 from app import db
 
 bp = Blueprint('reminders', __name__, url_prefix='/api/reminders')
@@ -14,8 +14,8 @@ bp = Blueprint('reminders', __name__, url_prefix='/api/reminders')
 @bp.route('', methods=['GET'])
 @admin_required
 @paginated(default_per_page=50, max_per_page=200)
-def list_reminders(user, page, per_page):
-    """List all reminders with filters."""
+def list_reminders(user, page, per_page, cursor):
+    """List all reminders with filters (newest first; `?cursor=` for cursor pagination)."""
     query = Reminder.query
     
     # Filter by status
@@ -28,20 +28,18 @@ def list_reminders(user, page, per_page):
     if date_from:
         query = query.filter(Reminder.order_date >= datetime.strptime(date_from, '%Y-%m-%d').date())
     
-    # Order by created date
-    query = query.order_by(Reminder.created_at.desc())
-    
-    # Paginate
-    result = paginate_query(query, page=page, per_page=per_page)
+    # Paginate, newest first
+    try:
+        result = paginate(
+            query, [Reminder.created_at, Reminder.id], page=page, per_page=per_page,
+            cursor=cursor, total=request.args.get('total'), max_per_page=200
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'reminders': [r.to_dict() for r in result['items']],
-        'pagination': {
-            'total': result['total'],
-            'page': result['page'],
-            'per_page': result['per_page'],
-            'pages': result['pages']
-        }
+        'pagination': pagination_meta(result)
     }), 200
 
 
@@ -56,6 +54,14 @@ def send_reminders_manually(user):
             target_date = (date.today() + timedelta(days=1)).isoformat()
         
         target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
+
+        if current_app.config.get('OUTBOX_ENABLED'):
+            message_ids = ReminderService.queue_reminders_for_dates([target_date_obj])
+            return jsonify({
+                'message': f'Reminders queued for {target_date}',
+                'queued': len(message_ids),
+                'message_ids': message_ids
+            }), 202
         
         sent, failed = ReminderService.send_reminders_for_date(target_date_obj)
         
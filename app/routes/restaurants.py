@@ -5,6 +5,7 @@ from datetime import datetime
 from app import db
 from app.models import Restaurant, RestaurantAvailability, Menu, MotdOption
 from app.schemas import RestaurantSchema, RestaurantCreateSchema, RestaurantUpdateSchema
+from app.services.availability_service import AvailabilityService
 from app.middleware.auth import auth_required, admin_required
 from app.utils.decorators import validate_json
 
@@ -55,10 +56,7 @@ def get_available_restaurants(user):
     if weekday > 4:
         return jsonify({'date': target_date_obj.isoformat(), 'restaurants': []}), 200
 
-    available_ids = [
-        r.restaurant_id
-        for r in RestaurantAvailability.query.filter_by(weekday=weekday, is_available=True).all()
-    ]
+    available_ids = AvailabilityService.restaurants_available_on(weekday)
     if not available_ids:
         return jsonify({'date': target_date_obj.isoformat(), 'restaurants': []}), 200
 
@@ -106,7 +104,7 @@ def create_restaurant(user):
         db.session.add(restaurant)
         db.session.flush()
 
-        # Default availability: Mon-Fri
+        # Default availability: Mon-Fri (commit also invalidates AvailabilityService caches)
         for w in range(5):
             db.session.add(RestaurantAvailability(restaurant_id=restaurant.id, weekday=w, is_available=True))
         db.session.commit()
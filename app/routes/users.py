@@ -6,7 +6,7 @@ from app.models import User
 from app.schemas import UserSchema, UserCreateSchema, UserUpdateSchema
 from app.middleware.auth import admin_required
 from app.utils.decorators import validate_json, paginated
-from app.utils.helpers import paginate_query
+from app.utils.helpers import paginate, pagination_meta
 
 bp = Blueprint('users', __name__, url_prefix='/api/users')
 
@@ -19,9 +19,9 @@ user_update_schema = UserUpdateSchema()
 @bp.route('', methods=['GET'])
 @admin_required
 @paginated(default_per_page=20, max_per_page=100)
-def list_users(user, page, per_page):
-    """List all users (paginated)."""
-    query = User.query.order_by(User.created_at.desc())
+def list_users(user, page, per_page, cursor):
+    """List all users (paginated, newest first; `?cursor=` for cursor pagination)."""
+    query = User.query
     
     # Filter by role if specified
     role = request.args.get('role')
@@ -34,16 +34,17 @@ def list_users(user, page, per_page):
         query = query.filter_by(is_active=is_active.lower() == 'true')
     
     # Paginate
-    result = paginate_query(query, page=page, per_page=per_page)
+    try:
+        result = paginate(
+            query, [User.created_at, User.id], page=page, per_page=per_page,
+            cursor=cursor, total=request.args.get('total'), max_per_page=100
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'users': users_schema.dump(result['items']),
-        'pagination': {
-            'total': result['total'],
-            'page': result['page'],
-            'per_page': result['per_page'],
-            'pages': result['pages']
-        }
+        'pagination': pagination_meta(result)
     }), 200
 
 
@@ -0,0 +1,134 @@
+"""Process-local cache of restaurant weekday availability.
+
+restaurant_availability is tiny and read on every order create/update and
+by the restaurant and MOTD listings, so each process keeps it as a
+restaurant_id -> weekdays map. Any write to the table (ORM flush or bulk
+statement) bumps a counter in cache_versions in the same transaction; this
+process drops its map on commit and other workers reload when they see the
+counter move (checked at most every AVAILABILITY_VERSION_CHECK_SECONDS).
+"""
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.orm import Session
+from app import db
+from app.models import CacheVersion, RestaurantAvailability
+
+CACHE_NAME = 'restaurant_availability'
+_CHANGED_KEY = 'availability_changed'
+
+_lock = threading.Lock()
+_state = {'map': None, 'version': None, 'checked_at': 0.0}
+_registered = False
+
+
+class AvailabilityService:
+    """Read restaurant availability from the in-process map."""
+
+    @staticmethod
+    def get_map():
+        """Return {restaurant_id: frozenset of available weekdays (0=Mon..6=Sun)}."""
+        interval = current_app.config.get('AVAILABILITY_VERSION_CHECK_SECONDS', 5)
+        now = time.monotonic()
+        with _lock:
+            cached = _state['map']
+            if cached is not None and now - _state['checked_at'] < interval:
+                return cached
+
+        # Read the version before the rows: a write committing in between
+        # leaves us one version behind, so the next check reloads
+        version = AvailabilityService._current_version()
+        with _lock:
+            if _state['map'] is not None and _state['version'] == version:
+                _state['checked_at'] = now
+                return _state['map']
+
+        by_restaurant = {}
+        rows = db.session.execute(
+            select(RestaurantAvailability.restaurant_id, RestaurantAvailability.weekday)
+            .where(RestaurantAvailability.is_available.is_(True))
+        )
+        for restaurant_id, weekday in rows:
+            by_restaurant.setdefault(restaurant_id, set()).add(weekday)
+        availability = {k: frozenset(v) for k, v in by_restaurant.items()}
+
+        with _lock:
+            _state.update(map=availability, version=version, checked_at=now)
+        return availability
+
+    @staticmethod
+    def is_available(restaurant_id, weekday):
+        """Return True if restaurant is available on weekday (0=Mon..6=Sun)."""
+        return weekday in AvailabilityService.get_map().get(restaurant_id, ())
+
+    @staticmethod
+    def restaurants_available_on(weekday):
+        """Ids of restaurants available on weekday."""
+        return sorted(k for k, weekdays in AvailabilityService.get_map().items() if weekday in weekdays)
+
+    @staticmethod
+    def invalidate():
+        """Drop this process's map; the next read reloads it."""
+        with _lock:
+            _state.update(map=None, version=None, checked_at=0.0)
+
+    @staticmethod
+    def _current_version():
+        return db.session.execute(
+            select(CacheVersion.version).where(CacheVersion.name == CACHE_NAME)
+        ).scalar() or 0
+
+    @staticmethod
+    def bump_version(connection):
+        """Increment the availability version on connection (part of the caller's transaction)."""
+        table = CacheVersion.__table__
+        result = connection.execute(
+            update(table)
+            .where(table.c.name == CACHE_NAME)
+            .values(version=table.c.version + 1, updated_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(name=CACHE_NAME, version=1, updated_at=datetime.utcnow()))
+
+
+def _after_flush(session, flush_context):
+    if session.info.get(_CHANGED_KEY):
+        return
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RestaurantAvailability):
+            AvailabilityService.bump_version(session.connection())
+            session.info[_CHANGED_KEY] = True
+            return
+
+
+def _do_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    session = orm_execute_state.session
+    if table is not None and table in (RestaurantAvailability.__table__,) and not session.info.get(_CHANGED_KEY):
+        AvailabilityService.bump_version(session.connection())
+        session.info[_CHANGED_KEY] = True
+
+
+def _after_commit(session):
+    if session.info.pop(_CHANGED_KEY, None):
+        AvailabilityService.invalidate()
+
+
+def _after_rollback(session):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def register_availability_cache():
+    """Install the session hooks that version availability writes (idempotent)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'do_orm_execute', _do_orm_execute)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    _registered = True
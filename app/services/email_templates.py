@@ -0,0 +1,53 @@
+"""Compiled Jinja2 templates for restaurant emails and admin drafts.
+
+Templates live in app/templates/email. The environment compiles each one on
+first use and keeps it cached for the life of the process (no mtime checks).
+`.html` templates autoescape user content; `.txt` templates do not.
+"""
+from jinja2 import Environment, PackageLoader, StrictUndefined, select_autoescape
+
+_env = Environment(
+    loader=PackageLoader('app', 'templates/email'),
+    autoescape=select_autoescape(enabled_extensions=('html',), default_for_string=False, default=False),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+    undefined=StrictUndefined,
+)
+
+
+def render(template_name, context):
+    """Render one template with `context`."""
+    return _env.get_template(template_name).render(context)
+
+
+def render_restaurant_summary(restaurant, order_date, orders):
+    """Render (html, text) for a restaurant order summary from SummaryOrder snapshots."""
+    context = {
+        'restaurant_name': restaurant.name,
+        'date_label': order_date.strftime('%A, %B %d, %Y'),
+        'total_orders': len(orders),
+        'total_amount': sum(order.total_amount for order in orders),
+        'orders': orders,
+    }
+    return render('restaurant_summary.html', context), render('restaurant_summary.txt', context)
+
+
+def render_restaurant_draft(restaurant, order_date, orders):
+    """Render the plain-text admin draft body from SummaryOrder snapshots."""
+    lines = []
+    for order in orders:
+        text = (order.order_text or '').strip()
+        if not text and order.items:
+            # Structured order fallback
+            text = ', '.join(f'{item.quantity}x {item.menu_item_name}' for item in order.items).strip()
+        lines.append({
+            'user_label': order.user_name or f'User {order.user_id}',
+            'text': text or '(no order details)',
+            'notes': (order.notes or '').strip(),
+        })
+    return render('restaurant_draft.txt', {
+        'greeting_name': restaurant.contact_name or restaurant.name,
+        'date_label': order_date.strftime('%A, %b %d, %Y'),
+        'lines': lines,
+    })
@@ -0,0 +1,258 @@
+"""Email transport backends used by EmailService.
+
+Selected by name (EMAIL_BACKEND / ADMIN_EMAIL_BACKEND):
+
+- sendgrid: SendGrid v3 API over a pooled keep-alive session (production)
+- smtp: any SMTP server, e.g. a local sink for load tests
+- console: one line per email to the log, full message to stdout
+- file: one file per email in a maildir (EMAIL_FILE_PATH)
+
+Every transport implements send(to_email, subject, html_content, plain_content)
+and returns (success, message) like the other services.
+"""
+import logging
+import mailbox
+import os
+import smtplib
+import sys
+import threading
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from sendgrid import SendGridAPIClient, __version__ as sendgrid_version
+from sendgrid.helpers.mail import Mail, Email, To, Content
+from app.utils.circuit_breaker import CircuitOpenError, get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+
+def _mime_message(to_email, subject, html_content, plain_content):
+    """Build a multipart/alternative message from the configured sender."""
+    config = current_app.config
+    message = EmailMessage()
+    message['From'] = formataddr((config['FROM_NAME'], config['FROM_EMAIL']))
+    message['To'] = to_email
+    message['Subject'] = subject
+    message['Message-ID'] = make_msgid(domain=config['FROM_EMAIL'].partition('@')[2] or None)
+    message.set_content(plain_content or '')
+    message.add_alternative(html_content, subtype='html')
+    return message
+
+
+class SendGridTransport:
+    """SendGrid v3 API.
+
+    The SendGridAPIClient is cached per process and API key. Its own urllib
+    transport opens a new HTTPS connection per call, so requests go through a
+    pooled requests.Session with headers built from the API key; the client
+    only supplies the API host. Both are re-created after a fork (pid change).
+    """
+
+    name = 'sendgrid'
+
+    def __init__(self):
+        self._client = None
+        self._client_key = None
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+
+    def client(self, api_key):
+        """Return the cached SendGridAPIClient for this process and key."""
+        key = (os.getpid(), api_key)
+        if self._client is None or self._client_key != key:
+            with self._lock:
+                if self._client is None or self._client_key != key:
+                    self._client = SendGridAPIClient(api_key)
+                    self._client_key = key
+        return self._client
+
+    def http(self):
+        """Return the shared requests.Session for SendGrid API calls."""
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    session = requests.Session()
+                    session.mount('https://', HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=current_app.config.get('EMAIL_HTTP_POOL_SIZE', 4)
+                    ))
+                    self._session = session
+                    self._session_pid = pid
+        return self._session
+
+    @staticmethod
+    def headers(api_key):
+        """Request headers for the v3 API, built from api_key."""
+        return {
+            'Authorization': f'Bearer {api_key}',
+            'User-Agent': f'sendgrid/{sendgrid_version};python',
+            'Accept': 'application/json',
+        }
+
+    def _post(self, api_key, message):
+        """POST a Mail to /v3/mail/send through the 'sendgrid' circuit breaker."""
+        breaker = get_circuit_breaker('sendgrid', current_app.config)
+        if not breaker.allow_request():
+            raise CircuitOpenError('sendgrid')
+        client = self.client(api_key)
+        try:
+            response = self.http().post(
+                f'{client.host}/v3/mail/send',
+                json=message.get(),
+                headers=self.headers(api_key),
+                timeout=current_app.config.get('EMAIL_HTTP_TIMEOUT', 10)
+            )
+        except Exception:
+            breaker.record_failure()
+            raise
+        # Only provider-side errors trip the breaker; 4xx means our request was bad.
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def send(self, to_email, subject, html_content, plain_content=None):
+        config = current_app.config
+        api_key = config['SENDGRID_API_KEY']
+        if not api_key:
+            logger.error('SendGrid API key not configured')
+            return False, 'Email not configured'
+
+        message = Mail(
+            from_email=Email(config['FROM_EMAIL'], config['FROM_NAME']),
+            to_emails=To(to_email),
+            subject=subject,
+            html_content=Content("text/html", html_content)
+        )
+        if plain_content:
+            message.add_content(Content("text/plain", plain_content))
+
+        response = self._post(api_key, message)
+        if response.status_code in [200, 201, 202]:
+            return True, 'Email sent'
+        logger.error(f'SendGrid error: {response.status_code}')
+        return False, f'SendGrid error: {response.status_code}'
+
+
+class SMTPTransport:
+    """Plain SMTP with one persistent connection per thread."""
+
+    name = 'smtp'
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _connection(self):
+        config = current_app.config
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and getattr(self._local, 'pid', None) == os.getpid():
+            return connection
+
+        connection = smtplib.SMTP(
+            config.get('SMTP_HOST', 'localhost'),
+            config.get('SMTP_PORT', 25),
+            timeout=config.get('SMTP_TIMEOUT', 10)
+        )
+        if config.get('SMTP_USE_TLS'):
+            connection.starttls()
+        if config.get('SMTP_USERNAME'):
+            connection.login(config['SMTP_USERNAME'], config.get('SMTP_PASSWORD') or '')
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _drop_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def send(self, to_email, subject, html_content, plain_content=None):
+        breaker = get_circuit_breaker('smtp', current_app.config)
+        if not breaker.allow_request():
+            raise CircuitOpenError('smtp')
+
+        message = _mime_message(to_email, subject, html_content, plain_content)
+        try:
+            try:
+                self._connection().send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                # Server closed an idle connection; reconnect once.
+                self._drop_connection()
+                self._connection().send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            breaker.record_success()
+            return False, f'SMTP recipient refused: {e.recipients}'
+        except Exception:
+            breaker.record_failure()
+            self._drop_connection()
+            raise
+        breaker.record_success()
+        return True, 'Email sent'
+
+
+class ConsoleTransport:
+    """Log one line per email and write the full message to stdout."""
+
+    name = 'console'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def send(self, to_email, subject, html_content, plain_content=None):
+        message = _mime_message(to_email, subject, html_content, plain_content)
+        with self._lock:
+            sys.stdout.write(message.as_string())
+            sys.stdout.write('\n' + '-' * 79 + '\n')
+            sys.stdout.flush()
+        logger.info(f'Email to {to_email} written to console: {subject}')
+        return True, 'Email logged (not sent)'
+
+
+class FileTransport:
+    """Write each email as a file into a maildir (EMAIL_FILE_PATH)."""
+
+    name = 'file'
+
+    def send(self, to_email, subject, html_content, plain_content=None):
+        path = current_app.config.get('EMAIL_FILE_PATH', 'mail')
+        message = _mime_message(to_email, subject, html_content, plain_content)
+        # Maildir(create=True) only builds tmp/new/cur when the directory is missing
+        for subdir in ('tmp', 'new', 'cur'):
+            os.makedirs(os.path.join(path, subdir), exist_ok=True)
+        key = mailbox.Maildir(path, create=False).add(message)
+        logger.info(f'Email to {to_email} written to {path} ({key})')
+        return True, 'Email written to file (not sent)'
+
+
+EMAIL_TRANSPORTS = {
+    'sendgrid': SendGridTransport,
+    'smtp': SMTPTransport,
+    'console': ConsoleTransport,
+    'file': FileTransport,
+}
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_email_transport(name):
+    """Return the process-wide transport instance for a backend name."""
+    transport = _transports.get(name)
+    if transport is None:
+        if name not in EMAIL_TRANSPORTS:
+            raise ValueError(f'Unknown email backend: {name}')
+        with _transports_lock:
+            transport = _transports.get(name)
+            if transport is None:
+                transport = EMAIL_TRANSPORTS[name]()
+                _transports[name] = transport
+    return transport
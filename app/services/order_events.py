@@ -0,0 +1,244 @@
+"""Notify in-process subscribers after transactions that changed orders commit.
+
+Caches that depend on orders subscribe here and are told which
+(restaurant_id, order_date) pairs changed once the transaction is durable.
+Flushed ORM objects (Order, OrderItem) are tracked precisely. Bulk
+statements run through the session (update(Order)..., insert(OrderItem)...) cannot
+be attributed to specific rows, so they are reported as ALL_ORDERS.
+
+Notifications are per process; other gunicorn workers rely on their own
+cache TTLs or version keys.
+
+Event subscribers (subscribe_events) additionally get one OrderEvent per
+changed order for the admin live feed.
+"""
+import logging
+import threading
+from collections import namedtuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+from app.models import Order, OrderItem
+
+logger = logging.getLogger(__name__)
+
+# Sentinel in a change set meaning "some orders changed, scope unknown".
+ALL_ORDERS = ('*', '*')
+
+# One committed change to one order. type is created, updated, cancelled,
+# status_changed or deleted; 'refresh' (order_id None) stands for a bulk
+# statement whose rows are unknown.
+OrderEvent = namedtuple('OrderEvent', ['type', 'order_id', 'restaurant_id', 'order_date', 'status', 'previous_status'])
+
+_PENDING_KEY = 'order_changes'
+_EVENTS_KEY = 'order_events'
+_subscribers = []
+_event_subscribers = []
+_subscribers_lock = threading.Lock()
+_registered = False
+
+
+def subscribe(callback):
+    """Call callback(changes) after every commit that touched orders.
+
+    changes is a set of (restaurant_id, order_date) tuples and may contain
+    ALL_ORDERS. Callbacks run on the committing thread, outside the
+    transaction, and must be quick and must not raise.
+    """
+    with _subscribers_lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback):
+    with _subscribers_lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def subscribe_events(callback):
+    """Call callback(events) with the list of OrderEvents after every commit that touched orders."""
+    with _subscribers_lock:
+        if callback not in _event_subscribers:
+            _event_subscribers.append(callback)
+    return callback
+
+
+def unsubscribe_events(callback):
+    with _subscribers_lock:
+        if callback in _event_subscribers:
+            _event_subscribers.remove(callback)
+
+
+def pending_events(session):
+    """OrderEvents flushed or executed in the session's current transaction (not yet committed)."""
+    return list(session.info.get(_EVENTS_KEY, ()))
+
+
+def _order_scope(obj):
+    if isinstance(obj, Order):
+        return obj.restaurant_id, obj.order_date
+    order = obj.order if isinstance(obj, OrderItem) else None
+    if order is not None:
+        return order.restaurant_id, order.order_date
+    return ALL_ORDERS
+
+
+def _before_flush(session, flush_context, instances):
+    changes = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, (Order, OrderItem)):
+            continue
+        changes.add(_order_scope(obj))
+        if isinstance(obj, Order):
+            # An order moved to another restaurant or date also changes its old scope
+            attrs = inspect(obj).attrs
+            old_restaurants = attrs.restaurant_id.history.deleted or [obj.restaurant_id]
+            old_dates = attrs.order_date.history.deleted or [obj.order_date]
+            changes.update((r, d) for r in old_restaurants for d in old_dates)
+    if not changes:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def _order_event(obj, session):
+    """The OrderEvent for an Order flushed as new, dirty or deleted (None if nothing changed)."""
+    if obj in session.new:
+        return OrderEvent('created', obj.id, obj.restaurant_id, obj.order_date, obj.status, None)
+    if obj in session.deleted:
+        return OrderEvent('deleted', obj.id, obj.restaurant_id, obj.order_date, obj.status, None)
+    if not session.is_modified(obj):
+        return None
+    history = inspect(obj).attrs.status.history
+    # previous is None when status was expired (not loaded) before being set
+    previous = history.deleted[0] if history.deleted else None
+    if history.added and previous != obj.status:
+        event_type = 'cancelled' if obj.status == 'cancelled' else 'status_changed'
+        return OrderEvent(event_type, obj.id, obj.restaurant_id, obj.order_date, obj.status, previous)
+    return OrderEvent('updated', obj.id, obj.restaurant_id, obj.order_date, obj.status, None)
+
+
+def _after_flush(session, flush_context):
+    """Record one OrderEvent per order changed by this flush (ids are assigned by now)."""
+    events = {}
+    touched = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Order):
+            order_event = _order_event(obj, session)
+            if order_event is not None:
+                events[obj.id] = order_event
+        elif isinstance(obj, OrderItem) and obj.order_id is not None:
+            touched.add(obj.order_id)
+
+    # Item changes are updates of their order, unless the order has its own event
+    for order_id in touched - set(events):
+        order = session.identity_map.get(identity_key(Order, order_id))
+        if order is None:
+            events[order_id] = OrderEvent('updated', order_id, None, None, None, None)
+        elif order not in session.deleted:
+            events[order_id] = OrderEvent('updated', order_id, order.restaurant_id, order.order_date, order.status, None)
+
+    if events:
+        pending = session.info.setdefault(_EVENTS_KEY, [])
+        # One event per order and transaction unless its status moves
+        reported = {e.order_id for e in pending if e.type in ('created', 'updated')}
+        pending.extend(e for e in events.values() if not (e.type == 'updated' and e.order_id in reported))
+
+
+def _record_item_orders(session, order_ids):
+    """Attribute a bulk statement on order items to their orders when those are in the session.
+
+    Returns False (caller falls back to ALL_ORDERS) if any order is unknown.
+    """
+    if not order_ids:
+        return False
+    orders = {}
+    for order_id in order_ids:
+        order = session.identity_map.get(identity_key(Order, order_id)) if order_id is not None else None
+        if order is None:
+            return False
+        orders[order_id] = order
+
+    pending = session.info.setdefault(_EVENTS_KEY, [])
+    reported = {e.order_id for e in pending}
+    for order_id, order in orders.items():
+        session.info.setdefault(_PENDING_KEY, set()).add(_order_scope(order))
+        if order_id not in reported:
+            pending.append(OrderEvent('updated', order_id, order.restaurant_id, order.order_date, order.status, None))
+    return True
+
+
+def _item_statement_order_ids(orm_execute_state):
+    """Order ids touched by an INSERT of order items, or a DELETE WHERE order_id = X (None if unknown)."""
+    if orm_execute_state.is_insert:
+        parameters = orm_execute_state.parameters
+        if isinstance(parameters, dict):
+            parameters = [parameters]
+        return [params.get('order_id') for params in parameters or ()]
+    if orm_execute_state.is_delete:
+        clause = orm_execute_state.statement.whereclause
+        if (
+            isinstance(clause, BinaryExpression)
+            and clause.operator is operators.eq
+            and isinstance(clause.right, BindParameter)
+            and getattr(clause.left, 'table', None) in (OrderItem.__table__,)
+            and clause.left.key == 'order_id'
+        ):
+            return [clause.right.effective_value]
+    return None
+
+
+def _do_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    # Covers ORM-enabled update(Order) as well as Core Order.__table__.delete()
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table in (OrderItem.__table__,) and _record_item_orders(
+        orm_execute_state.session, _item_statement_order_ids(orm_execute_state)
+    ):
+        return
+    if table is not None and table in (Order.__table__, OrderItem.__table__):
+        orm_execute_state.session.info.setdefault(_PENDING_KEY, set()).add(ALL_ORDERS)
+        orm_execute_state.session.info.setdefault(_EVENTS_KEY, []).append(
+            OrderEvent('refresh', None, None, None, None, None)
+        )
+
+
+def _notify(subscribers, payload):
+    with _subscribers_lock:
+        subscribers = list(subscribers)
+    for callback in subscribers:
+        try:
+            callback(payload)
+        except Exception as e:
+            logger.error(f'Order change subscriber failed: {str(e)}')
+
+
+def _after_commit(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    events = session.info.pop(_EVENTS_KEY, None)
+    if changes:
+        _notify(_subscribers, changes)
+    if events:
+        _notify(_event_subscribers, events)
+
+
+def _after_rollback(session):
+    # Flushed changes from a rolled-back transaction never became visible
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_EVENTS_KEY, None)
+
+
+def register_order_events():
+    """Install the session hooks (idempotent; called from create_app)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(Session, 'before_flush', _before_flush)
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'do_orm_execute', _do_orm_execute)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    _registered = True
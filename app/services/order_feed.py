@@ -0,0 +1,227 @@
+"""Live feed of committed order changes for the admin UI (Server-Sent Events).
+
+Order writes produce OrderEvents (app.services.order_events). Each process
+keeps the recent ones in a ring buffer that /api/admin/orders/stream serves,
+so an admin page can load once and then apply deltas instead of polling.
+
+Relays:
+
+- local: events are published to this process's buffer after commit. Fine
+  for a single process (development, tests).
+- postgres: events are sent with pg_notify inside the committing transaction
+  (delivered only if it commits) and every process LISTENs, so clients see
+  changes made by any gunicorn worker, the scheduler or the outbox worker.
+"""
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from collections import deque
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.services.order_events import pending_events, subscribe_events
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'motd_order_events'
+# pg_notify payloads must stay under 8000 bytes
+_NOTIFY_BATCH = 40
+
+
+def event_payload(order_event):
+    """JSON-ready dict for an OrderEvent."""
+    return {
+        'type': order_event.type,
+        'order_id': order_event.order_id,
+        'restaurant_id': order_event.restaurant_id,
+        'order_date': order_event.order_date.isoformat() if order_event.order_date else None,
+        'status': order_event.status,
+        'previous_status': order_event.previous_status,
+    }
+
+
+class OrderFeed:
+    """Ring buffer of recent order events that stream clients wait on.
+
+    Event ids are '<epoch>-<sequence>'. The epoch is unique per buffer, so a
+    client reconnecting to another worker (or after a restart) is told to
+    refresh instead of silently missing events.
+    """
+
+    def __init__(self, buffer_size=500):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._events = deque(maxlen=buffer_size)
+        self._last_seq = 0
+        self._cond = threading.Condition()
+        self._clients = 0
+
+    @property
+    def last_seq(self):
+        with self._cond:
+            return self._last_seq
+
+    def publish(self, payloads):
+        """Append event payloads and wake every waiting client."""
+        if not payloads:
+            return
+        with self._cond:
+            for payload in payloads:
+                self._last_seq += 1
+                self._events.append((self._last_seq, payload))
+            self._cond.notify_all()
+
+    def resume_point(self, last_event_id):
+        """Return (sequence to continue after, missed) for a Last-Event-ID header value."""
+        current = self.last_seq
+        if not last_event_id:
+            return current, False
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > current:
+            return current, True
+        return int(seq), False
+
+    def wait(self, after_seq, timeout):
+        """Block up to timeout seconds for events after after_seq.
+
+        Returns (events, missed): events is a list of (seq, payload); missed
+        is True when events after after_seq already fell out of the buffer.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._last_seq > after_seq, timeout)
+            if not self._events or self._last_seq <= after_seq:
+                return [], False
+            oldest = self._events[0][0]
+            missed = after_seq < oldest - 1
+            return [(seq, payload) for seq, payload in self._events if seq > after_seq], missed
+
+    def acquire(self, max_clients):
+        """Reserve a stream slot; False when max_clients streams are already open."""
+        with self._cond:
+            if self._clients >= max_clients:
+                return False
+            self._clients += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._clients = max(0, self._clients - 1)
+
+
+class PostgresListener:
+    """Background thread that LISTENs on CHANNEL and publishes into the feed."""
+
+    def __init__(self, engine, feed):
+        self.engine = engine
+        self.feed = feed
+        self.pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='order-feed-listener', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        backoff = 1
+        while True:
+            connection = None
+            try:
+                connection = self.engine.raw_connection()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                backoff = 1
+                while True:
+                    if select.select([dbapi_connection], [], [], 30) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    payloads = []
+                    while dbapi_connection.notifies:
+                        payloads.extend(json.loads(dbapi_connection.notifies.pop(0).payload))
+                    self.feed.publish(payloads)
+            except Exception as e:
+                logger.error(f'Order feed listener error: {str(e)}')
+                # Notifications sent while disconnected are lost; tell clients to reload
+                self.feed.publish([{'type': 'refresh', 'order_id': None}])
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+_feed = None
+_listener = None
+_relay = None
+_buffer_size = 500
+_lock = threading.Lock()
+
+
+def get_order_feed():
+    """The process-wide OrderFeed (re-created after a fork)."""
+    global _feed
+    if _feed is None:
+        with _lock:
+            if _feed is None:
+                _feed = OrderFeed(_buffer_size)
+    return _feed
+
+
+def ensure_listener(engine):
+    """Start this process's LISTEN thread when the postgres relay is in use (idempotent)."""
+    global _listener
+    if _relay != 'postgres':
+        return
+    if _listener is None or _listener.pid != os.getpid():
+        with _lock:
+            if _listener is None or _listener.pid != os.getpid():
+                _listener = PostgresListener(engine, get_order_feed())
+                _listener.start()
+
+
+def _publish_local(events):
+    get_order_feed().publish([event_payload(e) for e in events])
+
+
+def _notify_postgres(session):
+    """Send this transaction's order events with pg_notify (delivered on commit only)."""
+    if not session.info.get('order_events') and not session.dirty and not session.new and not session.deleted:
+        return
+    # commit() flushes after before_commit; flush now so those events are included
+    session.flush()
+    events = pending_events(session)
+    for start in range(0, len(events), _NOTIFY_BATCH):
+        payload = json.dumps([event_payload(e) for e in events[start:start + _NOTIFY_BATCH]])
+        session.execute(text('SELECT pg_notify(:channel, :payload)'), {'channel': CHANNEL, 'payload': payload})
+
+
+def _reset_after_fork():
+    global _feed, _listener
+    _feed = None
+    _listener = None
+
+
+def register_order_feed(app):
+    """Pick the relay from ORDER_FEED_RELAY (auto = postgres on PostgreSQL) and install it."""
+    global _relay, _buffer_size
+    if _relay is not None:
+        return
+    _buffer_size = app.config.get('ORDER_FEED_BUFFER', 500)
+    relay = app.config.get('ORDER_FEED_RELAY', 'auto')
+    if relay == 'auto':
+        relay = 'postgres' if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres') else 'local'
+    if relay not in ('local', 'postgres'):
+        raise ValueError(f'Unknown ORDER_FEED_RELAY: {relay}')
+
+    if relay == 'postgres':
+        event.listen(Session, 'before_commit', _notify_postgres)
+    else:
+        subscribe_events(_publish_local)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_reset_after_fork)
+    _relay = relay
@@ -1,9 +1,11 @@
 """Order service for business logic."""
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 from app import db
-from app.models import Order, OrderItem, Menu, MenuItem, RestaurantAvailability
+from app.models import Order, OrderItem, Menu, MenuItem
+from app.services.availability_service import AvailabilityService
 from app.utils.helpers import get_week_dates
 
 
@@ -13,17 +15,55 @@ class OrderService:
     @staticmethod
     def _is_restaurant_available(restaurant_id, weekday):
         """Return True if restaurant is available on weekday (0=Mon..6=Sun)."""
-        has_any = RestaurantAvailability.query.filter_by(restaurant_id=restaurant_id).first() is not None
-        if not has_any:
-            return False
-        return (
-            RestaurantAvailability.query.filter_by(
-                restaurant_id=restaurant_id,
-                weekday=weekday,
-                is_available=True
-            ).first()
-            is not None
-        )
+        return AvailabilityService.is_available(restaurant_id, weekday)
+
+    @staticmethod
+    def _price_items(menu_id, items_data):
+        """Validate requested items against the menu and snapshot their prices.
+
+        All menu items are fetched with one IN query and checked in memory, in
+        request order. Returns (order item rows without order_id, total).
+        """
+        ids = {item_data['menu_item_id'] for item_data in items_data}
+        menu_items = {
+            menu_item.id: menu_item
+            for menu_item in MenuItem.query.filter(MenuItem.id.in_(ids)).all()
+        } if ids else {}
+
+        rows = []
+        total_amount = Decimal('0.00')
+        for item_data in items_data:
+            menu_item = menu_items.get(item_data['menu_item_id'])
+            if not menu_item:
+                raise ValueError(f'Menu item {item_data["menu_item_id"]} not found')
+
+            if menu_item.menu_id != menu_id:
+                raise ValueError(f'Menu item {menu_item.id} does not belong to this menu')
+
+            if not menu_item.is_available:
+                raise ValueError(f'Menu item {menu_item.name} is not available')
+
+            quantity = item_data['quantity']
+            price = menu_item.price
+            total_amount += price * quantity
+
+            rows.append({
+                'menu_item_id': menu_item.id,
+                'quantity': quantity,
+                'price': price,
+                'notes': item_data.get('notes')
+            })
+        return rows, total_amount
+
+    @staticmethod
+    def _insert_items(order_id, rows):
+        """Insert order item rows in one executemany."""
+        if rows:
+            # render_nulls keeps rows with and without notes in the same batch
+            db.session.execute(
+                insert(OrderItem).execution_options(render_nulls=True),
+                [dict(row, order_id=order_id) for row in rows]
+            )
     
     @staticmethod
     def create_order(user_id, menu_id, order_date, items_data, notes=None):
@@ -55,31 +95,7 @@ class OrderService:
             raise ValueError('You already have an order for this date')
         
         # Validate and calculate order items
-        order_items = []
-        total_amount = Decimal('0.00')
-        
-        for item_data in items_data:
-            menu_item = db.session.get(MenuItem, item_data['menu_item_id'])
-            if not menu_item:
-                raise ValueError(f'Menu item {item_data["menu_item_id"]} not found')
-            
-            if menu_item.menu_id != menu_id:
-                raise ValueError(f'Menu item {menu_item.id} does not belong to this menu')
-            
-            if not menu_item.is_available:
-                raise ValueError(f'Menu item {menu_item.name} is not available')
-            
-            quantity = item_data['quantity']
-            price = menu_item.price
-            subtotal = price * quantity
-            total_amount += subtotal
-            
-            order_items.append({
-                'menu_item_id': menu_item.id,
-                'quantity': quantity,
-                'price': price,
-                'notes': item_data.get('notes')
-            })
+        order_items, total_amount = OrderService._price_items(menu_id, items_data)
         
         if not order_items:
             raise ValueError('Order must contain at least one item')
@@ -98,13 +114,7 @@ class OrderService:
         db.session.add(order)
         db.session.flush()  # Get order.id
         
-        # Create order items
-        for item_data in order_items:
-            order_item = OrderItem(
-                order_id=order.id,
-                **item_data
-            )
-            db.session.add(order_item)
+        OrderService._insert_items(order.id, order_items)
         
         db.session.commit()
         
@@ -242,33 +252,15 @@ class OrderService:
         
         # Update items if provided
         if items_data:
-            # Delete existing items
+            order_items, total_amount = OrderService._price_items(order.menu_id, items_data)
+
+            # Replace existing items
             OrderItem.query.filter_by(order_id=order_id).delete()
-            
-            # Recreate items
-            total_amount = Decimal('0.00')
-            for item_data in items_data:
-                menu_item = db.session.get(MenuItem, item_data['menu_item_id'])
-                if not menu_item:
-                    raise ValueError(f'Menu item {item_data["menu_item_id"]} not found')
-                
-                if menu_item.menu_id != order.menu_id:
-                    raise ValueError(f'Menu item does not belong to order menu')
-                
-                quantity = item_data['quantity']
-                price = menu_item.price
-                total_amount += price * quantity
-                
-                order_item = OrderItem(
-                    order_id=order_id,
-                    menu_item_id=menu_item.id,
-                    quantity=quantity,
-                    price=price,
-                    notes=item_data.get('notes')
-                )
-                db.session.add(order_item)
+            OrderService._insert_items(order_id, order_items)
             
             order.total_amount = total_amount
+            # The item rows are replaced in bulk; mark the order itself as changed
+            order.updated_at = datetime.utcnow()
         
         db.session.commit()
         return order
@@ -305,6 +297,7 @@ class OrderService:
         # ensure no structured items remain
         OrderItem.query.filter_by(order_id=order.id).delete()
         order.total_amount = Decimal('0.00')
+        order.updated_at = datetime.utcnow()
 
         db.session.commit()
         return order
@@ -0,0 +1,229 @@
+"""Incrementally maintained order_daily_stats (counts and revenue per day)."""
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Date, select, update, delete, insert, event, func, and_, inspect, literal
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Order, OrderDailyStat, Restaurant
+
+_STAT_KEYS = ('order_date', 'restaurant_id', 'status')
+_registered = False
+
+
+def _amount(value):
+    return Decimal(str(value or 0))
+
+
+def _attribute_values(obj, key):
+    """Return (value before this flush, value after) for an Order attribute."""
+    history = inspect(obj).attrs[key].history
+    current = getattr(obj, key)
+    if history.deleted:
+        return history.deleted[0], current
+    return current, current
+
+
+class OrderStatsService:
+    """Keep order_daily_stats in step with the orders table.
+
+    ORM writes (OrderService create/update/cancel/status changes, admin edits)
+    are picked up by a flush hook. Set-based status changes must go through
+    update_status() so the stats move with them.
+    """
+
+    @staticmethod
+    def apply_deltas(deltas, connection=None):
+        """Add {(order_date, restaurant_id, status): [count, amount]} to the stats rows.
+
+        One upsert for all keys. Runs on the session's connection (no commit).
+        """
+        rows = [
+            {
+                'order_date': key[0],
+                'restaurant_id': key[1],
+                'status': key[2],
+                'order_count': count,
+                'total_amount': amount,
+                'updated_at': datetime.utcnow(),
+            }
+            for key, (count, amount) in deltas.items()
+            if count or amount
+        ]
+        if not rows:
+            return
+        connection = connection if connection is not None else db.session.connection()
+        table = OrderDailyStat.__table__
+        dialect = connection.dialect.name
+
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            stmt = dialect_insert(table).values(rows)
+            connection.execute(stmt.on_conflict_do_update(
+                index_elements=list(_STAT_KEYS),
+                set_={
+                    'order_count': table.c.order_count + stmt.excluded.order_count,
+                    'total_amount': table.c.total_amount + stmt.excluded.total_amount,
+                    'updated_at': stmt.excluded.updated_at,
+                }
+            ))
+            return
+
+        # Other backends: update in place, insert the keys that had no row yet
+        for row in rows:
+            result = connection.execute(
+                update(table)
+                .where(*[table.c[key] == row[key] for key in _STAT_KEYS])
+                .values(
+                    order_count=table.c.order_count + row['order_count'],
+                    total_amount=table.c.total_amount + row['total_amount'],
+                    updated_at=row['updated_at']
+                )
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(**row))
+
+    @staticmethod
+    def update_status(criteria, status):
+        """Set-based `UPDATE orders SET status=...` that also moves the stats (no commit).
+
+        criteria is a list of WHERE clauses on Order. Returns the number of
+        orders updated.
+        """
+        criteria = and_(*criteria, Order.status != status)
+        moved = db.session.execute(
+            select(
+                Order.order_date, Order.restaurant_id, Order.status,
+                func.count(Order.id), func.coalesce(func.sum(Order.total_amount), 0)
+            )
+            .where(criteria)
+            .group_by(Order.order_date, Order.restaurant_id, Order.status)
+        ).all()
+        if not moved:
+            return 0
+
+        result = db.session.execute(
+            update(Order)
+            .where(criteria)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+
+        deltas = defaultdict(lambda: [0, Decimal('0')])
+        for order_date, restaurant_id, old_status, count, amount in moved:
+            amount = _amount(amount)
+            deltas[(order_date, restaurant_id, old_status)][0] -= count
+            deltas[(order_date, restaurant_id, old_status)][1] -= amount
+            deltas[(order_date, restaurant_id, status)][0] += count
+            deltas[(order_date, restaurant_id, status)][1] += amount
+        OrderStatsService.apply_deltas(deltas)
+        return result.rowcount
+
+    @staticmethod
+    def rebuild(date_from=None, date_to=None):
+        """Recompute the stats rows for a date range (all dates if None) from orders (no commit).
+
+        Returns the number of stats rows written.
+        """
+        table = OrderDailyStat.__table__
+        stats_range = []
+        orders_range = []
+        if date_from:
+            stats_range.append(table.c.order_date >= date_from)
+            orders_range.append(Order.order_date >= date_from)
+        if date_to:
+            stats_range.append(table.c.order_date <= date_to)
+            orders_range.append(Order.order_date <= date_to)
+
+        db.session.execute(delete(table).where(*stats_range))
+        aggregated = (
+            select(
+                Order.order_date, Order.restaurant_id, Order.status,
+                func.count(Order.id), func.coalesce(func.sum(Order.total_amount), 0),
+                func.current_timestamp()
+            )
+            .where(*orders_range)
+            .group_by(Order.order_date, Order.restaurant_id, Order.status)
+        )
+        result = db.session.execute(
+            insert(table).from_select(
+                ['order_date', 'restaurant_id', 'status', 'order_count', 'total_amount', 'updated_at'],
+                aggregated
+            )
+        )
+        return result.rowcount
+
+    @staticmethod
+    def by_date_and_restaurant(date_from, date_to, by_date=True):
+        """Return rows of (order_date, restaurant_id, restaurant_name, order_count, total_amount).
+
+        Summed over statuses, ordered by date then restaurant. With
+        by_date=False rows cover the whole range per restaurant (order_date None).
+        """
+        group_by = [OrderDailyStat.restaurant_id, Restaurant.name]
+        if by_date:
+            group_by.insert(0, OrderDailyStat.order_date)
+        rows = db.session.execute(
+            select(
+                OrderDailyStat.order_date if by_date else literal(None, type_=Date),
+                OrderDailyStat.restaurant_id,
+                Restaurant.name,
+                func.sum(OrderDailyStat.order_count).label('order_count'),
+                func.sum(OrderDailyStat.total_amount).label('total_amount')
+            )
+            .outerjoin(Restaurant, Restaurant.id == OrderDailyStat.restaurant_id)
+            .where(
+                OrderDailyStat.order_date >= date_from,
+                OrderDailyStat.order_date <= date_to,
+                OrderDailyStat.order_count > 0
+            )
+            .group_by(*group_by)
+            .order_by(*group_by[:-1])
+        ).all()
+        # SUM(integer) comes back as Decimal on PostgreSQL
+        return [(d, rid, name, int(count), _amount(amount)) for d, rid, name, count, amount in rows]
+
+
+def _after_flush(session, flush_context):
+    """Turn the Order inserts, updates and deletes of this flush into stats deltas."""
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+
+    for obj in session.new:
+        if isinstance(obj, Order):
+            key = (obj.order_date, obj.restaurant_id, obj.status)
+            deltas[key][0] += 1
+            deltas[key][1] += _amount(obj.total_amount)
+
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            old = [_attribute_values(obj, key)[0] for key in ('order_date', 'restaurant_id', 'status', 'total_amount')]
+            deltas[tuple(old[:3])][0] -= 1
+            deltas[tuple(old[:3])][1] -= _amount(old[3])
+
+    for obj in session.dirty:
+        if not isinstance(obj, Order) or not session.is_modified(obj):
+            continue
+        values = [_attribute_values(obj, key) for key in ('order_date', 'restaurant_id', 'status', 'total_amount')]
+        old = [v[0] for v in values]
+        new = [v[1] for v in values]
+        if old == new:
+            continue
+        deltas[tuple(old[:3])][0] -= 1
+        deltas[tuple(old[:3])][1] -= _amount(old[3])
+        deltas[tuple(new[:3])][0] += 1
+        deltas[tuple(new[:3])][1] += _amount(new[3])
+
+    if deltas:
+        OrderStatsService.apply_deltas(deltas, connection=session.connection())
+
+
+def register_order_stats():
+    """Install the flush hook (idempotent; called from create_app)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    _registered = True
@@ -0,0 +1,91 @@
+"""Preloaded order data for restaurant summaries and email drafts."""
+from collections import namedtuple
+from sqlalchemy import select
+from app import db
+from app.models import Order, OrderItem, User, MenuItem
+
+# Plain snapshots so renderers never trigger lazy loads (and can run off the session).
+SummaryItem = namedtuple('SummaryItem', ['menu_item_id', 'menu_item_name', 'quantity', 'price', 'notes'])
+SummaryOrder = namedtuple('SummaryOrder', [
+    'id', 'restaurant_id', 'user_id', 'user_name', 'status', 'total_amount',
+    'order_text', 'notes', 'created_at', 'items'
+])
+
+
+class OrderSummaryService:
+    """Load orders with their users, items and menu item names in two queries."""
+
+    @staticmethod
+    def load(order_date, restaurant_ids=None, statuses=None, exclude_statuses=None):
+        """Return {restaurant_id: [SummaryOrder]} for a date, oldest order first.
+
+        One query fetches orders joined to users, a second fetches every item of
+        those orders joined to its menu item, whatever the number of orders.
+        """
+        query = (
+            select(
+                Order.id, Order.restaurant_id, Order.user_id, User.first_name, User.last_name,
+                Order.status, Order.total_amount, Order.order_text, Order.notes, Order.created_at
+            )
+            .outerjoin(User, User.id == Order.user_id)
+            .where(Order.order_date == order_date)
+            .order_by(Order.restaurant_id, Order.created_at, Order.id)
+        )
+        if restaurant_ids is not None:
+            query = query.where(Order.restaurant_id.in_(list(restaurant_ids)))
+        if statuses:
+            query = query.where(Order.status.in_(list(statuses)))
+        if exclude_statuses:
+            query = query.where(Order.status.notin_(list(exclude_statuses)))
+
+        order_rows = db.session.execute(query).all()
+        items_by_order = OrderSummaryService._load_items([row.id for row in order_rows])
+
+        by_restaurant = {}
+        for row in order_rows:
+            user_name = f"{row.first_name} {row.last_name}" if row.first_name is not None else None
+            by_restaurant.setdefault(row.restaurant_id, []).append(SummaryOrder(
+                id=row.id,
+                restaurant_id=row.restaurant_id,
+                user_id=row.user_id,
+                user_name=user_name,
+                status=row.status,
+                total_amount=row.total_amount,
+                order_text=row.order_text,
+                notes=row.notes,
+                created_at=row.created_at,
+                items=items_by_order.get(row.id, [])
+            ))
+        return by_restaurant
+
+    @staticmethod
+    def load_for_restaurant(restaurant_id, order_date, statuses=None, exclude_statuses=None):
+        """Return the [SummaryOrder] list for one restaurant and date."""
+        return OrderSummaryService.load(
+            order_date,
+            restaurant_ids=[restaurant_id],
+            statuses=statuses,
+            exclude_statuses=exclude_statuses
+        ).get(restaurant_id, [])
+
+    @staticmethod
+    def _load_items(order_ids):
+        """Return {order_id: [SummaryItem]} for the given orders in one query."""
+        if not order_ids:
+            return {}
+        rows = db.session.execute(
+            select(
+                OrderItem.order_id, OrderItem.menu_item_id, MenuItem.name,
+                OrderItem.quantity, OrderItem.price, OrderItem.notes
+            )
+            .outerjoin(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+            .where(OrderItem.order_id.in_(order_ids))
+            .order_by(OrderItem.order_id, OrderItem.id)
+        ).all()
+
+        items = {}
+        for row in rows:
+            items.setdefault(row.order_id, []).append(
+                SummaryItem(row.menu_item_id, row.name, row.quantity, row.price, row.notes)
+            )
+        return items
@@ -0,0 +1,190 @@
+"""Transactional outbox for outbound WhatsApp and email messages."""
+import logging
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+from app import db
+from app.models import OutboundMessage, Order, Reminder, RestaurantOrderSummary
+from app.services.email_service import EmailService
+from app.services.order_stats_service import OrderStatsService
+from app.services.reminder_service import ReminderRecipient, ReminderService
+from app.utils.concurrency import dispatch_concurrently
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """Service for queueing outbound messages and delivering them from a worker."""
+
+    @staticmethod
+    def enqueue_order_reminder(recipient, order_dates, order_url, reminder_ids):
+        """Queue a WhatsApp order reminder in the caller's transaction (no commit)."""
+        message = OutboundMessage(
+            channel='whatsapp',
+            kind='order_reminder',
+            recipient=recipient.phone_number,
+            payload={
+                'user_id': recipient.id,
+                'first_name': recipient.first_name,
+                'phone_number': recipient.phone_number,
+                'order_dates': [d.isoformat() for d in order_dates],
+                'order_url': order_url,
+                'reminder_ids': list(reminder_ids),
+            },
+            status='queued'
+        )
+        db.session.add(message)
+        return message
+
+    @staticmethod
+    def enqueue_email(to_email, subject, html_content, plain_content=None, kind='email', summary_id=None,
+                      backend=None):
+        """Queue an email in the caller's transaction (no commit)."""
+        message = OutboundMessage(
+            channel='email',
+            kind=kind,
+            recipient=to_email,
+            payload={
+                'to_email': to_email,
+                'subject': subject,
+                'html_content': html_content,
+                'plain_content': plain_content,
+                'summary_id': summary_id,
+                'backend': backend,
+            },
+            status='queued'
+        )
+        db.session.add(message)
+        return message
+
+    @staticmethod
+    def claim_batch(limit):
+        """Claim up to `limit` due messages for this worker.
+
+        PostgreSQL uses SELECT ... FOR UPDATE SKIP LOCKED so several workers
+        can drain the table in parallel. Other databases (SQLite in dev) fall
+        back to plain polling guarded by a conditional UPDATE. Messages stuck
+        in 'sending' for longer than OUTBOX_LOCK_TIMEOUT (a crashed worker)
+        are claimed again.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=current_app.config.get('OUTBOX_LOCK_TIMEOUT', 300))
+        claimable = or_(
+            and_(OutboundMessage.status == 'queued', OutboundMessage.available_at <= now),
+            and_(OutboundMessage.status == 'sending', OutboundMessage.locked_at < stale_before),
+        )
+
+        query = select(OutboundMessage.id).where(claimable).order_by(OutboundMessage.id).limit(limit)
+        if db.session.get_bind().dialect.name == 'postgresql':
+            query = query.with_for_update(skip_locked=True)
+
+        message_ids = db.session.scalars(query).all()
+        if not message_ids:
+            db.session.commit()
+            return []
+
+        db.session.execute(
+            update(OutboundMessage)
+            .where(OutboundMessage.id.in_(message_ids), claimable)
+            .values(status='sending', locked_at=now, attempts=OutboundMessage.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+        return OutboundMessage.query.filter(
+            OutboundMessage.id.in_(message_ids),
+            OutboundMessage.status == 'sending',
+            OutboundMessage.locked_at == now
+        ).order_by(OutboundMessage.id).all()
+
+    @staticmethod
+    def process_batch(limit=None, rate_limiter=None):
+        """Claim and deliver one batch of messages. Returns (sent, failed)."""
+        config = current_app.config
+        messages = OutboxService.claim_batch(limit or config.get('OUTBOX_BATCH_SIZE', 50))
+        if not messages:
+            return 0, 0
+
+        jobs = [(m.channel, m.kind, m.payload) for m in messages]
+        results = dict(dispatch_concurrently(
+            current_app._get_current_object(),
+            OutboxService._deliver,
+            jobs,
+            max_workers=config.get('OUTBOX_WORKER_CONCURRENCY', 4),
+            rate_limiter=rate_limiter
+        ))
+
+        sent = 0
+        failed = 0
+        for index, message in enumerate(messages):
+            success, response = results[index]
+            OutboxService._record_result(message, success, response)
+            if success:
+                sent += 1
+            else:
+                failed += 1
+        db.session.commit()
+
+        logger.info(f'Outbox batch delivered: {sent} sent, {failed} failed')
+        return sent, failed
+
+    @staticmethod
+    def _deliver(channel, kind, payload):
+        """Deliver one message. Runs on a worker thread, so no session access."""
+        if kind == 'order_reminder':
+            recipient = ReminderRecipient(payload['user_id'], payload['first_name'], payload['phone_number'])
+            order_dates = [date.fromisoformat(d) for d in payload['order_dates']]
+            return ReminderService._send_job(recipient, order_dates, payload['order_url'])
+        if channel == 'email':
+            return EmailService.send_email(
+                to_email=payload['to_email'],
+                subject=payload['subject'],
+                html_content=payload['html_content'],
+                plain_content=payload.get('plain_content'),
+                backend=payload.get('backend')
+            )
+        return False, f'Unknown outbound message: {channel}/{kind}'
+
+    @staticmethod
+    def _record_result(message, success, response):
+        """Update the message and the business rows that are waiting on it."""
+        now = datetime.utcnow()
+        max_attempts = current_app.config.get('OUTBOX_MAX_ATTEMPTS', 5)
+        message.locked_at = None
+
+        if success:
+            message.status = 'sent'
+            message.sent_at = now
+            message.last_error = None
+        elif message.attempts < max_attempts:
+            # Exponential backoff; business rows stay pending until the final attempt.
+            backoff = current_app.config.get('OUTBOX_RETRY_BACKOFF', 30) * (2 ** (message.attempts - 1))
+            message.status = 'queued'
+            message.available_at = now + timedelta(seconds=backoff)
+            message.last_error = str(response)
+            logger.warning(f'Outbound message {message.id} failed (attempt {message.attempts}), retrying: {response}')
+            return
+        else:
+            message.status = 'failed'
+            message.last_error = str(response)
+            logger.error(f'Outbound message {message.id} failed permanently: {response}')
+
+        payload = message.payload or {}
+        reminder_ids = payload.get('reminder_ids') or []
+        if reminder_ids:
+            db.session.execute(
+                update(Reminder),
+                [ReminderService._result_row(reminder_id, success, response) for reminder_id in reminder_ids]
+            )
+
+        summary_id = payload.get('summary_id')
+        if summary_id:
+            summary = db.session.get(RestaurantOrderSummary, summary_id)
+            if summary:
+                summary.email_status = 'sent' if success else 'failed'
+                summary.sent_at = now if success else None
+                order_ids = (summary.summary_data or {}).get('order_ids') or []
+                if success and order_ids:
+                    OrderStatsService.update_status(
+                        [Order.id.in_(order_ids), Order.status == 'confirmed'], 'sent_to_restaurant'
+                    )
@@ -1,14 +1,19 @@
 """Reminder service for scheduling and sending reminders."""
 import logging
-from datetime import datetime
+from collections import namedtuple
+from datetime import datetime, time
 from flask import current_app
+from sqlalchemy import and_, insert, literal, select, true, union_all, update
 from app import db
-from app.models import User, Reminder
+from app.models import User, Order, Reminder
 from app.services.whatsapp_service import WhatsAppService
-from app.services.order_service import OrderService
+from app.utils.concurrency import TokenBucket, dispatch_concurrently
 
 logger = logging.getLogger(__name__)
 
+# Detached copy of the User fields WhatsAppService.send_order_reminder reads.
+ReminderRecipient = namedtuple('ReminderRecipient', ['id', 'first_name', 'phone_number'])
+
 
 class ReminderService:
     """Service for handling reminders."""
@@ -16,93 +21,267 @@ class ReminderService:
     @staticmethod
     def send_reminders_for_date(target_date):
         """Send reminders to users who haven't ordered for target_date."""
-        logger.info(f'Sending reminders for {target_date}')
-        
-        # Get all active users
-        users = User.query.filter_by(is_active=True).all()
-        
-        reminders_sent = 0
-        reminders_failed = 0
-        
-        for user in users:
-            # Check if user has order for target date
-            missing_dates = OrderService.get_missing_order_days(
-                user_id=user.id,
-                days_ahead=1,
-                start_date=target_date
+        return ReminderService.send_reminders_for_dates([target_date])[target_date]
+
+    @staticmethod
+    def send_reminders_for_dates(target_dates):
+        """Send reminders for several dates, resolving missing orders in one query.
+
+        WhatsApp calls are fanned out over a bounded thread pool and throttled
+        by a token bucket (REMINDER_SEND_CONCURRENCY, WHATSAPP_RATE_LIMIT_*).
+        With REMINDER_CONSOLIDATE each user gets a single message listing all
+        of their missing dates. (user, date) pairs that already have a sent or
+        pending WhatsApp reminder from today are skipped, so repeated runs are
+        free. Returns a mapping of date -> (sent, failed), counted per
+        reminder row.
+        """
+        missing_by_date, jobs = ReminderService._plan_reminders(target_dates)
+        results = {target_date: (0, 0) for target_date in missing_by_date}
+        if not jobs:
+            return results
+
+        pending_rows = [
+            {'user_id': recipient.id, 'order_date': d}
+            for recipient, dates, _ in jobs
+            for d in dates
+        ]
+        reminder_ids = iter(ReminderService._insert_pending_reminders(pending_rows))
+        job_reminder_ids = [[next(reminder_ids) for _ in dates] for _, dates, _ in jobs]
+
+        counts = {target_date: [0, 0] for target_date in missing_by_date}
+        batch_size = max(1, current_app.config.get('REMINDER_RESULT_BATCH_SIZE', 100))
+        batch = []
+        for index, (success, response) in ReminderService._dispatch(jobs):
+            recipient, dates, _ = jobs[index]
+            if success:
+                logger.info(f'Reminder sent to user {recipient.id} for {", ".join(d.isoformat() for d in dates)}')
+            else:
+                logger.error(f'Failed to send reminder to user {recipient.id}: {response}')
+            for target_date, reminder_id in zip(dates, job_reminder_ids[index]):
+                counts[target_date][0 if success else 1] += 1
+                batch.append(ReminderService._result_row(reminder_id, success, response))
+            if len(batch) >= batch_size:
+                ReminderService._write_results(batch)
+                batch = []
+        ReminderService._write_results(batch)
+
+        for target_date, (reminders_sent, reminders_failed) in counts.items():
+            logger.info(f'Reminders for {target_date} sent: {reminders_sent}, failed: {reminders_failed}')
+            results[target_date] = (reminders_sent, reminders_failed)
+
+        return results
+
+    @staticmethod
+    def queue_reminders_for_dates(target_dates):
+        """Queue reminders in the outbox instead of sending them inline.
+
+        Pending Reminder rows and their outbound messages are committed in one
+        transaction; the outbox worker delivers them and records the results.
+        Returns the outbound message ids.
+        """
+        # Imported here to avoid a circular import (the outbox delivers reminders).
+        from app.services.outbox_service import OutboxService
+
+        _, jobs = ReminderService._plan_reminders(target_dates)
+        if not jobs:
+            return []
+
+        pending_rows = [
+            {'user_id': recipient.id, 'order_date': d}
+            for recipient, dates, _ in jobs
+            for d in dates
+        ]
+        reminder_ids = iter(ReminderService._insert_pending_reminders(pending_rows, commit=False))
+
+        messages = [
+            OutboxService.enqueue_order_reminder(
+                recipient,
+                dates,
+                order_url,
+                reminder_ids=[next(reminder_ids) for _ in dates]
             )
-            
-            if target_date in missing_dates:
-                # User needs reminder
-                success = ReminderService.send_reminder_to_user(user, target_date)
-                if success:
-                    reminders_sent += 1
-                else:
-                    reminders_failed += 1
-        
-        logger.info(f'Reminders sent: {reminders_sent}, failed: {reminders_failed}')
-        return reminders_sent, reminders_failed
-    
+            for recipient, dates, order_url in jobs
+        ]
+        db.session.flush()
+        message_ids = [m.id for m in messages]
+        db.session.commit()
+
+        logger.info(f'Queued {len(message_ids)} reminder messages')
+        return message_ids
+
+    @staticmethod
+    def _plan_reminders(target_dates):
+        """Work out who needs a reminder for which dates.
+
+        Returns (missing_by_date, jobs) where each job is
+        (recipient, order_dates, order_url) and becomes one outbound message.
+        """
+        missing_by_date = ReminderService.get_user_ids_without_orders(target_dates)
+
+        # Re-runs (manual triggers, one scheduler per worker) must not re-send.
+        already_reminded = ReminderService._get_reminded_today(missing_by_date.keys())
+        if already_reminded:
+            logger.info(f'Skipping {len(already_reminded)} reminders already sent or pending today')
+            for user_id, target_date in already_reminded:
+                missing_by_date[target_date].discard(user_id)
+
+        user_ids = set().union(*missing_by_date.values()) if missing_by_date else set()
+        if not user_ids:
+            return missing_by_date, []
+        users_by_id = {u.id: u for u in User.query.filter(User.id.in_(user_ids)).all()}
+
+        # Consolidated mode sends one message per user covering all of their missing
+        # dates; otherwise each (user, date) gets its own message.
+        if current_app.config.get('REMINDER_CONSOLIDATE', False):
+            dates_by_user = {}
+            for target_date, missing_user_ids in missing_by_date.items():
+                for user_id in missing_user_ids:
+                    dates_by_user.setdefault(user_id, []).append(target_date)
+            groups = [(user_id, sorted(dates)) for user_id, dates in sorted(dates_by_user.items())]
+        else:
+            groups = [
+                (user_id, [target_date])
+                for target_date, missing_user_ids in missing_by_date.items()
+                for user_id in sorted(missing_user_ids)
+            ]
+
+        frontend_url = current_app.config['FRONTEND_URL']
+        jobs = []
+        for user_id, dates in groups:
+            user = users_by_id[user_id]
+            # Snapshot what the sender needs; worker threads must not touch the session.
+            recipient = ReminderRecipient(user.id, user.first_name, user.phone_number)
+            order_url = f"{frontend_url}/order?date={dates[0].isoformat()}"
+            jobs.append((recipient, dates, order_url))
+
+        return missing_by_date, jobs
+
     @staticmethod
-    def send_reminder_to_user(user, order_date):
-        """Send a reminder to a specific user."""
-        try:
-            # Build order URL
-            frontend_url = current_app.config['FRONTEND_URL']
-            order_url = f"{frontend_url}/order?date={order_date.isoformat()}"
-            
-            # Create reminder record
-            reminder = Reminder(
-                user_id=user.id,
-                order_date=order_date,
-                reminder_type='whatsapp',
-                status='pending'
+    def _get_reminded_today(dates, reminder_type='whatsapp'):
+        """Return {(user_id, order_date)} that already have a sent or pending reminder created today."""
+        dates = list(dates)
+        if not dates:
+            return set()
+        today_start = datetime.combine(datetime.utcnow().date(), time.min)
+        rows = db.session.execute(
+            select(Reminder.user_id, Reminder.order_date).where(
+                Reminder.order_date.in_(dates),
+                Reminder.reminder_type == reminder_type,
+                Reminder.status.in_(['sent', 'pending']),
+                Reminder.created_at >= today_start
             )
-            db.session.add(reminder)
+        ).all()
+        return {(user_id, order_date) for user_id, order_date in rows}
+
+    @staticmethod
+    def _insert_pending_reminders(rows, reminder_type='whatsapp', commit=True):
+        """Bulk-insert pending Reminder rows in one statement and return their ids in order.
+
+        Rows are committed before anything is sent, so after a crash every
+        reminder the run attempted is visible as 'pending'. Pass commit=False
+        to leave them in the caller's transaction.
+        """
+        if not rows:
+            return []
+        reminder_ids = db.session.scalars(
+            insert(Reminder).returning(Reminder.id, sort_by_parameter_order=True),
+            [{**row, 'reminder_type': reminder_type, 'status': 'pending'} for row in rows]
+        ).all()
+        if commit:
             db.session.commit()
-            
-            # Send WhatsApp message
-            success, response = WhatsAppService.send_order_reminder(
-                user=user,
-                order_date=order_date,
+        return reminder_ids
+
+    @staticmethod
+    def _result_row(reminder_id, success, response):
+        """Build the bulk UPDATE parameters for one send result."""
+        if success:
+            return {'id': reminder_id, 'status': 'sent', 'sent_at': datetime.utcnow(), 'failure_reason': None}
+        return {'id': reminder_id, 'status': 'failed', 'sent_at': None, 'failure_reason': str(response)}
+
+    @staticmethod
+    def _write_results(rows):
+        """Write a batch of send results back with one executemany UPDATE."""
+        if not rows:
+            return
+        db.session.execute(update(Reminder), rows)
+        db.session.commit()
+
+    @staticmethod
+    def _dispatch(jobs):
+        """Send (recipient, order_dates, order_url) jobs concurrently, yielding (index, (success, response))."""
+        config = current_app.config
+        rate_limiter = TokenBucket(
+            config.get('WHATSAPP_RATE_LIMIT_PER_SECOND', 0),
+            config.get('WHATSAPP_RATE_LIMIT_BURST')
+        )
+        return dispatch_concurrently(
+            current_app._get_current_object(),
+            ReminderService._send_job,
+            jobs,
+            max_workers=config.get('REMINDER_SEND_CONCURRENCY', 1),
+            rate_limiter=rate_limiter
+        )
+
+    @staticmethod
+    def _send_job(recipient, order_dates, order_url):
+        """Send one reminder message covering one or more dates."""
+        if len(order_dates) == 1:
+            return WhatsAppService.send_order_reminder(
+                user=recipient,
+                order_date=order_dates[0],
                 order_url=order_url
             )
-            
-            # Update reminder status
-            if success:
-                reminder.status = 'sent'
-                reminder.sent_at = datetime.utcnow()
-                logger.info(f'Reminder sent to user {user.id} for {order_date}')
-            else:
-                reminder.status = 'failed'
-                reminder.failure_reason = str(response)
-                logger.error(f'Failed to send reminder to user {user.id}: {response}')
-            
-            db.session.commit()
-            return success
-            
-        except Exception as e:
-            logger.error(f'Error sending reminder to user {user.id}: {str(e)}')
-            if reminder:
-                reminder.status = 'failed'
-                reminder.failure_reason = str(e)
-                db.session.commit()
-            return False
+        return WhatsAppService.send_multi_day_order_reminder(
+            user=recipient,
+            order_dates=order_dates,
+            order_url=order_url
+        )
     
+    @staticmethod
+    def users_without_orders_query(dates):
+        """SELECT of (user_id, order_date) for each active user with no order on each date.
+
+        A single anti-join (active users x dates LEFT JOIN orders, keeping the
+        rows with no matching order). This is the one definition of "hasn't
+        ordered", shared by reminders and the admin dashboard counter.
+        """
+        target_dates = union_all(
+            *[select(literal(d, type_=db.Date).label('order_date')) for d in dates]
+        ).subquery('target_dates')
+
+        return (
+            select(User.id.label('user_id'), target_dates.c.order_date)
+            .select_from(User)
+            .join(target_dates, true())
+            .outerjoin(Order, and_(
+                Order.user_id == User.id,
+                Order.order_date == target_dates.c.order_date
+            ))
+            .where(User.is_active.is_(True), Order.id.is_(None))
+        )
+
+    @staticmethod
+    def get_user_ids_without_orders(dates):
+        """Map each date to the set of active user ids that have no order on it.
+
+        Runs users_without_orders_query instead of one order lookup per user.
+        """
+        dates = sorted(set(dates))
+        missing_by_date = {d: set() for d in dates}
+        if not dates:
+            return missing_by_date
+
+        rows = db.session.execute(ReminderService.users_without_orders_query(dates)).all()
+
+        for user_id, order_date in rows:
+            missing_by_date[order_date].add(user_id)
+
+        return missing_by_date
+
     @staticmethod
     def get_users_without_orders(order_date):
         """Get list of users who haven't ordered for a specific date."""
-        users = User.query.filter_by(is_active=True).all()
-        users_without_orders = []
-        
-        for user in users:
-            missing_dates = OrderService.get_missing_order_days(
-                user_id=user.id,
-                days_ahead=1,
-                start_date=order_date
-            )
-            
-            if order_date in missing_dates:
-                users_without_orders.append(user)
-        
-        return users_without_orders
+        user_ids = ReminderService.get_user_ids_without_orders([order_date])[order_date]
+        if not user_ids:
+            return []
+        return User.query.filter(User.id.in_(user_ids)).order_by(User.id).all()
@@ -1,13 +1,77 @@
 """WhatsApp Cloud API service."""
+import os
+import threading
 import requests
 import logging
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.utils.circuit_breaker import CircuitOpenError, get_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
+# Process-wide HTTP session (keep-alive + connection pool). Created lazily and
+# re-created when the pid changes, so each gunicorn worker gets its own after fork.
+_http_session = None
+_http_session_pid = None
+_http_session_lock = threading.Lock()
+
 
 class WhatsAppService:
     """Service for sending WhatsApp messages via Cloud API."""
+
+    @staticmethod
+    def _http():
+        """Return the shared requests.Session for graph API calls."""
+        global _http_session, _http_session_pid
+        pid = os.getpid()
+        if _http_session is None or _http_session_pid != pid:
+            with _http_session_lock:
+                if _http_session is None or _http_session_pid != pid:
+                    config = current_app.config
+                    retry = Retry(
+                        total=config.get('WHATSAPP_HTTP_RETRIES', 2),
+                        backoff_factor=config.get('WHATSAPP_HTTP_BACKOFF', 0.5),
+                        status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset(['POST']),
+                        respect_retry_after_header=True,
+                        raise_on_status=False
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=config.get('WHATSAPP_HTTP_POOL_SIZE', 10),
+                        max_retries=retry
+                    )
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    _http_session = session
+                    _http_session_pid = pid
+        return _http_session
+
+    @staticmethod
+    def _post(url, payload, headers):
+        """POST to the graph API through the shared session and the 'whatsapp' circuit breaker.
+
+        Raises CircuitOpenError without calling out while the circuit is open.
+        Timeouts, connection errors, 429 and 5xx count as failures; other
+        responses (e.g. 400 for a bad number) mean the API itself is healthy.
+        """
+        breaker = get_circuit_breaker('whatsapp', current_app.config)
+        if not breaker.allow_request():
+            raise CircuitOpenError('whatsapp')
+        try:
+            response = WhatsAppService._http().post(
+                url, json=payload, headers=headers, timeout=current_app.config.get('WHATSAPP_HTTP_TIMEOUT', 10)
+            )
+        except Exception:
+            breaker.record_failure()
+            raise
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
     
     @staticmethod
     def send_template_message(to_phone, template_name, parameters):
@@ -51,7 +115,7 @@ class WhatsAppService:
                 }
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = WhatsAppService._post(url, payload, headers)
             
             if response.status_code == 200:
                 logger.info(f'WhatsApp message sent successfully to {to_phone}')
@@ -60,6 +124,9 @@ class WhatsAppService:
                 logger.error(f'WhatsApp API error: {response.status_code} - {response.text}')
                 return False, response.text
                 
+        except CircuitOpenError as e:
+            logger.warning(f'WhatsApp circuit open, not sending to {to_phone}')
+            return False, str(e)
         except Exception as e:
             logger.error(f'Error sending WhatsApp message: {str(e)}')
             return False, str(e)
@@ -67,6 +134,11 @@ class WhatsAppService:
     @staticmethod
     def send_order_reminder(user, order_date, order_url):
         """Send order reminder to user."""
+        return WhatsAppService.send_multi_day_order_reminder(user, [order_date], order_url)
+
+    @staticmethod
+    def send_multi_day_order_reminder(user, order_dates, order_url):
+        """Send a single order reminder listing every date the user is missing."""
         if not user.phone_number:
             logger.warning(f'User {user.id} has no phone number')
             return False, 'No phone number'
@@ -77,10 +149,10 @@ class WhatsAppService:
             # Assume default country code if not provided
             phone = f'+{phone}'
         
-        # Template parameters: user first name, order date, order URL
+        # Template parameters: user first name, order date(s), order URL
         parameters = [
             user.first_name,
-            order_date.strftime('%A, %B %d'),
+            WhatsAppService._format_order_dates(order_dates),
             order_url
         ]
         
@@ -88,6 +160,15 @@ class WhatsAppService:
         template_name = 'meal_reminder'  # This should match your approved template
         
         return WhatsAppService.send_template_message(phone, template_name, parameters)
+
+    @staticmethod
+    def _format_order_dates(order_dates):
+        """Render dates for the template's date slot, e.g. 'Mon Mar 02, Tue Mar 03 and Wed Mar 04'."""
+        order_dates = sorted(order_dates)
+        if len(order_dates) == 1:
+            return order_dates[0].strftime('%A, %B %d')
+        labels = [d.strftime('%a %b %d') for d in order_dates]
+        return f"{', '.join(labels[:-1])} and {labels[-1]}"
     
     @staticmethod
     def send_text_message(to_phone, message):
@@ -118,13 +199,15 @@ class WhatsAppService:
                 }
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = WhatsAppService._post(url, payload, headers)
             
             if response.status_code == 200:
                 return True, response.json()
             else:
                 return False, response.text
                 
+        except CircuitOpenError as e:
+            return False, str(e)
         except Exception as e:
             logger.error(f'Error sending WhatsApp text: {str(e)}')
             return False, str(e)
@@ -4,6 +4,9 @@ from datetime import date
 from app import db
 from app.models import Order, RestaurantOrderSummary, Restaurant
 from app.services.email_service import EmailService
+from app.services.order_stats_service import OrderStatsService
+from app.services.order_summary_service import OrderSummaryService
+from app.services.outbox_service import OutboxService
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -17,76 +20,152 @@ def send_restaurant_summaries(app):
             
             today = date.today()
             
-            # Get all orders for today
-            orders = Order.query.filter_by(
-                order_date=today
-            ).filter(
-                Order.status.in_(['pending', 'confirmed'])
-            ).all()
+            # Get all orders for today, grouped by restaurant, with users and items preloaded
+            orders_by_restaurant = OrderSummaryService.load(today, statuses=['pending', 'confirmed'])
             
-            if not orders:
+            if not orders_by_restaurant:
                 logger.info('No orders for today')
                 return
             
-            # Group orders by restaurant
-            orders_by_restaurant = {}
-            for order in orders:
-                if order.restaurant_id not in orders_by_restaurant:
-                    orders_by_restaurant[order.restaurant_id] = []
-                orders_by_restaurant[order.restaurant_id].append(order)
-            
             # Send summary to each restaurant
             summaries_sent = 0
             summaries_failed = 0
+            use_outbox = app.config.get('OUTBOX_ENABLED')
             
+            restaurants = Restaurant.query.filter(Restaurant.id.in_(list(orders_by_restaurant.keys()))).all()
+            restaurant_map = {r.id: r for r in restaurants}
+
+            to_send = []
             for restaurant_id, restaurant_orders in orders_by_restaurant.items():
-                restaurant = db.session.get(Restaurant, restaurant_id)
+                restaurant = restaurant_map.get(restaurant_id)
                 if not restaurant or not restaurant.is_active:
                     continue
-                
-                # Send email
-                success, message = EmailService.send_restaurant_order_summary(
-                    restaurant=restaurant,
-                    order_date=today,
-                    orders=restaurant_orders
+
+                if use_outbox and restaurant.email:
+                    # Summary row and email are queued together; the outbox worker
+                    # sends it and then marks the summary and orders.
+                    _queue_restaurant_summary(restaurant, today, restaurant_orders)
+                    summaries_sent += 1
+                    continue
+
+                to_send.append((restaurant, restaurant_orders))
+
+            # Render on this thread, then send concurrently over the pooled SendGrid connections
+            with_email = [(r, o) for r, o in to_send if r.email]
+            results = dict(zip(
+                [r.id for r, _ in with_email],
+                EmailService.send_emails(
+                    [EmailService.build_restaurant_order_summary(r, today, o) for r, o in with_email],
+                    max_workers=app.config.get('RESTAURANT_SUMMARY_CONCURRENCY', 4)
                 )
+            ))
+
+            now = datetime.utcnow()
+            summaries = []
+            sent_orders = []
+            for restaurant, restaurant_orders in to_send:
+                restaurant_id = restaurant.id
+                if restaurant.email:
+                    success, message = results[restaurant_id]
+                else:
+                    logger.warning(f'Restaurant {restaurant_id} has no email')
+                    success, message = False, 'No email address'
                 
                 # Create summary record
-                summary_data = {
-                    'order_count': len(restaurant_orders),
-                    'total_amount': float(sum(o.total_amount for o in restaurant_orders)),
-                    'order_ids': [o.id for o in restaurant_orders]
-                }
-                
-                summary = RestaurantOrderSummary(
+                summaries.append(RestaurantOrderSummary(
                     restaurant_id=restaurant_id,
                     order_date=today,
-                    sent_at=datetime.utcnow() if success else None,
+                    sent_at=now if success else None,
                     email_status='sent' if success else 'failed',
-                    summary_data=summary_data
-                )
-                
-                db.session.add(summary)
+                    summary_data=_summary_data(restaurant_orders)
+                ))
                 
                 if success:
                     summaries_sent += 1
-                    # Update order statuses
-                    for order in restaurant_orders:
-                        if order.status == 'confirmed':
-                            order.status = 'sent_to_restaurant'
+                    sent_orders.extend(restaurant_orders)
                 else:
                     summaries_failed += 1
                     logger.error(f'Failed to send summary to restaurant {restaurant_id}: {message}')
+
+            # All summary rows and status updates go in one transaction
+            db.session.add_all(summaries)
+            _mark_sent_to_restaurant(sent_orders)
             
             db.session.commit()
             
-            logger.info(f'Restaurant summaries: {summaries_sent} sent, {summaries_failed} failed')
+            logger.info(
+                f'Restaurant summaries: {summaries_sent} {"queued" if use_outbox else "sent"}, {summaries_failed} failed'
+            )
             
         except Exception as e:
             logger.error(f'Error in restaurant summary task: {str(e)}', exc_info=True)
             db.session.rollback()
 
 
+def _summary_data(orders):
+    """Aggregated order data stored on RestaurantOrderSummary."""
+    return {
+        'order_count': len(orders),
+        'total_amount': float(sum(o.total_amount for o in orders)),
+        'order_ids': [o.id for o in orders]
+    }
+
+
+def _mark_sent_to_restaurant(orders):
+    """Move the confirmed orders among `orders` to sent_to_restaurant (no commit)."""
+    order_ids = [o.id for o in orders if o.status == 'confirmed']
+    if order_ids:
+        OrderStatsService.update_status([Order.id.in_(order_ids), Order.status == 'confirmed'], 'sent_to_restaurant')
+
+
+def _queue_restaurant_summary(restaurant, target_date, orders):
+    """Add a queued summary row and its outbound email to the session (no commit)."""
+    summary = RestaurantOrderSummary(
+        restaurant_id=restaurant.id,
+        order_date=target_date,
+        email_status='queued',
+        summary_data=_summary_data(orders)
+    )
+    db.session.add(summary)
+    db.session.flush()
+
+    message = OutboxService.enqueue_email(
+        kind='restaurant_summary',
+        summary_id=summary.id,
+        **EmailService.build_restaurant_order_summary(restaurant, target_date, orders)
+    )
+    db.session.flush()
+    return message
+
+
+def queue_restaurant_summary_for_date(restaurant_id, target_date):
+    """Queue the order summary for a restaurant and date in the outbox (manual trigger).
+
+    Returns (success, message, outbound_message_id).
+    """
+    try:
+        restaurant = db.session.get(Restaurant, restaurant_id)
+        if not restaurant:
+            return False, 'Restaurant not found', None
+        if not restaurant.email:
+            return False, 'No email address', None
+
+        orders = OrderSummaryService.load_for_restaurant(restaurant_id, target_date, exclude_statuses=['cancelled'])
+
+        if not orders:
+            return False, 'No orders found for this date', None
+
+        message = _queue_restaurant_summary(restaurant, target_date, orders)
+        db.session.commit()
+
+        return True, 'Summary queued', message.id
+
+    except Exception as e:
+        logger.error(f'Error queueing restaurant summary: {str(e)}')
+        db.session.rollback()
+        return False, str(e), None
+
+
 def generate_restaurant_summary_for_date(restaurant_id, target_date):
     """Generate and send order summary for a specific restaurant and date (manual trigger)."""
     try:
@@ -95,12 +174,7 @@ def generate_restaurant_summary_for_date(restaurant_id, target_date):
             return False, 'Restaurant not found'
         
         # Get orders for the date
-        orders = Order.query.filter_by(
-            restaurant_id=restaurant_id,
-            order_date=target_date
-        ).filter(
-            Order.status != 'cancelled'
-        ).all()
+        orders = OrderSummaryService.load_for_restaurant(restaurant_id, target_date, exclude_statuses=['cancelled'])
         
         if not orders:
             return False, 'No orders found for this date'
@@ -114,21 +188,17 @@ def generate_restaurant_summary_for_date(restaurant_id, target_date):
         
         if success:
             # Create summary record
-            summary_data = {
-                'order_count': len(orders),
-                'total_amount': float(sum(o.total_amount for o in orders)),
-                'order_ids': [o.id for o in orders]
-            }
-            
             summary = RestaurantOrderSummary(
                 restaurant_id=restaurant_id,
                 order_date=target_date,
                 sent_at=datetime.utcnow(),
                 email_status='sent',
-                summary_data=summary_data
+                summary_data=_summary_data(orders)
             )
             
             db.session.add(summary)
+            # Same status move as the scheduled task and the outbox worker
+            _mark_sent_to_restaurant(orders)
             db.session.commit()
             
             return True, 'Summary sent successfully'
@@ -137,4 +207,5 @@ def generate_restaurant_summary_for_date(restaurant_id, target_date):
             
     except Exception as e:
         logger.error(f'Error generating restaurant summary: {str(e)}')
+        db.session.rollback()
         return False, str(e)
@@ -0,0 +1,42 @@
+"""Background worker that drains the outbound message outbox."""
+import logging
+import time
+from app import db
+from app.services.outbox_service import OutboxService
+from app.utils.concurrency import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+def drain_outbox(app, rate_limiter=None):
+    """Deliver queued messages until no due message is left. Returns (sent, failed)."""
+    with app.app_context():
+        total_sent = 0
+        total_failed = 0
+        try:
+            while True:
+                sent, failed = OutboxService.process_batch(rate_limiter=rate_limiter)
+                if not sent and not failed:
+                    break
+                total_sent += sent
+                total_failed += failed
+        except Exception as e:
+            logger.error(f'Error draining outbox: {str(e)}', exc_info=True)
+            db.session.rollback()
+        return total_sent, total_failed
+
+
+def run_outbox_worker(app, poll_interval=None):
+    """Poll the outbox forever (python manage.py outbox-worker)."""
+    poll_interval = poll_interval or app.config.get('OUTBOX_POLL_INTERVAL', 2.0)
+    # One bucket for the whole process so batches share the provider quota.
+    rate_limiter = TokenBucket(
+        app.config.get('WHATSAPP_RATE_LIMIT_PER_SECOND', 0),
+        app.config.get('WHATSAPP_RATE_LIMIT_BURST')
+    )
+    logger.info(f'Outbox worker started (poll interval {poll_interval}s)')
+    while True:
+        sent, failed = drain_outbox(app, rate_limiter=rate_limiter)
+        if sent or failed:
+            logger.info(f'Outbox drained: {sent} sent, {failed} failed')
+        time.sleep(poll_interval)
@@ -17,13 +17,18 @@ def send_daily_reminders(app):
             # Get reminder days ahead from config
             days_ahead_list = app.config.get('REMINDER_DAYS_AHEAD', [1, 2, 3])
             
-            # Send reminders for each configured day
-            for days_ahead in days_ahead_list:
-                target_date = date.today() + timedelta(days=days_ahead)
-                logger.info(f'Sending reminders for {target_date} ({days_ahead} days ahead)')
-                
-                sent, failed = ReminderService.send_reminders_for_date(target_date)
-                logger.info(f'Date {target_date}: {sent} reminders sent, {failed} failed')
+            target_dates = [date.today() + timedelta(days=days_ahead) for days_ahead in days_ahead_list]
+            logger.info(f'Sending reminders for {", ".join(d.isoformat() for d in target_dates)}')
+
+            if app.config.get('OUTBOX_ENABLED'):
+                # Delivery happens in the outbox worker; the scheduler thread only queues.
+                message_ids = ReminderService.queue_reminders_for_dates(target_dates)
+                logger.info(f'{len(message_ids)} reminder messages queued')
+            else:
+                # Missing orders for every configured day are resolved in a single query
+                results = ReminderService.send_reminders_for_dates(target_dates)
+                for target_date, (sent, failed) in results.items():
+                    logger.info(f'Date {target_date}: {sent} reminders sent, {failed} failed')
             
             logger.info('Daily reminder task completed')
             
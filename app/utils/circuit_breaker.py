@@ -0,0 +1,174 @@
+"""Circuit breakers for outbound provider calls (WhatsApp, SendGrid)."""
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+CIRCUIT_OPEN_REASON = 'circuit open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, name):
+        super().__init__(CIRCUIT_OPEN_REASON)
+        self.name = name
+
+
+class CircuitBreaker:
+    """Thread-safe failure-rate circuit breaker.
+
+    Closed: calls go through and outcomes are kept in a sliding window of the
+    last `window_size` calls. Once at least `min_calls` are recorded and the
+    failure rate reaches `failure_rate`, the breaker opens.
+    Open: calls fail fast for `open_seconds`.
+    Half-open: up to `half_open_calls` probe calls are let through; if all of
+    them succeed the breaker closes, any failure opens it again.
+    """
+
+    def __init__(self, name, failure_rate=0.5, min_calls=10, window_size=20, open_seconds=30,
+                 half_open_calls=1, enabled=True):
+        self.name = name
+        self.failure_rate = float(failure_rate)
+        self.min_calls = max(1, int(min_calls))
+        self.open_seconds = float(open_seconds)
+        self.half_open_calls = max(1, int(half_open_calls))
+        self.enabled = enabled
+
+        self._outcomes = deque(maxlen=max(self.min_calls, int(window_size)))
+        self._state = CLOSED
+        self._opened_at = None
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._trip_count = 0
+        self._rejected_count = 0
+        self._last_trip_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_started = 0
+            self._probes_succeeded = 0
+            logger.info(f'Circuit {self.name} half-open, probing')
+        return self._state
+
+    def allow_request(self):
+        """Return True if a call may be made now. Callers must then record its outcome."""
+        if not self.enabled:
+            return True
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes_started < self.half_open_calls:
+                self._probes_started += 1
+                return True
+            self._rejected_count += 1
+            return False
+
+    def record_success(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_calls:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f'Circuit {self.name} closed')
+                return
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip()
+                return
+            if self._state == OPEN:
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.min_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    self._trip()
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._last_trip_at = time.time()
+        self._trip_count += 1
+        self._outcomes.clear()
+        logger.warning(f'Circuit {self.name} opened for {self.open_seconds:g}s (trip #{self._trip_count})')
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._opened_at = None
+
+    def to_dict(self):
+        """Snapshot for monitoring."""
+        with self._lock:
+            state = self._current_state()
+            failures = self._outcomes.count(False)
+            return {
+                'name': self.name,
+                'enabled': self.enabled,
+                'state': state,
+                'window_calls': len(self._outcomes),
+                'window_failures': failures,
+                'trip_count': self._trip_count,
+                'rejected_count': self._rejected_count,
+                'last_trip_at': self._last_trip_at,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name, config):
+    """Return the process-wide breaker for `name`, creating it from app config on first use."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name,
+                    failure_rate=config.get('CIRCUIT_BREAKER_FAILURE_RATE', 0.5),
+                    min_calls=config.get('CIRCUIT_BREAKER_MIN_CALLS', 10),
+                    window_size=config.get('CIRCUIT_BREAKER_WINDOW', 20),
+                    open_seconds=config.get('CIRCUIT_BREAKER_OPEN_SECONDS', 30),
+                    half_open_calls=config.get('CIRCUIT_BREAKER_HALF_OPEN_CALLS', 1),
+                    enabled=config.get('CIRCUIT_BREAKER_ENABLED', True),
+                )
+                _breakers[name] = breaker
+    return breaker
+
+
+def circuit_breaker_states():
+    """Monitoring snapshot of every breaker created in this process."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.to_dict() for b in breakers}
+
+
+def reset_circuit_breakers():
+    """Drop all breakers so they are rebuilt from config (tests, config reloads)."""
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,77 @@
+"""Helpers for running outbound calls concurrently."""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to stay under provider rate limits."""
+
+    def __init__(self, rate, capacity=None):
+        """Allow `rate` acquisitions per second with bursts of up to `capacity`.
+
+        A rate of 0 (or less) disables limiting.
+        """
+        self.rate = float(rate or 0)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            wait = self._take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def try_acquire(self):
+        """Consume a token if one is available right now; never blocks."""
+        return self._take() <= 0
+
+    def _take(self):
+        """Consume a token and return 0, or return the seconds until one is available."""
+        if self.rate <= 0:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+def dispatch_concurrently(app, func, jobs, max_workers=4, rate_limiter=None):
+    """Call func(*job) for every job on a bounded thread pool.
+
+    Each call runs inside its own app context so services can read
+    current_app.config. Workers must not touch db.session; do all database
+    work on the calling thread. Yields (job_index, result) pairs as calls
+    complete. An exception raised by func is yielded as (False, str(error)),
+    matching the (success, message) convention used by the services.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+
+    def run(job):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        with app.app_context():
+            try:
+                return func(*job)
+            except Exception as e:
+                logger.error(f'Error in concurrent dispatch: {str(e)}')
+                return False, str(e)
+
+    workers = max(1, min(int(max_workers or 1), len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dispatch') as executor:
+        futures = {executor.submit(run, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
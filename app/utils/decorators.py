@@ -14,7 +14,12 @@ def validate_json(fn):
 
 
 def paginated(default_per_page=20, max_per_page=100):
-    """Decorator to add pagination parameters to route."""
+    """Decorator to add pagination parameters to route.
+
+    Passes page and per_page (offset pagination) and cursor, which is None
+    unless the client asked for cursor pagination with `?cursor=` (empty for
+    the first page).
+    """
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
@@ -28,6 +33,7 @@ def paginated(default_per_page=20, max_per_page=100):
             
             kwargs['page'] = page
             kwargs['per_page'] = per_page
+            kwargs['cursor'] = request.args.get('cursor')
             return fn(*args, **kwargs)
         return wrapper
     return decorator
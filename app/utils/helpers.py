@@ -1,5 +1,8 @@
 """Utility helper functions."""
-from datetime import date, timedelta
+import base64
+import json
+from datetime import date, datetime, timedelta
+from sqlalchemy import tuple_
 
 
 def get_week_dates(start_date=None, days=7):
@@ -60,6 +63,128 @@ def paginate_query(query, page=1, per_page=20, max_per_page=100):
     }
 
 
+def encode_cursor(values):
+    """Encode the sort-key values of the last row seen as an opaque cursor string."""
+    tagged = []
+    for value in values:
+        if isinstance(value, datetime):
+            tagged.append(['dt', value.isoformat()])
+        elif isinstance(value, date):
+            tagged.append(['d', value.isoformat()])
+        else:
+            tagged.append(['v', value])
+    raw = json.dumps(tagged, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Decode a cursor from encode_cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        tagged = json.loads(raw)
+        values = []
+        for tag, value in tagged:
+            if tag == 'dt':
+                values.append(datetime.fromisoformat(value))
+            elif tag == 'd':
+                values.append(date.fromisoformat(value))
+            elif tag == 'v' and isinstance(value, (int, str)):
+                values.append(value)
+            else:
+                raise ValueError(tag)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if len(values) != size:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def estimate_count(query):
+    """Return (row count, is_estimate) for a query.
+
+    On PostgreSQL this is the planner's row estimate from EXPLAIN, which
+    costs no table scan; other databases fall back to an exact count().
+    """
+    connection = query.session.connection()
+    if connection.dialect.name != 'postgresql':
+        return query.count(), False
+    compiled = query.order_by(None).statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled.string}', compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows']), True
+
+
+def keyset_paginate_query(query, keys, cursor=None, per_page=20, max_per_page=100, total=None):
+    """Paginate a query ordered by `keys` descending, starting after `cursor`.
+
+    keys are the columns the query is ordered by (newest first), ending in
+    a unique one such as id. total is None (skip counting), 'exact' or
+    'estimate'. Raises ValueError for a malformed cursor or total.
+    """
+    per_page = min(per_page, max_per_page)
+    if total not in (None, 'exact', 'estimate'):
+        raise ValueError('total must be exact or estimate')
+
+    total_count, total_is_estimate = None, False
+    if total == 'exact':
+        total_count = query.order_by(None).count()
+    elif total == 'estimate':
+        total_count, total_is_estimate = estimate_count(query)
+
+    if cursor:
+        after = decode_cursor(cursor, len(keys))
+        query = query.filter(tuple_(*keys) < tuple_(*after))
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor([getattr(items[-1], key.key) for key in keys])
+
+    return {
+        'items': items,
+        'per_page': per_page,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+        'total': total_count,
+        'total_is_estimate': total_is_estimate,
+    }
+
+
+def paginate(query, keys, page=1, per_page=20, cursor=None, total=None, max_per_page=100):
+    """Order a query by `keys` descending and paginate it.
+
+    Uses keyset pagination when cursor is not None (see keyset_paginate_query)
+    and offset pagination with an exact total otherwise.
+    """
+    query = query.order_by(*[key.desc() for key in keys])
+    if cursor is None:
+        return paginate_query(query, page=page, per_page=per_page, max_per_page=max_per_page)
+    return keyset_paginate_query(query, keys, cursor=cursor, per_page=per_page, max_per_page=max_per_page, total=total)
+
+
+def pagination_meta(result):
+    """The `pagination` object of a list response for paginate_query or keyset_paginate_query."""
+    if 'next_cursor' not in result:
+        return {
+            'total': result['total'],
+            'page': result['page'],
+            'per_page': result['per_page'],
+            'pages': result['pages']
+        }
+    meta = {
+        'per_page': result['per_page'],
+        'next_cursor': result['next_cursor'],
+        'has_more': result['has_more'],
+    }
+    if result['total'] is not None:
+        meta['total'] = result['total']
+        meta['total_is_estimate'] = result['total_is_estimate']
+    return meta
+
+
 def parse_time_string(time_str):
     """Parse time string in HH:MM format."""
     from datetime import datetime
@@ -0,0 +1,179 @@
+"""Local stand-in for the WhatsApp Cloud API messages endpoint.
+
+Used for load and latency testing of the reminder path without messaging
+real phones. Point the app at it with WHATSAPP_API_URL=http://<host>:<port>
+(any WHATSAPP_API_TOKEN / WHATSAPP_PHONE_NUMBER_ID will do) and start it with
+`python manage.py whatsapp-stub`.
+"""
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils.concurrency import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+MESSAGES_PATH = re.compile(r'^/(?P<version>[^/]+)/(?P<phone_number_id>[^/]+)/messages/?$')
+
+
+class StubSettings:
+    """Behaviour knobs for the stub server."""
+
+    def __init__(self, latency_ms=50, jitter_ms=0, error_rate=0.0, throttle_rate=0.0, rate_limit=0.0,
+                 timings_file=None):
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.error_rate = float(error_rate)
+        self.throttle_rate = float(throttle_rate)
+        # Requests per second before answering 429, like the real per-number throughput cap
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.timings_file = timings_file
+
+
+class TimingRecorder:
+    """Thread-safe per-request timing log with a summary for offline benchmarking."""
+
+    def __init__(self, timings_file=None):
+        self._records = []
+        self._lock = threading.Lock()
+        self._file = open(timings_file, 'a', encoding='utf-8') if timings_file else None
+
+    def record(self, status, latency_ms, to_phone):
+        entry = {
+            'ts': time.time(),
+            'status': status,
+            'latency_ms': round(latency_ms, 3),
+            'to': to_phone,
+        }
+        with self._lock:
+            self._records.append(entry)
+            if self._file:
+                self._file.write(json.dumps(entry) + '\n')
+                self._file.flush()
+
+    def summary(self):
+        with self._lock:
+            records = list(self._records)
+        if not records:
+            return {'requests': 0}
+
+        latencies = sorted(r['latency_ms'] for r in records)
+        by_status = {}
+        for r in records:
+            by_status[str(r['status'])] = by_status.get(str(r['status']), 0) + 1
+        elapsed = max(records[-1]['ts'] - records[0]['ts'], 1e-9)
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(round(p / 100.0 * (len(latencies) - 1))))]
+
+        return {
+            'requests': len(records),
+            'by_status': by_status,
+            'requests_per_second': round(len(records) / elapsed, 2) if len(records) > 1 else None,
+            'latency_ms': {
+                'min': latencies[0],
+                'p50': percentile(50),
+                'p95': percentile(95),
+                'p99': percentile(99),
+                'max': latencies[-1],
+            },
+        }
+
+    def reset(self):
+        with self._lock:
+            self._records = []
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server_version = 'WhatsAppStub/1.0'
+    protocol_version = 'HTTP/1.1'  # keep-alive, like graph.facebook.com
+
+    def log_message(self, format, *args):
+        logger.debug('%s - %s', self.address_string(), format % args)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            return self._send_json(200, self.server.recorder.summary())
+        return self._send_json(404, {'error': {'message': 'Unknown path'}})
+
+    def do_DELETE(self):
+        if self.path.rstrip('/') == '/stats':
+            self.server.recorder.reset()
+            return self._send_json(200, {'ok': True})
+        return self._send_json(404, {'error': {'message': 'Unknown path'}})
+
+    def do_POST(self):
+        started = time.perf_counter()
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+
+        if not MESSAGES_PATH.match(self.path):
+            return self._send_json(404, {'error': {'message': 'Unknown path'}})
+
+        try:
+            payload = json.loads(raw or b'{}')
+        except ValueError:
+            payload = None
+        to_phone = (payload or {}).get('to')
+
+        status, body, headers = self._respond(payload)
+
+        settings = self.server.settings
+        delay_ms = settings.latency_ms + (random.uniform(-settings.jitter_ms, settings.jitter_ms) if settings.jitter_ms else 0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+        self._send_json(status, body, headers)
+        self.server.recorder.record(status, (time.perf_counter() - started) * 1000.0, to_phone)
+
+    def _respond(self, payload):
+        settings = self.server.settings
+
+        if not (self.headers.get('Authorization') or '').startswith('Bearer '):
+            return 401, {'error': {'message': 'Invalid OAuth access token.', 'type': 'OAuthException', 'code': 190}}, {}
+        if not payload or not payload.get('to') or payload.get('messaging_product') != 'whatsapp':
+            return 400, {'error': {'message': '(#100) Invalid parameter', 'code': 100}}, {}
+
+        throttled = (settings.rate_limiter is not None and not settings.rate_limiter.try_acquire()) or (
+            settings.throttle_rate and random.random() < settings.throttle_rate
+        )
+        if throttled:
+            return 429, {'error': {'message': '(#130429) Rate limit hit', 'code': 130429}}, {'Retry-After': '1'}
+        if settings.error_rate and random.random() < settings.error_rate:
+            return 500, {'error': {'message': 'An unknown error has occurred.', 'code': 1}}, {}
+
+        to_phone = payload['to']
+        return 200, {
+            'messaging_product': 'whatsapp',
+            'contacts': [{'input': to_phone, 'wa_id': re.sub(r'\D', '', to_phone)}],
+            'messages': [{'id': f'wamid.{uuid.uuid4().hex}'}],
+        }, {}
+
+
+def create_stub_server(host='127.0.0.1', port=8089, settings=None):
+    """Build (but do not start) a threaded stub server. Port 0 picks a free port."""
+    settings = settings or StubSettings()
+    server = ThreadingHTTPServer((host, port), _StubHandler)
+    server.daemon_threads = True
+    server.settings = settings
+    server.recorder = TimingRecorder(settings.timings_file)
+    return server
@@ -83,6 +83,106 @@ def reset_db():
             print(f"✗ Error resetting database: {e}")
 
 
+def outbox_worker(once=False):
+    """Deliver queued outbound messages (runs until interrupted unless once=True)."""
+    from app.tasks.outbox_tasks import drain_outbox, run_outbox_worker
+    # The web process owns the cron jobs; a worker must not run them a second time.
+    app = create_app(SCHEDULER_ENABLED=False)
+    if once:
+        sent, failed = drain_outbox(app)
+        print(f"✓ Outbox drained: {sent} sent, {failed} failed")
+        return
+    try:
+        run_outbox_worker(app)
+    except KeyboardInterrupt:
+        print("Outbox worker stopped")
+
+
+def whatsapp_stub(host, port, latency_ms, jitter_ms, error_rate, throttle_rate, rate_limit, timings_file):
+    """Run the local WhatsApp Cloud API stand-in until interrupted."""
+    import json
+    from app.utils.whatsapp_stub import StubSettings, create_stub_server
+    settings = StubSettings(
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        error_rate=error_rate,
+        throttle_rate=throttle_rate,
+        rate_limit=rate_limit,
+        timings_file=timings_file,
+    )
+    server = create_stub_server(host, port, settings)
+    bound_host, bound_port = server.server_address[:2]
+    print(f"✓ WhatsApp stub listening on http://{bound_host}:{bound_port}")
+    print(f"  Set WHATSAPP_API_URL=http://{bound_host}:{bound_port} (any token / phone number id)")
+    print(f"  Stats: GET http://{bound_host}:{bound_port}/stats (DELETE to reset)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.recorder.summary(), indent=2))
+        server.recorder.close()
+
+
+def rebuild_order_stats(date_from=None, date_to=None):
+    """Recompute order_daily_stats from the orders table (whole table unless a range is given)."""
+    from app.services.order_stats_service import OrderStatsService
+    app = create_app()
+    with app.app_context():
+        try:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+            rows = OrderStatsService.rebuild(date_from, date_to)
+            db.session.commit()
+            print(f"✓ Order stats rebuilt: {rows} rows")
+        except Exception as e:
+            print(f"✗ Error rebuilding order stats: {e}")
+            db.session.rollback()
+
+
+def bench_render(order_count, items_per_order, runs):
+    """Time restaurant summary and draft rendering for a synthetic day (no database)."""
+    import time
+    from datetime import date, datetime
+    from decimal import Decimal
+    from types import SimpleNamespace
+    from app.services.email_templates import render_restaurant_draft, render_restaurant_summary
+    from app.services.order_summary_service import SummaryItem, SummaryOrder
+
+    restaurant = SimpleNamespace(name="Bench <Bistro> & Co", contact_name="Chef", email="chef@example.com")
+    orders = [
+        SummaryOrder(
+            id=i, restaurant_id=1, user_id=i, user_name=f"User {i} <o'neil>", status="confirmed",
+            total_amount=Decimal("12.50") * items_per_order, order_text=None,
+            notes="no nuts" if i % 5 == 0 else None, created_at=datetime.utcnow(),
+            items=[
+                SummaryItem(j, f"Dish {j} & sides", 1, Decimal("12.50"), "extra sauce" if j == 0 else None)
+                for j in range(items_per_order)
+            ]
+        )
+        for i in range(order_count)
+    ]
+    today = date.today()
+
+    for label, render in (
+        ("summary (html + text)", lambda: render_restaurant_summary(restaurant, today, orders)),
+        ("admin draft (text)", lambda: render_restaurant_draft(restaurant, today, orders)),
+    ):
+        render()  # compile + warm the template cache
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(
+            f"{label}: {order_count} orders x {items_per_order} items, {runs} runs - "
+            f"mean {sum(timings) / len(timings):.2f} ms, p50 {timings[len(timings) // 2]:.2f} ms, "
+            f"max {timings[-1]:.2f} ms"
+        )
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(prog="python manage.py", add_help=True)
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -102,6 +202,28 @@ if __name__ == '__main__':
 
     subparsers.add_parser("reset", help="Reset database (WARNING: destroys all data)")
 
+    outbox_parser = subparsers.add_parser("outbox-worker", help="Deliver queued WhatsApp/email messages")
+    outbox_parser.add_argument("--once", action="store_true", help="Drain due messages once and exit")
+
+    stats_parser = subparsers.add_parser("rebuild-order-stats", help="Backfill/rebuild order_daily_stats from orders")
+    stats_parser.add_argument("--date-from", default=None, help="YYYY-MM-DD (default: earliest order)")
+    stats_parser.add_argument("--date-to", default=None, help="YYYY-MM-DD (default: latest order)")
+
+    bench_parser = subparsers.add_parser("bench-render", help="Benchmark restaurant email/draft rendering")
+    bench_parser.add_argument("--orders", type=int, default=500)
+    bench_parser.add_argument("--items", type=int, default=3, help="Items per order")
+    bench_parser.add_argument("--runs", type=int, default=20)
+
+    stub_parser = subparsers.add_parser("whatsapp-stub", help="Run a local WhatsApp Cloud API stand-in")
+    stub_parser.add_argument("--host", default="127.0.0.1")
+    stub_parser.add_argument("--port", type=int, default=8089)
+    stub_parser.add_argument("--latency-ms", type=float, default=50, help="Mean response latency")
+    stub_parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform +/- latency jitter")
+    stub_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    stub_parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    stub_parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second before answering 429 (0 = off)")
+    stub_parser.add_argument("--timings-file", default=None, help="Append per-request timings as JSON lines")
+
     args = parser.parse_args()
 
     if args.command == "init":
@@ -138,3 +260,20 @@ if __name__ == '__main__':
         create_admin(email, password, first_name, last_name)
     elif args.command == "reset":
         reset_db()
+    elif args.command == "outbox-worker":
+        outbox_worker(once=args.once)
+    elif args.command == "rebuild-order-stats":
+        rebuild_order_stats(args.date_from, args.date_to)
+    elif args.command == "bench-render":
+        bench_render(args.orders, args.items, args.runs)
+    elif args.command == "whatsapp-stub":
+        whatsapp_stub(
+            args.host,
+            args.port,
+            args.latency_ms,
+            args.jitter_ms,
+            args.error_rate,
+            args.throttle_rate,
+            args.rate_limit,
+            args.timings_file,
+        )
@@ -0,0 +1,39 @@
+"""Add outbound messages (transactional outbox) table.
+
+Revision ID: c3d4e5f6a7b8
+Revises: a12b3c4d5e6f
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c3d4e5f6a7b8'
+down_revision = 'a12b3c4d5e6f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'outbound_messages',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('channel', sa.String(length=20), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('recipient', sa.String(length=255), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('idx_outbound_status_available', 'outbound_messages', ['status', 'available_at'])
+
+
+def downgrade():
+    op.drop_index('idx_outbound_status_available', table_name='outbound_messages')
+    op.drop_table('outbound_messages')
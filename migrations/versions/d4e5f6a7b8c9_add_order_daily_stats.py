@@ -0,0 +1,40 @@
+"""Add order daily stats table.
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd4e5f6a7b8c9'
+down_revision = 'c3d4e5f6a7b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'order_daily_stats',
+        sa.Column('order_date', sa.Date(), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), sa.ForeignKey('restaurants.id'), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Numeric(12, 2), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('order_date', 'restaurant_id', 'status'),
+    )
+    op.create_index('idx_order_daily_stats_restaurant', 'order_daily_stats', ['restaurant_id', 'order_date'])
+    # Backfill from existing orders so the table is usable right after upgrade
+    op.execute(
+        "INSERT INTO order_daily_stats (order_date, restaurant_id, status, order_count, total_amount, updated_at) "
+        "SELECT order_date, restaurant_id, status, COUNT(id), COALESCE(SUM(total_amount), 0), CURRENT_TIMESTAMP "
+        "FROM orders GROUP BY order_date, restaurant_id, status"
+    )
+
+
+def downgrade():
+    op.drop_index('idx_order_daily_stats_restaurant', table_name='order_daily_stats')
+    op.drop_table('order_daily_stats')
@@ -0,0 +1,24 @@
+"""Add indexes for keyset pagination of orders and reminders.
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+
+revision = 'e5f6a7b8c9d0'
+down_revision = 'd4e5f6a7b8c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_order_date_created_id', 'orders', ['order_date', 'created_at', 'id'])
+    op.create_index('idx_reminder_created_id', 'reminders', ['created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('idx_reminder_created_id', table_name='reminders')
+    op.drop_index('idx_order_date_created_id', table_name='orders')
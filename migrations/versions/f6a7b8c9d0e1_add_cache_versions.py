@@ -0,0 +1,33 @@
+"""Add cache_versions for cross-worker invalidation of in-process caches.
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f6a7b8c9d0e1'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(
+        "INSERT INTO cache_versions (name, version, updated_at) "
+        "VALUES ('restaurant_availability', 1, CURRENT_TIMESTAMP)"
+    )
+
+
+def downgrade():
+    op.drop_table('cache_versions')
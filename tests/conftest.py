@@ -1,6 +1,8 @@
 """Pytest configuration and fixtures."""
 import pytest
+from contextlib import contextmanager
 from datetime import date, timedelta
+from sqlalchemy import event
 from app import create_app, db
 from app.models import User, Restaurant, RestaurantAvailability, Menu, MenuItem, Order, OrderItem
 
@@ -22,6 +24,31 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def count_statements(app):
+    """Context manager collecting the SQL statements executed inside it.
+
+    with count_statements() as statements: ...  (selects_only=True keeps SELECTs only)
+    """
+    @contextmanager
+    def counter(selects_only=False):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if not selects_only or statement.lstrip().upper().startswith('SELECT'):
+                statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    return counter
+
+
 @pytest.fixture(scope='function')
 def db_session(app):
     """Create database session for testing."""
@@ -205,6 +232,39 @@ def order(db_session, regular_user, menu, menu_items):
     return order
 
 
+@pytest.fixture
+def add_restaurants(db_session, menu):
+    """Factory adding restaurants that each have a menu and two orders on menu.available_from.
+
+    add_restaurants(count, offset=0) creates 'Bistro {i}' with diners 'Diner 0'
+    (pending order) and 'Diner 1' (cancelled order) for i in offset..offset+count-1.
+    """
+    def add(count, offset=0):
+        from decimal import Decimal
+
+        for i in range(offset, offset + count):
+            restaurant = Restaurant(name=f'Bistro {i}', contact_name='Chef', phone_number='+100', email=f'bistro{i}@test.com', address='1 St')
+            db.session.add(restaurant)
+            db.session.flush()
+            other_menu = Menu(
+                restaurant_id=restaurant.id, name=f'Menu {i}', available_from=menu.available_from,
+                available_until=menu.available_until, is_active=True
+            )
+            db.session.add(other_menu)
+            db.session.flush()
+            for j in range(2):
+                user = User(email=f'diner{i}-{j}@test.com', password='User123!', first_name='Diner', last_name=str(j), role='user')
+                db.session.add(user)
+                db.session.flush()
+                db.session.add(Order(
+                    user_id=user.id, menu_id=other_menu.id, restaurant_id=restaurant.id,
+                    order_date=menu.available_from, total_amount=Decimal('8.00'),
+                    status='cancelled' if j else 'pending'
+                ))
+        db.session.commit()
+
+    return add
+
 @pytest.fixture
 def auth_headers_admin(admin_token):
     """Get authorization headers for admin."""
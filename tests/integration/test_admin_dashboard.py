@@ -0,0 +1,81 @@
+"""Integration tests for the admin dashboard endpoint."""
+from app import db
+from app.models import Order
+
+
+class TestAdminDashboard:
+    """Test dashboard aggregation and caching."""
+
+    def _dashboard(self, client, admin_token):
+        response = client.get('/api/admin/dashboard', headers={'Authorization': f'Bearer {admin_token}'})
+        assert response.status_code == 200
+        return response.json
+
+    def test_dashboard_stats(self, client, app, admin_token, regular_user, order):
+        """Test the aggregated counts and eager-loaded recent orders."""
+        from app.routes import admin
+
+        admin._dashboard_cache.clear()
+        data = self._dashboard(client, admin_token)
+
+        assert data['stats']['total_users'] == 2
+        assert data['stats']['total_restaurants'] == 1
+        assert data['stats']['total_menus'] == 1
+        assert data['stats']['orders_this_week'] == 1
+        assert data['stats']['orders_today'] == 0
+        assert data['stats']['users_without_orders_tomorrow'] == 2
+        assert data['status_breakdown'] == {'pending': 1}
+        assert data['recent_orders'][0]['id'] == order.id
+        assert data['recent_orders'][0]['restaurant_name'] == 'Test Restaurant'
+
+    def test_dashboard_query_count_and_cache(self, client, app, admin_token, order, count_statements):
+        """Test a cold dashboard runs a fixed number of queries and a warm one none."""
+        from app.routes import admin
+
+        self._dashboard(client, admin_token)  # warm auth lookups
+        admin._dashboard_cache.clear()
+        with count_statements(selects_only=True) as statements:
+            self._dashboard(client, admin_token)
+            # admin lookup + totals + status breakdown + recent orders
+            cold = len(statements)
+            assert cold <= 4
+
+            statements.clear()
+            self._dashboard(client, admin_token)
+            assert len(statements) <= 1  # only the admin lookup
+
+    def test_dashboard_invalidated_on_order_write(self, client, app, admin_token, order):
+        """Test committing an order change drops the cached dashboard."""
+        from app.routes import admin
+
+        admin._dashboard_cache.clear()
+        assert self._dashboard(client, admin_token)['status_breakdown'] == {'pending': 1}
+
+        with app.app_context():
+            db.session.get(Order, order.id).status = 'confirmed'
+            db.session.commit()
+
+        assert self._dashboard(client, admin_token)['status_breakdown'] == {'confirmed': 1}
+
+    def test_dashboard_cache_disabled(self, client, app, admin_token, order, monkeypatch):
+        """Test DASHBOARD_CACHE_TTL=0 recomputes on every request."""
+        from app.routes import admin
+
+        admin._dashboard_cache.clear()
+        monkeypatch.setitem(app.config, 'DASHBOARD_CACHE_TTL', 0)
+        self._dashboard(client, admin_token)
+        assert len(admin._dashboard_cache) == 0
+
+    def test_dashboard_invalidated_on_bulk_update(self, client, app, admin_token, order):
+        """Test a set-based UPDATE of orders also drops the cached dashboard."""
+        from sqlalchemy import update
+        from app.routes import admin
+
+        admin._dashboard_cache.clear()
+        self._dashboard(client, admin_token)
+
+        with app.app_context():
+            db.session.execute(update(Order).where(Order.id == order.id).values(status='cancelled'))
+            db.session.commit()
+
+        assert self._dashboard(client, admin_token)['status_breakdown'] == {'cancelled': 1}
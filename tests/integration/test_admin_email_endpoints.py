@@ -0,0 +1,138 @@
+"""Integration tests for admin email endpoints."""
+import pytest
+from app import db
+from app.models import Order
+
+
+class TestEmailDraftCache:
+    """Test email draft caching."""
+
+    def _draft(self, client, admin_token, order):
+        response = client.post('/api/admin/orders/email-draft', json={
+            'date': order.order_date.isoformat(),
+            'restaurant_id': order.restaurant_id
+        }, headers={'Authorization': f'Bearer {admin_token}'})
+        assert response.status_code == 200
+        return response.json['draft']
+
+    def test_draft_reused_until_orders_change(self, client, app, admin_token, order, monkeypatch):
+        """Test repeated previews render once and an order edit re-renders."""
+        from app.routes import admin
+
+        admin._draft_cache.clear()
+        renders = []
+        original = admin._build_restaurant_email_draft
+
+        def counting_build(*args):
+            renders.append(args[1].id)
+            return original(*args)
+
+        monkeypatch.setattr(admin, '_build_restaurant_email_draft', counting_build)
+
+        first = self._draft(client, admin_token, order)
+        second = self._draft(client, admin_token, order)
+        assert first == second
+        assert len(renders) == 1
+
+        with app.app_context():
+            db.session.get(Order, order.id).notes = 'Extra napkins'
+            db.session.commit()
+
+        third = self._draft(client, admin_token, order)
+        assert len(renders) == 2
+        assert 'Extra napkins' in third['body']
+
+    def test_item_replacement_rerenders_without_invalidation(self, client, app, admin_token, order, menu_items, monkeypatch):
+        """Test a worker that missed the commit notification still re-renders after items are replaced."""
+        from app.models import OrderItem
+        from app.routes import admin
+        from app.services.order_events import subscribe, unsubscribe
+
+        admin._draft_cache.clear()
+        first = self._draft(client, admin_token, order)
+        assert '1x Chicken Salad' in first['body']
+
+        # As in another gunicorn worker: no in-process invalidation, order row untouched
+        unsubscribe(admin._on_orders_changed)
+        try:
+            with app.app_context():
+                items = OrderItem.__table__
+                db.session.execute(items.delete().where(items.c.order_id == order.id))
+                db.session.execute(items.insert().values(
+                    order_id=order.id, menu_item_id=menu_items[2].id, quantity=1, price=menu_items[2].price
+                ))
+                db.session.commit()
+
+            second = self._draft(client, admin_token, order)
+        finally:
+            subscribe(admin._on_orders_changed)
+
+        assert '1x Fish Tacos' in second['body']
+        assert 'Chicken Salad' not in second['body']
+
+    def test_send_email_reuses_preview(self, client, app, admin_token, order, monkeypatch):
+        """Test the send uses the draft rendered for the preview."""
+        from app.routes import admin
+
+        admin._draft_cache.clear()
+        preview = self._draft(client, admin_token, order)
+        monkeypatch.setattr(admin, '_build_restaurant_email_draft', lambda *args: pytest.fail('draft should have come from the cache'))
+
+        response = client.post('/api/admin/orders/send-email', json={
+            'date': order.order_date.isoformat(),
+            'restaurant_id': order.restaurant_id
+        }, headers={'Authorization': f'Bearer {admin_token}'})
+
+        assert response.status_code == 200
+        assert response.json['draft'] == preview
+        with app.app_context():
+            assert db.session.get(Order, order.id).status == 'ordered'
+
+
+
+class TestSendAllEmails:
+    """Test batched status and log writes of send-all."""
+
+    def _send_all(self, client, count_statements, admin_token, order_date):
+        with count_statements() as statements:
+            response = client.post('/api/admin/orders/send-all-emails', json={'date': order_date.isoformat()},
+                                   headers={'Authorization': f'Bearer {admin_token}'})
+        assert response.status_code == 200
+        return response.json, len(statements)
+
+    def test_send_all_constant_statements(self, client, app, admin_token, menu, monkeypatch, add_restaurants, count_statements):
+        """Test send-all marks orders and logs emails with a statement count independent of restaurants."""
+        from app.models import RestaurantOrderEmailLog
+        from app.routes import admin
+
+        monkeypatch.setitem(app.config, 'ADMIN_EMAIL_BACKEND', 'console')
+        day = menu.available_from
+
+        with app.app_context():
+            add_restaurants(2)
+        admin._draft_cache.clear()
+        self._send_all(client, count_statements, admin_token, day)  # warm auth lookups and logs
+
+        with app.app_context():
+            db.session.query(RestaurantOrderEmailLog).delete()
+            db.session.execute(db.update(Order).values(status='pending').where(Order.status == 'ordered'))
+            db.session.commit()
+        admin._draft_cache.clear()
+        small, small_count = self._send_all(client, count_statements, admin_token, day)
+
+        with app.app_context():
+            db.session.query(RestaurantOrderEmailLog).delete()
+            db.session.execute(db.update(Order).values(status='pending').where(Order.status == 'ordered'))
+            db.session.commit()
+            add_restaurants(6, offset=2)
+        admin._draft_cache.clear()
+        large, large_count = self._send_all(client, count_statements, admin_token, day)
+
+        assert small['sent'] == 2
+        assert large['sent'] == 8
+        assert large_count == small_count
+
+        with app.app_context():
+            statuses = {o.status for o in Order.query.filter_by(order_date=day).all()}
+            assert statuses == {'ordered', 'cancelled'}
+            assert RestaurantOrderEmailLog.query.filter_by(order_date=day).count() == 8
@@ -0,0 +1,155 @@
+"""Integration tests for the live admin order feed."""
+import json
+from datetime import date, timedelta
+from sqlalchemy import update
+from app import db
+from app.models import Order
+from app.services.order_feed import OrderFeed, get_order_feed
+
+
+def _parse_stream(body):
+    """List of (id, event, data) for each SSE message in body."""
+    messages = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if line and not line.startswith(':'))
+        if 'event' in fields:
+            messages.append((fields['id'], fields['event'], json.loads(fields['data'])))
+    return messages
+
+
+class TestOrderFeed:
+    """Test order events reach the feed on commit and are streamed as SSE."""
+
+    def test_commits_publish_events(self, app, order):
+        """Test created, status_changed, cancelled and bulk refresh events, and nothing on rollback."""
+        feed = get_order_feed()
+        start = feed.last_seq
+
+        with app.app_context():
+            db_order = db.session.get(Order, order.id)
+            db_order.status = 'ordered'
+            db.session.commit()
+
+            db_order.notes = 'No onions'
+            db.session.commit()
+
+            # Expired by the commit; the previous status is known once loaded
+            db.session.refresh(db_order)
+            db_order.status = 'cancelled'
+            db.session.commit()
+
+            db_order.status = 'pending'
+            db.session.flush()
+            db.session.rollback()
+
+            db.session.execute(update(Order).where(Order.id == order.id).values(status='completed'))
+            db.session.commit()
+
+        events, missed = feed.wait(start, 0)
+        assert missed is False
+        payloads = [payload for _, payload in events]
+        assert [p['type'] for p in payloads] == ['status_changed', 'updated', 'cancelled', 'refresh']
+        assert payloads[0] == {
+            'type': 'status_changed',
+            'order_id': order.id,
+            'restaurant_id': order.restaurant_id,
+            'order_date': order.order_date.isoformat(),
+            'status': 'ordered',
+            'previous_status': 'pending'
+        }
+        assert payloads[2]['previous_status'] == 'ordered'
+
+    def test_order_item_insert_is_attributed(self, app, order, menu_items):
+        """Test the bulk item delete/insert of update_order and create_order are not reported as a refresh."""
+        from app.services.order_service import OrderService
+
+        order_id, user_id, menu_id = order.id, order.user_id, order.menu_id
+        other_day = next(
+            day for day in (date.today() + timedelta(days=i) for i in range(1, 8))
+            if day.weekday() < 5 and day != order.order_date
+        )
+        feed = get_order_feed()
+        start = feed.last_seq
+        with app.app_context():
+            OrderService.update_order(order_id, user_id, items_data=[
+                {'menu_item_id': menu_items[0].id, 'quantity': 3}
+            ])
+            created_id = OrderService.create_order(user_id, menu_id, other_day, [
+                {'menu_item_id': menu_items[1].id, 'quantity': 1}
+            ]).id
+
+        events, _ = feed.wait(start, 0)
+        assert [(payload['type'], payload['order_id']) for _, payload in events] == [
+            ('updated', order_id), ('created', created_id)
+        ]
+
+    def test_item_replacement_is_scoped_to_its_order(self, app, order, menu_items):
+        """Test replacing items invalidates only the order's (restaurant, date), not ALL_ORDERS."""
+        from app.services.order_events import subscribe, unsubscribe
+        from app.services.order_service import OrderService
+
+        order_id, user_id, restaurant_id = order.id, order.user_id, order.restaurant_id
+        scope = (restaurant_id, order.order_date)
+        changes = []
+        callback = subscribe(changes.append)
+        feed = get_order_feed()
+        start = feed.last_seq
+        try:
+            with app.app_context():
+                OrderService.update_order(order_id, user_id, items_data=[
+                    {'menu_item_id': menu_items[2].id, 'quantity': 1}
+                ])
+                OrderService.update_simple_order(order_id, user_id, restaurant_id, 'Soup of the day')
+        finally:
+            unsubscribe(callback)
+
+        assert changes == [{scope}, {scope}]
+        events, _ = feed.wait(start, 0)
+        assert [(payload['type'], payload['order_id']) for _, payload in events] == [
+            ('updated', order_id), ('updated', order_id)
+        ]
+
+    def test_stream_replays_since_last_event_id(self, client, app, admin_token, order, monkeypatch):
+        """Test the endpoint streams events after Last-Event-ID and a refresh for unknown ids."""
+        monkeypatch.setitem(app.config, 'ORDER_FEED_MAX_SECONDS', 1)
+        monkeypatch.setitem(app.config, 'ORDER_FEED_HEARTBEAT', 1)
+        headers = {'Authorization': f'Bearer {admin_token}'}
+        feed = get_order_feed()
+        last_event_id = f'{feed.epoch}-{feed.last_seq}'
+
+        response = client.put(
+            f'/api/admin/orders/{order.id}/status', json={'status': 'ordered'}, headers=headers
+        )
+        assert response.status_code == 200
+
+        response = client.get('/api/admin/orders/stream', headers={**headers, 'Last-Event-ID': last_event_id})
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        body = response.get_data(as_text=True)
+        assert body.startswith('retry: 1000')
+        messages = _parse_stream(body)
+        assert [(event_type, data['order_id']) for _, event_type, data in messages] == [('status_changed', order.id)]
+        assert messages[0][0] == f'{feed.epoch}-{feed.last_seq}'
+
+        response = client.get('/api/admin/orders/stream?last_event_id=other-1', headers=headers)
+        assert [event_type for _, event_type, _ in _parse_stream(response.get_data(as_text=True))] == ['refresh']
+
+    def test_stream_client_limit(self, client, app, admin_token, monkeypatch):
+        """Test streams beyond ORDER_FEED_MAX_CLIENTS are refused."""
+        monkeypatch.setitem(app.config, 'ORDER_FEED_MAX_CLIENTS', 0)
+        response = client.get('/api/admin/orders/stream', headers={'Authorization': f'Bearer {admin_token}'})
+        assert response.status_code == 503
+
+    def test_stream_slot_released_when_listener_fails(self, client, app, admin_token, monkeypatch):
+        """Test the reserved slot is given back if starting the listener raises."""
+        def failing_listener(engine):
+            raise RuntimeError('listener unavailable')
+
+        feed = OrderFeed()
+        monkeypatch.setattr('app.routes.admin.get_order_feed', lambda: feed)
+        monkeypatch.setattr('app.routes.admin.ensure_listener', failing_listener)
+        monkeypatch.setitem(app.config, 'ORDER_FEED_MAX_CLIENTS', 1)
+        response = client.get('/api/admin/orders/stream', headers={'Authorization': f'Bearer {admin_token}'})
+        assert response.status_code == 500
+        assert feed.acquire(1) is True
@@ -0,0 +1,48 @@
+"""Integration tests for the admin by-date order listing."""
+
+
+class TestOrdersByDate:
+    """Test the by-date order listing."""
+
+    def _get(self, client, count_statements, admin_token, params):
+        with count_statements(selects_only=True) as selects:
+            response = client.get('/api/admin/orders/by-date', query_string=params,
+                                  headers={'Authorization': f'Bearer {admin_token}'})
+        assert response.status_code == 200
+        return response.json, len(selects)
+
+    def test_grouped_query_count(self, client, app, admin_token, order, menu, add_restaurants, count_statements):
+        """Test the grouped shape runs a fixed number of queries whatever the order count."""
+        params = {'date': order.order_date.isoformat()}
+        self._get(client, count_statements, admin_token, params)  # warm auth lookups
+        data, one_order = self._get(client, count_statements, admin_token, params)
+        assert [len(o['items']) for o in data['groups'][0]['orders']] == [2]
+
+        with app.app_context():
+            add_restaurants(3)
+        # Orders of the fixture menu's first available day, not the fixture order's day
+        params = {'date': menu.available_from.isoformat()}
+        data, many_orders = self._get(client, count_statements, admin_token, params)
+
+        assert len(data['groups']) == 3
+        assert data['groups'][0]['orders'][0]['user_name'] == 'Diner 0'
+        assert data['groups'][0]['orders'][0]['restaurant_name'] == 'Bistro 0'
+        assert many_orders == one_order
+
+    def test_normalized_shape(self, client, admin_token, order, count_statements):
+        """Test the normalized shape lists each entity once and references it by id."""
+        data, _ = self._get(client, count_statements, admin_token, {'date': order.order_date.isoformat(), 'shape': 'normalized'})
+
+        assert data['shape'] == 'normalized'
+        assert [r['name'] for r in data['restaurants']] == ['Test Restaurant']
+        assert data['restaurants'][0]['email_sent'] is False
+        assert [u['full_name'] for u in data['users']] == ['Test User']
+        assert {m['name'] for m in data['menu_items']} == {'Chicken Salad', 'Veggie Bowl'}
+        assert data['orders'][0]['restaurant_id'] == data['restaurants'][0]['id']
+        assert data['orders'][0]['menu_id'] == data['menus'][0]['id']
+        assert len(data['orders'][0]['items']) == 2
+
+    def test_invalid_shape(self, client, admin_token):
+        """Test unknown shapes are rejected."""
+        response = client.get('/api/admin/orders/by-date?shape=tree', headers={'Authorization': f'Bearer {admin_token}'})
+        assert response.status_code == 400
@@ -0,0 +1,75 @@
+"""Integration tests for cursor pagination of admin list endpoints."""
+from datetime import date, timedelta
+from decimal import Decimal
+from app import db
+from app.models import Order, User
+
+
+class TestCursorPagination:
+    """Test keyset pagination on /api/admin/orders and /api/users."""
+
+    def _add_orders(self, menu, count):
+        for i in range(count):
+            user = User(
+                email=f'page{i}@test.com',
+                password='User123!',
+                first_name='Page',
+                last_name=str(i),
+                role='user'
+            )
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(Order(
+                user_id=user.id,
+                menu_id=menu.id,
+                restaurant_id=menu.restaurant_id,
+                order_date=date.today() + timedelta(days=i % 3),
+                total_amount=Decimal('5.00'),
+                status='pending'
+            ))
+        db.session.commit()
+
+    def test_walk_orders_with_cursor(self, client, app, admin_token, menu):
+        """Test following next_cursor visits every order once, in offset order."""
+        headers = {'Authorization': f'Bearer {admin_token}'}
+        with app.app_context():
+            self._add_orders(menu, 7)
+
+        offset = client.get('/api/admin/orders?per_page=50', headers=headers).json
+        expected = [o['id'] for o in offset['orders']]
+        assert offset['pagination']['total'] == 7
+
+        seen = []
+        cursor = ''
+        while True:
+            response = client.get('/api/admin/orders', query_string={'per_page': 3, 'cursor': cursor}, headers=headers)
+            assert response.status_code == 200
+            seen.extend(o['id'] for o in response.json['orders'])
+            pagination = response.json['pagination']
+            assert 'total' not in pagination
+            if not pagination['has_more']:
+                assert pagination['next_cursor'] is None
+                break
+            cursor = pagination['next_cursor']
+
+        assert seen == expected
+
+    def test_cursor_total_and_errors(self, client, app, admin_token, menu):
+        """Test the optional total and rejection of bad cursors."""
+        headers = {'Authorization': f'Bearer {admin_token}'}
+        with app.app_context():
+            self._add_orders(menu, 2)
+
+        response = client.get('/api/users?cursor=&per_page=1&total=estimate', headers=headers)
+        assert response.status_code == 200
+        assert len(response.json['users']) == 1
+        # SQLite has no planner estimate, so the count is exact
+        assert response.json['pagination']['total'] == 3
+        assert response.json['pagination']['total_is_estimate'] is False
+
+        response = client.get('/api/admin/orders?cursor=not-a-cursor', headers=headers)
+        assert response.status_code == 400
+        assert response.json['error'] == 'Invalid cursor'
+
+        response = client.get('/api/reminders?cursor=&total=maybe', headers=headers)
+        assert response.status_code == 400
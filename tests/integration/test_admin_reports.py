@@ -0,0 +1,172 @@
+"""Integration tests for admin order summary, report and export endpoints."""
+from datetime import timedelta
+from decimal import Decimal
+from app import db
+from app.models import Order, User
+
+
+class TestOrderSummaryAndReport:
+    """Test SQL-side aggregation of the summary and report endpoints."""
+
+    def _add_orders(self, menu, order_date, count):
+        for i in range(count):
+            user = User(
+                email=f'report{order_date.day}-{i}@test.com',
+                password='User123!',
+                first_name='Report',
+                last_name=str(i),
+                role='user'
+            )
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(Order(
+                user_id=user.id,
+                menu_id=menu.id,
+                restaurant_id=menu.restaurant_id,
+                order_date=order_date,
+                total_amount=Decimal('10.50'),
+                status='pending'
+            ))
+        db.session.commit()
+
+    def _get(self, client, count_statements, path, params, headers):
+        with count_statements(selects_only=True) as selects:
+            response = client.get(path, query_string=params, headers=headers)
+        assert response.status_code == 200
+        return response.json, len(selects)
+
+    def test_live_aggregation_query_count(self, client, app, admin_token, menu, monkeypatch, count_statements):
+        """Test summary and report run a fixed number of queries regardless of order count."""
+        monkeypatch.setitem(app.config, 'ORDER_STATS_ENABLED', False)
+        headers = {'Authorization': f'Bearer {admin_token}'}
+        day = menu.available_from
+        params = {'date_from': day.isoformat(), 'date_to': (day + timedelta(days=1)).isoformat()}
+
+        with app.app_context():
+            self._add_orders(menu, day, 2)
+        self._get(client, count_statements, '/api/admin/orders/summary', params, headers)  # warm auth lookups
+        _, summary_queries = self._get(client, count_statements, '/api/admin/orders/summary', params, headers)
+        _, report_queries = self._get(client, count_statements, '/api/admin/reports/orders', params, headers)
+
+        with app.app_context():
+            self._add_orders(menu, day + timedelta(days=1), 5)
+        summary, summary_queries_after = self._get(client, count_statements, '/api/admin/orders/summary', params, headers)
+        report, report_queries_after = self._get(client, count_statements, '/api/admin/reports/orders', params, headers)
+
+        assert summary_queries_after == summary_queries
+        assert report_queries_after == report_queries
+
+        assert [d['total_orders'] for d in summary['summary']] == [2, 5]
+        assert summary['summary'][1]['total_amount'] == 52.5
+        assert summary['summary'][1]['by_restaurant'] == [{
+            'restaurant_id': menu.restaurant_id,
+            'restaurant_name': 'Test Restaurant',
+            'order_count': 5,
+            'total_amount': 52.5
+        }]
+        assert report['total_orders'] == 7
+        assert report['total_revenue'] == 73.5
+        assert report['average_order_value'] == 10.5
+        assert report['by_restaurant'][0]['order_count'] == 7
+
+
+    def test_summary_endpoints_match_live_aggregation(self, client, app, admin_token, order, monkeypatch):
+        """Test summary and report return the same JSON from stats and from orders."""
+        headers = {'Authorization': f'Bearer {admin_token}'}
+        params = {'date_from': order.order_date.isoformat(), 'date_to': order.order_date.isoformat()}
+
+        responses = {}
+        for enabled in (True, False):
+            monkeypatch.setitem(app.config, 'ORDER_STATS_ENABLED', enabled)
+            summary = client.get('/api/admin/orders/summary', query_string=params, headers=headers)
+            report = client.get('/api/admin/reports/orders', query_string=params, headers=headers)
+            assert summary.status_code == 200
+            assert report.status_code == 200
+            responses[enabled] = (summary.json, report.json)
+
+        assert responses[True] == responses[False]
+        summary, report = responses[True]
+        assert summary['summary'][0]['total_orders'] == 1
+        assert summary['summary'][0]['by_restaurant'][0]['restaurant_name'] == 'Test Restaurant'
+        assert report['total_revenue'] == 23.98
+
+class TestOrderExport:
+    """Test streaming order export."""
+
+    def test_export_csv(self, client, admin_token, order):
+        """Test CSV export has one line per order item with user and restaurant data."""
+        import csv
+        import io
+
+        response = client.get('/api/admin/orders/export', query_string={
+            'format': 'csv',
+            'date_from': order.order_date.isoformat(),
+            'date_to': order.order_date.isoformat()
+        }, headers={'Authorization': f'Bearer {admin_token}'})
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert response.is_streamed
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert len(rows) == 2
+        assert {r['menu_item_name'] for r in rows} == {'Chicken Salad', 'Veggie Bowl'}
+        assert rows[0]['order_id'] == str(order.id)
+        assert rows[0]['user_email'] == 'user@test.com'
+        assert rows[0]['restaurant_name'] == 'Test Restaurant'
+
+    def test_export_csv_escapes_formulas(self, client, app, admin_token, order):
+        """Test user text that a spreadsheet would run as a formula is quoted in CSV but not NDJSON."""
+        import csv
+        import io
+        import json
+
+        with app.app_context():
+            stored = db.session.get(Order, order.id)
+            stored.notes = '=HYPERLINK("http://evil.test","x")'
+            stored.order_text = '-2+3'
+            db.session.commit()
+
+        params = {'date_from': order.order_date.isoformat(), 'date_to': order.order_date.isoformat()}
+        headers = {'Authorization': f'Bearer {admin_token}'}
+        response = client.get('/api/admin/orders/export', query_string={'format': 'csv', **params}, headers=headers)
+        row = next(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert row['order_notes'] == '\'=HYPERLINK("http://evil.test","x")'
+        assert row['order_text'] == "'-2+3"
+        assert row['order_total'] == '23.98'
+
+        response = client.get('/api/admin/orders/export', query_string={'format': 'ndjson', **params}, headers=headers)
+        assert json.loads(response.get_data(as_text=True).splitlines()[0])['order_notes'] == '=HYPERLINK("http://evil.test","x")'
+
+    def test_export_ndjson(self, client, app, admin_token, order, menu):
+        """Test NDJSON export has one line per order with its items, including item-less orders."""
+        import json
+
+        with app.app_context():
+            user = User(email='text@test.com', password='User123!', first_name='Text', last_name='Only', role='user')
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(Order(
+                user_id=user.id, menu_id=menu.id, restaurant_id=menu.restaurant_id,
+                order_date=order.order_date, total_amount=0, order_text='Soup of the day', status='pending'
+            ))
+            db.session.commit()
+
+        response = client.get('/api/admin/orders/export', query_string={
+            'format': 'ndjson',
+            'date_from': order.order_date.isoformat(),
+            'date_to': order.order_date.isoformat()
+        }, headers={'Authorization': f'Bearer {admin_token}'})
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [len(o['items']) for o in lines] == [2, 0]
+        assert lines[0]['order_total'] == 23.98
+        assert lines[1]['order_text'] == 'Soup of the day'
+
+    def test_export_validation(self, client, admin_token):
+        """Test missing dates and unknown formats are rejected."""
+        headers = {'Authorization': f'Bearer {admin_token}'}
+        assert client.get('/api/admin/orders/export?format=csv', headers=headers).status_code == 400
+        assert client.get(
+            '/api/admin/orders/export?format=xml&date_from=2026-01-01&date_to=2026-01-31', headers=headers
+        ).status_code == 400
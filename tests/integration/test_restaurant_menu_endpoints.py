@@ -71,6 +71,24 @@ class TestRestaurantEndpoints:
         
         assert response.status_code == 200
 
+    
+    def test_availability_follows_writes(self, client, auth_headers_admin, restaurant):
+        """Test created restaurants and availability updates show up in the cached availability."""
+        response = client.get('/api/admin/restaurants/availability', headers=auth_headers_admin)
+        assert response.json['availability'] == {str(restaurant.id): [0, 1, 2, 3, 4]}
+
+        created = client.post('/api/restaurants', headers=auth_headers_admin, json={'name': 'Late Lunch'}).json
+        response = client.put(f'/api/admin/restaurants/{restaurant.id}/availability',
+            headers=auth_headers_admin,
+            json={'weekdays': [1, 3]}
+        )
+        assert response.status_code == 200
+
+        response = client.get('/api/admin/restaurants/availability', headers=auth_headers_admin)
+        assert response.json['availability'] == {
+            str(restaurant.id): [1, 3],
+            str(created['restaurant']['id']): [0, 1, 2, 3, 4]
+        }
 
 class TestMenuEndpoints:
     """Test menu API endpoints."""
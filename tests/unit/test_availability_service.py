@@ -0,0 +1,49 @@
+"""Unit tests for the restaurant availability cache."""
+from sqlalchemy import update
+from app import db
+from app.models import CacheVersion, RestaurantAvailability
+from app.services.availability_service import AvailabilityService, CACHE_NAME
+
+
+class TestAvailabilityService:
+    """Test the in-process availability map and its invalidation."""
+
+    def test_map_is_cached_and_invalidated_on_write(self, app, db_session, restaurant, count_statements):
+        """Test reads hit the map and an ORM write reloads it on commit."""
+        with app.app_context():
+            restaurant_id = restaurant.id
+            AvailabilityService.get_map()
+            with count_statements() as statements:
+                assert AvailabilityService.is_available(restaurant_id, 0) is True
+            assert statements == []
+            assert AvailabilityService.restaurants_available_on(5) == []
+
+            row = RestaurantAvailability.query.filter_by(restaurant_id=restaurant_id, weekday=0).first()
+            row.is_available = False
+            db_session.commit()
+
+            assert AvailabilityService.is_available(restaurant_id, 0) is False
+            assert AvailabilityService.get_map()[restaurant_id] == frozenset({1, 2, 3, 4})
+            assert db_session.get(CacheVersion, CACHE_NAME).version >= 1
+
+    def test_other_worker_write_seen_after_version_check(self, app, db_session, restaurant, monkeypatch):
+        """Test a write from another process (no local hooks) is picked up via the version counter."""
+        with app.app_context():
+            restaurant_id = restaurant.id
+            AvailabilityService.get_map()
+
+            # Another worker: same transaction updates the row and bumps the version
+            with db.engine.begin() as connection:
+                connection.execute(
+                    update(RestaurantAvailability.__table__)
+                    .where(RestaurantAvailability.restaurant_id == restaurant_id)
+                    .values(is_available=False)
+                )
+                AvailabilityService.bump_version(connection)
+
+            monkeypatch.setitem(app.config, 'AVAILABILITY_VERSION_CHECK_SECONDS', 3600)
+            assert AvailabilityService.is_available(restaurant_id, 2) is True
+
+            monkeypatch.setitem(app.config, 'AVAILABILITY_VERSION_CHECK_SECONDS', 0)
+            assert AvailabilityService.is_available(restaurant_id, 2) is False
+            assert AvailabilityService.restaurants_available_on(2) == []
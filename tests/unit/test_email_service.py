@@ -0,0 +1,162 @@
+"""Unit tests for email service."""
+import mailbox
+import requests
+from app.services.email_service import EmailService
+from app.services.email_transports import get_email_transport
+
+
+def _accepted(*args, **kwargs):
+    response = requests.Response()
+    response.status_code = 202
+    return response
+
+
+class TestEmailService:
+    """Test email service."""
+
+    def test_client_is_cached_per_key(self):
+        """Test the SendGrid client is built once per process and API key."""
+        transport = get_email_transport('sendgrid')
+        assert transport.client('key-a') is transport.client('key-a')
+        assert transport.client('key-b') is not transport.client('key-a')
+
+    def test_send_emails_reuses_session(self, app, monkeypatch):
+        """Test a batch goes through the one pooled session, in order."""
+        calls = []
+
+        def post(url, json, headers, timeout):
+            calls.append((url, json['personalizations'][0]['to'][0]['email'], headers['Authorization']))
+            return _accepted()
+
+        monkeypatch.setitem(app.config, 'SENDGRID_API_KEY', 'test-key')
+        with app.app_context():
+            session = get_email_transport('sendgrid').http()
+            monkeypatch.setattr(session, 'post', post)
+
+            results = EmailService.send_emails([
+                {'to_email': 'a@test.com', 'subject': 'A', 'html_content': '<p>a</p>'},
+                {'to_email': 'b@test.com', 'subject': 'B', 'html_content': '<p>b</p>', 'plain_content': 'b'},
+            ])
+
+            assert get_email_transport('sendgrid').http() is session
+        assert results == [(True, 'Email sent'), (True, 'Email sent')]
+        assert [c[1] for c in calls] == ['a@test.com', 'b@test.com']
+        assert calls[0][0] == 'https://api.sendgrid.com/v3/mail/send'
+        assert calls[0][2] == 'Bearer test-key'
+
+    def test_send_email_not_configured(self, app, monkeypatch):
+        """Test a missing API key fails without calling out."""
+        monkeypatch.setitem(app.config, 'SENDGRID_API_KEY', None)
+        with app.app_context():
+            assert EmailService.send_email('a@test.com', 'A', '<p>a</p>') == (False, 'Email not configured')
+
+    def test_file_backend_writes_maildir(self, app, monkeypatch, tmp_path):
+        """Test the file backend stores a multipart message per email."""
+        monkeypatch.setitem(app.config, 'EMAIL_FILE_PATH', str(tmp_path / 'mail'))
+        with app.app_context():
+            results = EmailService.send_emails([
+                {'to_email': 'a@test.com', 'subject': 'A', 'html_content': '<p>a</p>', 'plain_content': 'a'},
+                {'to_email': 'b@test.com', 'subject': 'B', 'html_content': '<p>b</p>'},
+            ], max_workers=2, backend='file')
+
+        assert all(success for success, _ in results)
+        messages = sorted(mailbox.Maildir(str(tmp_path / 'mail'), create=False), key=lambda m: m['To'])
+        assert [m['To'] for m in messages] == ['a@test.com', 'b@test.com']
+        assert messages[0].is_multipart()
+
+    def test_console_backend(self, app, capsys):
+        """Test the console backend prints the message instead of sending it."""
+        with app.app_context():
+            success, message = EmailService.send_email('a@test.com', 'Hello', '<p>hi</p>', 'hi', backend='console')
+
+        assert (success, message) == (True, 'Email logged (not sent)')
+        assert 'Subject: Hello' in capsys.readouterr().out
+
+    def test_unknown_backend(self, app):
+        """Test a misconfigured backend fails the send instead of raising."""
+        with app.app_context():
+            success, message = EmailService.send_email('a@test.com', 'A', '<p>a</p>', backend='pigeon')
+
+        assert success is False
+        assert 'pigeon' in message
+
+
+class TestEmailTemplates:
+    """Test restaurant email and draft templates."""
+
+    def _orders(self):
+        from decimal import Decimal
+        from app.services.order_summary_service import SummaryItem, SummaryOrder
+        return [
+            SummaryOrder(1, 1, 7, '<b>Eve</b>', 'confirmed', Decimal('24.00'), None, 'ring & wait', None, [
+                SummaryItem(3, 'Fish <Tacos>', 2, Decimal('12.00'), None),
+            ]),
+            SummaryOrder(2, 1, 8, None, 'pending', Decimal('0'), None, None, None, []),
+        ]
+
+    def test_summary_escapes_html_only(self):
+        """Test user content is escaped in HTML and left as-is in plain text."""
+        from datetime import date
+        from types import SimpleNamespace
+        from app.services.email_templates import render_restaurant_summary
+
+        restaurant = SimpleNamespace(name='Tom & Jerry', email='r@test.com')
+        html, text = render_restaurant_summary(restaurant, date(2026, 3, 2), self._orders()[:1])
+
+        assert '&lt;b&gt;Eve&lt;/b&gt;' in html
+        assert 'Fish &lt;Tacos&gt; - $12.00 ($24.00)' in html
+        assert 'Tom &amp; Jerry' in html
+        assert '<b>Eve</b>:' in text
+        assert '  2x Fish <Tacos> - $24.00' in text
+        assert 'Total Orders: 1' in text
+
+    def test_draft_body(self):
+        """Test draft lines, structured-order fallback and empty day."""
+        from datetime import date
+        from types import SimpleNamespace
+        from app.services.email_templates import render_restaurant_draft
+
+        restaurant = SimpleNamespace(name='Bistro', contact_name='Chef')
+        body = render_restaurant_draft(restaurant, date(2026, 3, 2), self._orders())
+
+        assert body == '\n'.join([
+            'Hello Chef,',
+            '',
+            'Here are the orders for Monday, Mar 02, 2026:',
+            '',
+            '- <b>Eve</b>: 2x Fish <Tacos> (Notes: ring & wait)',
+            '- User 8: (no order details)',
+            '',
+            'Thanks,',
+            'Meal of the Day',
+        ])
+        assert '(No orders)' in render_restaurant_draft(restaurant, date(2026, 3, 2), [])
+
+    def test_smtp_backend_reuses_connection(self, app, monkeypatch):
+        """Test the SMTP backend keeps one connection per thread."""
+        import smtplib
+        from app.services import email_transports
+
+        connections = []
+
+        class FakeSMTP:
+            def __init__(self, host, port, timeout):
+                self.sent = []
+                connections.append(self)
+
+            def send_message(self, message):
+                self.sent.append(message['To'])
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr(smtplib, 'SMTP', FakeSMTP)
+        monkeypatch.setitem(email_transports._transports, 'smtp', email_transports.SMTPTransport())
+        with app.app_context():
+            results = EmailService.send_emails([
+                {'to_email': f'{n}@test.com', 'subject': 'S', 'html_content': '<p>x</p>'} for n in range(3)
+            ], backend='smtp')
+
+        assert all(success for success, _ in results)
+        assert len(connections) == 1
+        assert connections[0].sent == ['0@test.com', '1@test.com', '2@test.com']
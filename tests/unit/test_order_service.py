@@ -2,6 +2,7 @@
 import pytest
 from datetime import date, timedelta
 from decimal import Decimal
+from app.services.availability_service import AvailabilityService
 from app.services.order_service import OrderService
 from app.models import Order
 
@@ -158,6 +159,60 @@ class TestOrderService:
             assert updated_order.total_amount == Decimal('13.99')
             assert len(list(updated_order.items)) == 1
     
+    def test_item_queries_do_not_grow_with_lines(self, app, db_session, regular_user, order, menu, menu_items, count_statements):
+        """Test create_order and update_order issue the same statements for 1 or 6 lines."""
+        order_dates = [
+            day for day in (date.today() + timedelta(days=i) for i in range(1, 8))
+            if day.weekday() < 5 and day != order.order_date
+        ]
+
+        def count(call):
+            with count_statements() as statements:
+                result = call()
+            return result, len(statements)
+
+        with app.app_context():
+            user_id, menu_id, order_id = regular_user.id, menu.id, order.id
+            one_line = [{'menu_item_id': menu_items[0].id, 'quantity': 1}]
+            six_lines = [{'menu_item_id': item.id, 'quantity': 2} for item in menu_items] * 2
+            six_lines[1] = dict(six_lines[1], notes='No cheese')
+            AvailabilityService.get_map()  # loaded once per process, not per order
+
+            _, create_one = count(lambda: OrderService.create_order(user_id, menu_id, order_dates[0], one_line))
+            created, create_six = count(lambda: OrderService.create_order(user_id, menu_id, order_dates[1], six_lines))
+            assert create_six == create_one
+            assert created.total_amount == Decimal('151.88')
+            assert len(list(created.items)) == 6
+            assert [item.notes for item in created.items].count('No cheese') == 1
+
+            _, update_one = count(lambda: OrderService.update_order(order_id, user_id, items_data=one_line))
+            _, update_six = count(lambda: OrderService.update_order(order_id, user_id, items_data=six_lines))
+            assert update_six == update_one
+
+    def test_update_order_validates_items(self, app, db_session, regular_user, order, menu_items):
+        """Test invalid items leave the order untouched."""
+        from app.models import MenuItem
+
+        with app.app_context():
+            db_session.get(MenuItem, menu_items[1].id).is_available = False
+            db_session.commit()
+
+            with pytest.raises(ValueError, match='Menu item 9999 not found'):
+                OrderService.update_order(order.id, regular_user.id, items_data=[
+                    {'menu_item_id': menu_items[0].id, 'quantity': 1},
+                    {'menu_item_id': 9999, 'quantity': 1}
+                ])
+            db_session.rollback()
+            with pytest.raises(ValueError, match='Veggie Bowl is not available'):
+                OrderService.update_order(order.id, regular_user.id, items_data=[
+                    {'menu_item_id': menu_items[1].id, 'quantity': 1}
+                ])
+            db_session.rollback()
+
+            unchanged = db_session.get(Order, order.id)
+            assert len(list(unchanged.items)) == 2
+            assert unchanged.total_amount == Decimal('23.98')
+
     def test_update_order_not_found(self, app, db_session, regular_user):
         """Test updating non-existent order."""
         with app.app_context():
@@ -0,0 +1,99 @@
+"""Unit tests for order daily stats maintenance."""
+from decimal import Decimal
+from app import db
+from app.models import Order, OrderDailyStat
+from app.services.order_service import OrderService
+from app.services.order_stats_service import OrderStatsService
+
+
+def _stats():
+    """{(order_date, restaurant_id, status): (count, amount)} for non-empty rows."""
+    return {
+        (s.order_date, s.restaurant_id, s.status): (s.order_count, Decimal(str(s.total_amount)))
+        for s in OrderDailyStat.query.all()
+        if s.order_count
+    }
+
+
+class TestOrderStatsService:
+    """Test incremental order_daily_stats maintenance."""
+
+    def test_insert_counts_order(self, app, db_session, order):
+        """Test a new order adds to its (date, restaurant, status) row."""
+        with app.app_context():
+            assert _stats() == {
+                (order.order_date, order.restaurant_id, 'pending'): (1, Decimal('23.98'))
+            }
+
+    def test_status_change_moves_order(self, app, db_session, order, regular_user):
+        """Test status changes and cancellation move the order between rows."""
+        with app.app_context():
+            OrderService.update_order_status(order.id, 'confirmed')
+            assert _stats() == {
+                (order.order_date, order.restaurant_id, 'confirmed'): (1, Decimal('23.98'))
+            }
+
+            OrderService.cancel_order(order.id, regular_user.id)
+            assert _stats() == {
+                (order.order_date, order.restaurant_id, 'cancelled'): (1, Decimal('23.98'))
+            }
+
+    def test_amount_change_and_delete(self, app, db_session, order):
+        """Test total changes adjust revenue and deleting an order removes it."""
+        with app.app_context():
+            stored = db.session.get(Order, order.id)
+            stored.total_amount = Decimal('30.00')
+            db.session.commit()
+            assert _stats() == {
+                (order.order_date, order.restaurant_id, 'pending'): (1, Decimal('30.00'))
+            }
+
+            db.session.delete(db.session.get(Order, order.id))
+            db.session.commit()
+            assert _stats() == {}
+
+    def test_change_after_commit_without_reload(self, app, db_session, order):
+        """Test attributes set on an instance expired by a commit still move the order."""
+        with app.app_context():
+            stored = db.session.get(Order, order.id)
+            stored.notes = 'Leave at reception'
+            db.session.commit()
+
+            # Expired by the commit and overwritten without being read first
+            stored.status = 'confirmed'
+            stored.total_amount = Decimal('25.00')
+            db.session.commit()
+            expected = {
+                (order.order_date, order.restaurant_id, 'confirmed'): (1, Decimal('25.00'))
+            }
+            assert _stats() == expected
+
+            OrderStatsService.rebuild()
+            db.session.commit()
+            assert _stats() == expected
+
+    def test_bulk_update_status(self, app, db_session, order):
+        """Test set-based status updates keep the stats in step."""
+        with app.app_context():
+            updated = OrderStatsService.update_status([Order.id == order.id], 'ordered')
+            db.session.commit()
+
+            assert updated == 1
+            assert db.session.get(Order, order.id).status == 'ordered'
+            assert _stats() == {
+                (order.order_date, order.restaurant_id, 'ordered'): (1, Decimal('23.98'))
+            }
+
+    def test_rebuild_matches_incremental(self, app, db_session, order):
+        """Test a rebuild from orders reproduces the incrementally maintained rows."""
+        with app.app_context():
+            OrderService.update_order_status(order.id, 'confirmed')
+            expected = _stats()
+
+            db.session.query(OrderDailyStat).delete()
+            db.session.commit()
+            assert _stats() == {}
+
+            assert OrderStatsService.rebuild() == 1
+            db.session.commit()
+            assert _stats() == expected
@@ -0,0 +1,47 @@
+"""Unit tests for order summary loader."""
+from app import db
+from app.models import Order, OrderItem
+from app.services.email_service import EmailService
+from app.services.order_summary_service import OrderSummaryService
+
+
+class TestOrderSummaryService:
+    """Test order summary loader."""
+
+    def test_load_for_restaurant(self, app, db_session, order, restaurant):
+        """Test orders come back with user name and item names preloaded."""
+        with app.app_context():
+            orders = OrderSummaryService.load_for_restaurant(restaurant.id, order.order_date)
+
+            assert [o.id for o in orders] == [order.id]
+            assert orders[0].user_name == 'Test User'
+            assert [i.menu_item_name for i in orders[0].items] == ['Chicken Salad', 'Veggie Bowl']
+
+    def test_status_filters(self, app, db_session, order, restaurant):
+        """Test include and exclude status filters."""
+        with app.app_context():
+            assert OrderSummaryService.load(order.order_date, statuses=['confirmed']) == {}
+            assert OrderSummaryService.load(order.order_date, exclude_statuses=['pending']) == {}
+            assert list(OrderSummaryService.load(order.order_date, statuses=['pending'])) == [restaurant.id]
+
+    def test_query_count_is_fixed(self, app, db_session, order, restaurant, admin_user, count_statements):
+        """Test loading and rendering take two queries regardless of order count."""
+        with app.app_context():
+            extra = Order(
+                user_id=admin_user.id, menu_id=order.menu_id, restaurant_id=restaurant.id,
+                order_date=order.order_date, total_amount=12.99, status='pending'
+            )
+            db.session.add(extra)
+            db.session.flush()
+            item = db.session.get(OrderItem, db.session.query(OrderItem.id).first()[0])
+            db.session.add(OrderItem(order_id=extra.id, menu_item_id=item.menu_item_id, quantity=2, price=item.price))
+            db.session.commit()
+            db.session.expunge_all()
+
+            with count_statements() as statements:
+                orders = OrderSummaryService.load_for_restaurant(restaurant.id, order.order_date)
+                email = EmailService.build_restaurant_order_summary(restaurant, order.order_date, orders)
+
+            assert len(orders) == 2
+            assert len(statements) == 2
+            assert 'Admin User' in email['plain_content']
@@ -0,0 +1,69 @@
+"""Unit tests for order background tasks."""
+from datetime import date
+from app import db
+from app.models import Order, Restaurant, RestaurantOrderSummary
+from app.services.email_service import EmailService
+from app.tasks.order_tasks import send_restaurant_summaries, generate_restaurant_summary_for_date
+
+
+class TestSendRestaurantSummaries:
+    """Test the daily restaurant summary task."""
+
+    def test_sends_concurrently_and_commits_once(self, app, db_session, regular_user, admin_user, menu, restaurant,
+                                                 monkeypatch):
+        """Test every restaurant gets its summary and results are written together."""
+        sent_to = []
+
+        def fake_send(to_email, subject, html_content, plain_content=None, backend=None):
+            sent_to.append(to_email)
+            return (False, 'SendGrid error: 500') if to_email == 'other@test.com' else (True, 'Email sent')
+
+        monkeypatch.setattr(EmailService, 'send_email', staticmethod(fake_send))
+        monkeypatch.setitem(app.config, 'RESTAURANT_SUMMARY_CONCURRENCY', 4)
+
+        with app.app_context():
+            other = Restaurant(name='Other', email='other@test.com')
+            db.session.add(other)
+            db.session.flush()
+            today = date.today()
+            db.session.add_all([
+                Order(user_id=regular_user.id, menu_id=menu.id, restaurant_id=restaurant.id,
+                      order_date=today, total_amount=10, status='confirmed'),
+                Order(user_id=admin_user.id, menu_id=menu.id, restaurant_id=other.id,
+                      order_date=today, total_amount=10, status='confirmed'),
+            ])
+            db.session.commit()
+            other_id = other.id
+
+        send_restaurant_summaries(app)
+
+        with app.app_context():
+            assert sorted(sent_to) == ['chef@test.com', 'other@test.com']
+            summaries = {s.restaurant_id: s for s in RestaurantOrderSummary.query.all()}
+            assert summaries[restaurant.id].email_status == 'sent'
+            assert summaries[other_id].email_status == 'failed'
+            statuses = {o.restaurant_id: o.status for o in Order.query.all()}
+            assert statuses == {restaurant.id: 'sent_to_restaurant', other_id: 'confirmed'}
+
+
+class TestGenerateRestaurantSummaryForDate:
+    """Test the manual (inline) restaurant summary trigger."""
+
+    def test_marks_confirmed_orders_sent(self, app, db_session, regular_user, admin_user, menu, restaurant,
+                                         monkeypatch):
+        """Test a sent summary moves confirmed orders to sent_to_restaurant, like the outbox path."""
+        monkeypatch.setattr(EmailService, 'send_email', staticmethod(lambda *args, **kwargs: (True, 'Email sent')))
+
+        with app.app_context():
+            today = date.today()
+            db.session.add_all([
+                Order(user_id=regular_user.id, menu_id=menu.id, restaurant_id=restaurant.id,
+                      order_date=today, total_amount=10, status='confirmed'),
+                Order(user_id=admin_user.id, menu_id=menu.id, restaurant_id=restaurant.id,
+                      order_date=today, total_amount=10, status='pending'),
+            ])
+            db.session.commit()
+
+            assert generate_restaurant_summary_for_date(restaurant.id, today) == (True, 'Summary sent successfully')
+            assert sorted(o.status for o in Order.query.all()) == ['pending', 'sent_to_restaurant']
+            assert RestaurantOrderSummary.query.one().email_status == 'sent'
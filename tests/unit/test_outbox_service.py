@@ -0,0 +1,80 @@
+"""Unit tests for outbox service."""
+from datetime import date, timedelta
+from app.services.outbox_service import OutboxService
+from app.services.reminder_service import ReminderService
+from app.services.whatsapp_service import WhatsAppService
+from app.models import OutboundMessage, Reminder
+
+
+class TestOutboxService:
+    """Test outbox service."""
+
+    def test_queue_reminders_does_not_send(self, app, db_session, regular_user, monkeypatch):
+        """Test queueing writes reminders and messages without calling WhatsApp."""
+        calls = []
+        monkeypatch.setattr(
+            WhatsAppService,
+            'send_template_message',
+            staticmethod(lambda *args: calls.append(args) or (True, {}))
+        )
+
+        with app.app_context():
+            target_date = date.today() + timedelta(days=1)
+
+            message_ids = ReminderService.queue_reminders_for_dates([target_date])
+
+            assert len(message_ids) == 1
+            assert calls == []
+            message = db_session.get(OutboundMessage, message_ids[0])
+            assert message.status == 'queued'
+            assert message.payload['user_id'] == regular_user.id
+            reminder = Reminder.query.filter_by(user_id=regular_user.id).one()
+            assert reminder.status == 'pending'
+            assert message.payload['reminder_ids'] == [reminder.id]
+
+    def test_process_batch_delivers_and_updates_reminders(self, app, db_session, regular_user, monkeypatch):
+        """Test the worker delivers queued reminders and records the result."""
+        monkeypatch.setattr(
+            WhatsAppService,
+            'send_template_message',
+            staticmethod(lambda to_phone, template_name, parameters: (True, {}))
+        )
+
+        with app.app_context():
+            target_date = date.today() + timedelta(days=1)
+            message_ids = ReminderService.queue_reminders_for_dates([target_date])
+
+            sent, failed = OutboxService.process_batch()
+
+            assert (sent, failed) == (1, 0)
+            assert db_session.get(OutboundMessage, message_ids[0]).status == 'sent'
+            assert Reminder.query.filter_by(user_id=regular_user.id).one().status == 'sent'
+            assert OutboxService.process_batch() == (0, 0)
+
+    def test_process_batch_retries_then_fails(self, app, db_session, regular_user, monkeypatch):
+        """Test failed deliveries are retried with backoff before failing permanently."""
+        monkeypatch.setattr(
+            WhatsAppService,
+            'send_template_message',
+            staticmethod(lambda to_phone, template_name, parameters: (False, 'provider down'))
+        )
+        monkeypatch.setitem(app.config, 'OUTBOX_MAX_ATTEMPTS', 2)
+        monkeypatch.setitem(app.config, 'OUTBOX_RETRY_BACKOFF', 0)
+
+        with app.app_context():
+            target_date = date.today() + timedelta(days=1)
+            message_ids = ReminderService.queue_reminders_for_dates([target_date])
+
+            assert OutboxService.process_batch() == (0, 1)
+            message = db_session.get(OutboundMessage, message_ids[0])
+            assert message.status == 'queued'
+            assert Reminder.query.filter_by(user_id=regular_user.id).one().status == 'pending'
+
+            assert OutboxService.process_batch() == (0, 1)
+            db_session.expire_all()
+            message = db_session.get(OutboundMessage, message_ids[0])
+            assert message.status == 'failed'
+            assert message.attempts == 2
+            reminder = Reminder.query.filter_by(user_id=regular_user.id).one()
+            assert reminder.status == 'failed'
+            assert reminder.failure_reason == 'provider down'
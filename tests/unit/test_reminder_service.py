@@ -0,0 +1,148 @@
+"""Unit tests for reminder service."""
+from datetime import date, timedelta
+from app.services.reminder_service import ReminderService
+from app.models import User
+
+
+class TestReminderService:
+    """Test reminder service."""
+
+    def test_get_user_ids_without_orders(self, app, db_session, regular_user, admin_user, order):
+        """Test missing-order lookup across several dates."""
+        with app.app_context():
+            order_day = order.order_date
+            other_day = order_day + timedelta(days=1)
+
+            missing = ReminderService.get_user_ids_without_orders([order_day, other_day])
+
+            assert set(missing.keys()) == {order_day, other_day}
+            assert missing[order_day] == {admin_user.id}
+            assert missing[other_day] == {admin_user.id, regular_user.id}
+
+    def test_get_user_ids_without_orders_skips_inactive(self, app, db_session, regular_user, admin_user):
+        """Test inactive users are never reported as missing orders."""
+        with app.app_context():
+            User.query.filter_by(id=regular_user.id).update({'is_active': False})
+            target_date = date.today() + timedelta(days=1)
+
+            missing = ReminderService.get_user_ids_without_orders([target_date])
+
+            assert missing[target_date] == {admin_user.id}
+
+    def test_get_user_ids_without_orders_no_dates(self, app, db_session):
+        """Test an empty date list returns an empty mapping."""
+        with app.app_context():
+            assert ReminderService.get_user_ids_without_orders([]) == {}
+
+    def test_get_users_without_orders(self, app, db_session, regular_user, admin_user, order):
+        """Test user list for a single date."""
+        with app.app_context():
+            users = ReminderService.get_users_without_orders(order.order_date)
+
+            assert [u.id for u in users] == [admin_user.id]
+            assert all(isinstance(u, User) for u in users)
+
+    def test_send_reminders_for_dates(self, app, db_session, regular_user, admin_user, order, monkeypatch):
+        """Test concurrent dispatch records one reminder per missing user/date."""
+        from app.models import Reminder
+        from app.services.whatsapp_service import WhatsAppService
+
+        sent_to = []
+
+        def fake_send(user, order_date, order_url):
+            sent_to.append((user.id, order_date))
+            if user.id == regular_user.id:
+                return False, 'boom'
+            return True, {}
+
+        monkeypatch.setattr(WhatsAppService, 'send_order_reminder', staticmethod(fake_send))
+        monkeypatch.setitem(app.config, 'REMINDER_RESULT_BATCH_SIZE', 2)
+
+        with app.app_context():
+            order_day = order.order_date
+            other_day = order_day + timedelta(days=1)
+
+            results = ReminderService.send_reminders_for_dates([order_day, other_day])
+
+            assert results[order_day] == (1, 0)
+            assert results[other_day] == (1, 1)
+            assert sorted(sent_to) == sorted([
+                (admin_user.id, order_day),
+                (admin_user.id, other_day),
+                (regular_user.id, other_day),
+            ])
+            reminders = {(r.user_id, r.order_date): r for r in Reminder.query.all()}
+            assert len(reminders) == 3
+            assert reminders[(regular_user.id, other_day)].status == 'failed'
+            assert reminders[(regular_user.id, other_day)].failure_reason == 'boom'
+            assert reminders[(admin_user.id, order_day)].status == 'sent'
+            assert reminders[(admin_user.id, order_day)].sent_at is not None
+
+    def test_send_reminders_consolidated(self, app, db_session, regular_user, order, monkeypatch):
+        """Test consolidated mode sends one message per user but records every date."""
+        from app.models import Reminder
+        from app.services.whatsapp_service import WhatsAppService
+
+        calls = []
+
+        def fake_send(to_phone, template_name, parameters):
+            calls.append(parameters)
+            return True, {}
+
+        monkeypatch.setattr(WhatsAppService, 'send_template_message', staticmethod(fake_send))
+        monkeypatch.setitem(app.config, 'REMINDER_CONSOLIDATE', True)
+
+        with app.app_context():
+            first_day = order.order_date + timedelta(days=1)
+            days = [first_day, first_day + timedelta(days=1), first_day + timedelta(days=2)]
+
+            results = ReminderService.send_reminders_for_dates(days)
+
+            assert len(calls) == 1
+            assert ' and ' in calls[0][1]
+            assert calls[0][2].endswith(f'date={first_day.isoformat()}')
+            assert all(results[d] == (1, 0) for d in days)
+            rows = Reminder.query.filter_by(user_id=regular_user.id).all()
+            assert sorted(r.order_date for r in rows) == days
+            assert all(r.status == 'sent' for r in rows)
+
+    def test_send_reminders_is_idempotent(self, app, db_session, regular_user, monkeypatch):
+        """Test a second run on the same day skips users already reminded."""
+        from app.models import Reminder
+        from app.services.whatsapp_service import WhatsAppService
+
+        calls = []
+        monkeypatch.setattr(
+            WhatsAppService,
+            'send_order_reminder',
+            staticmethod(lambda user, order_date, order_url: calls.append(user.id) or (True, {}))
+        )
+
+        with app.app_context():
+            target_date = date.today() + timedelta(days=1)
+
+            first = ReminderService.send_reminders_for_dates([target_date])
+            second = ReminderService.send_reminders_for_dates([target_date])
+
+            assert first[target_date] == (1, 0)
+            assert second[target_date] == (0, 0)
+            assert calls == [regular_user.id]
+            assert Reminder.query.count() == 1
+
+
+class TestTokenBucket:
+    """Test token bucket rate limiter."""
+
+    def test_burst_then_throttle(self):
+        """Test tokens are consumed up to capacity before blocking."""
+        import time
+        from app.utils.concurrency import TokenBucket
+
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        elapsed = time.monotonic() - started
+
+        # Two tokens come from the burst, the other two take ~1/50s each.
+        assert elapsed >= 0.03
@@ -0,0 +1,91 @@
+"""Unit tests for WhatsApp service."""
+import pytest
+import requests
+from datetime import date
+from app.services import whatsapp_service
+from app.services.whatsapp_service import WhatsAppService
+from app.utils.circuit_breaker import (
+    CIRCUIT_OPEN_REASON, CircuitBreaker, circuit_breaker_states, reset_circuit_breakers
+)
+
+
+class TestWhatsAppService:
+    """Test WhatsApp service."""
+
+    def test_http_session_is_shared(self, app):
+        """Test the pooled session is reused within a process."""
+        with app.app_context():
+            assert WhatsAppService._http() is WhatsAppService._http()
+
+    def test_http_session_recreated_after_fork(self, app, monkeypatch):
+        """Test a new session is built when the pid changes (gunicorn fork)."""
+        with app.app_context():
+            parent_session = WhatsAppService._http()
+            monkeypatch.setattr(whatsapp_service, '_http_session_pid', -1)
+
+            assert WhatsAppService._http() is not parent_session
+
+    def test_format_order_dates(self):
+        """Test single and multi-day date labels."""
+        assert WhatsAppService._format_order_dates([date(2026, 3, 2)]) == 'Monday, March 02'
+        assert WhatsAppService._format_order_dates(
+            [date(2026, 3, 4), date(2026, 3, 2), date(2026, 3, 3)]
+        ) == 'Mon Mar 02, Tue Mar 03 and Wed Mar 04'
+
+
+class TestCircuitBreaker:
+    """Test the circuit breaker around WhatsApp calls."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_breakers(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, 'WHATSAPP_API_TOKEN', 'test-token')
+        monkeypatch.setitem(app.config, 'WHATSAPP_PHONE_NUMBER_ID', '12345')
+        monkeypatch.setitem(app.config, 'CIRCUIT_BREAKER_MIN_CALLS', 2)
+        monkeypatch.setitem(app.config, 'CIRCUIT_BREAKER_OPEN_SECONDS', 60)
+        reset_circuit_breakers()
+        yield
+        reset_circuit_breakers()
+
+    def test_opens_after_failures_and_fails_fast(self, app, monkeypatch):
+        """Test the breaker trips on timeouts and stops calling the API."""
+        calls = []
+
+        def timeout(*args, **kwargs):
+            calls.append(1)
+            raise requests.Timeout('read timed out')
+
+        with app.app_context():
+            monkeypatch.setattr(WhatsAppService._http(), 'post', timeout)
+            results = [WhatsAppService.send_template_message('+15550001', 'meal_reminder', ['x']) for _ in range(4)]
+
+            assert len(calls) == 2
+            assert results[-1] == (False, CIRCUIT_OPEN_REASON)
+            state = circuit_breaker_states()['whatsapp']
+            assert state['state'] == 'open'
+            assert state['trip_count'] == 1
+            assert state['rejected_count'] == 2
+
+    def test_half_open_probe_closes_circuit(self):
+        """Test a successful probe after the open period closes the breaker."""
+        breaker = CircuitBreaker('test', min_calls=2, open_seconds=0)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert breaker.state == 'half_open'
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False  # one probe at a time
+        breaker.record_success()
+        assert breaker.state == 'closed'
+
+    def test_client_errors_do_not_trip(self, app, monkeypatch):
+        """Test 4xx responses (bad number, bad template) leave the circuit closed."""
+        response = requests.Response()
+        response.status_code = 400
+        response._content = b'{"error": {"code": 100}}'
+
+        with app.app_context():
+            monkeypatch.setattr(WhatsAppService._http(), 'post', lambda *a, **k: response)
+            for _ in range(5):
+                assert WhatsAppService.send_template_message('+15550001', 'meal_reminder', ['x'])[0] is False
+
+            assert circuit_breaker_states()['whatsapp']['state'] == 'closed'
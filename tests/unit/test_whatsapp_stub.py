@@ -0,0 +1,63 @@
+"""Unit tests for the local WhatsApp API stand-in."""
+import threading
+import pytest
+import requests
+from app.services.whatsapp_service import WhatsAppService
+from app.utils.whatsapp_stub import StubSettings, create_stub_server
+
+
+@pytest.fixture
+def stub_server():
+    """Run a stub server on a free port for the duration of a test."""
+    servers = []
+
+    def start(**settings):
+        server = create_stub_server('127.0.0.1', 0, StubSettings(latency_ms=0, **settings))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestWhatsAppStub:
+    """Test WhatsApp stub server."""
+
+    def test_template_message_round_trip(self, app, stub_server, monkeypatch):
+        """Test WhatsAppService talks to the stub through WHATSAPP_API_URL."""
+        server, url = stub_server()
+        monkeypatch.setitem(app.config, 'WHATSAPP_API_URL', url)
+        monkeypatch.setitem(app.config, 'WHATSAPP_API_TOKEN', 'test-token')
+        monkeypatch.setitem(app.config, 'WHATSAPP_PHONE_NUMBER_ID', '12345')
+
+        with app.app_context():
+            success, response = WhatsAppService.send_template_message('+15550001', 'meal_reminder', ['Test'])
+
+        assert success is True
+        assert response['messages'][0]['id'].startswith('wamid.')
+        stats = requests.get(f'{url}/stats', timeout=5).json()
+        assert stats['requests'] == 1
+        assert stats['by_status'] == {'200': 1}
+
+    def test_error_and_throttle_rates(self, stub_server):
+        """Test configured failure modes are returned."""
+        payload = {'messaging_product': 'whatsapp', 'to': '+15550001', 'type': 'text'}
+        headers = {'Authorization': 'Bearer x'}
+
+        _, url = stub_server(error_rate=1.0)
+        assert requests.post(f'{url}/v18.0/1/messages', json=payload, headers=headers, timeout=5).status_code == 500
+
+        _, url = stub_server(throttle_rate=1.0)
+        response = requests.post(f'{url}/v18.0/1/messages', json=payload, headers=headers, timeout=5)
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '1'
+
+    def test_requires_bearer_token(self, stub_server):
+        """Test requests without a token are rejected like the real API."""
+        _, url = stub_server()
+        payload = {'messaging_product': 'whatsapp', 'to': '+15550001'}
+        assert requests.post(f'{url}/v18.0/1/messages', json=payload, timeout=5).status_code == 401